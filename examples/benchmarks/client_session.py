@@ -0,0 +1,80 @@
+"""
+Benchmark of the pooled HTTP session used by the HTTP clients.
+
+A local stub of the Tonapi get-method endpoint is started on 127.0.0.1 and the same
+number of `run_get_method` calls is made twice:
+
+- per-call session: the session is closed after every call, which is what
+  `Client._request` used to do (new connector, new connection, new DNS lookup);
+- pooled session: one long-lived session shared by all calls.
+
+Run: python -m examples.benchmarks.client_session
+"""
+
+import asyncio
+import time
+
+from aiohttp import web
+
+from stonutils.client import TonapiClient
+
+# Number of get method calls per run
+REQUESTS = 2000
+
+# Number of calls in flight at the same time
+CONCURRENCY = 50
+
+ADDRESS = "EQC-3ilVr-W0Uc3pLrGJElwSaFxvhXXfkiQA3EwdVBHNNess"
+
+
+async def seqno_handler(_: web.Request) -> web.Response:
+    return web.json_response({"success": True, "exit_code": 0, "decoded": {"state": 1}})
+
+
+async def start_stub_server() -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get("/v2/blockchain/accounts/{address}/methods/{method}", seqno_handler)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 8088).start()
+
+    return runner
+
+
+async def run(client: TonapiClient, per_call_session: bool) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def call() -> None:
+        async with semaphore:
+            if per_call_session:
+                # A private client per call reproduces the old session-per-request behaviour.
+                async with TonapiClient(base_url=client.base_url) as one_shot_client:
+                    await one_shot_client.run_get_method(ADDRESS, "seqno")
+            else:
+                await client.run_get_method(ADDRESS, "seqno")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - started
+
+    return REQUESTS / elapsed
+
+
+async def main() -> None:
+    runner = await start_stub_server()
+
+    try:
+        async with TonapiClient(base_url="http://127.0.0.1:8088") as client:
+            before = await run(client, per_call_session=True)
+            after = await run(client, per_call_session=False)
+    finally:
+        await runner.cleanup()
+
+    print(f"Per-call session: {before:,.0f} requests/sec")
+    print(f"Pooled session:   {after:,.0f} requests/sec")
+    print(f"Speedup:          {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
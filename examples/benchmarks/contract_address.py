@@ -0,0 +1,71 @@
+"""
+Benchmark of `Contract.address` access.
+
+For WalletV4R2 and HighloadWalletV3 the address is read repeatedly:
+
+- rebuilt: the state init cell is built, deserialized, serialized and hashed
+  on every access, which is what `Contract.address` used to do;
+- first access: the cache is dropped before every access, so the address
+  is hashed directly from the code and data cells;
+- cached: the memoized address is returned.
+
+Run: python -m examples.benchmarks.contract_address
+"""
+
+import time
+from typing import Callable
+
+from pytoniq_core import Address, StateInit, begin_cell
+
+from stonutils.contract import Contract
+from stonutils.wallet import HighloadWalletV3, WalletV4R2
+
+# Number of address reads per run
+ACCESSES = 20000
+
+
+def rebuild_address(contract: Contract) -> Address:
+    state_init = StateInit.deserialize(
+        begin_cell()
+        .store_uint(0, 2)
+        .store_dict(contract._code)  # noqa
+        .store_dict(contract._data)  # noqa
+        .store_uint(0, 1)
+        .end_cell()
+        .to_slice()
+    )
+    return Address((0, state_init.serialize().hash))
+
+
+def run(read: Callable[[], Address]) -> float:
+    started = time.perf_counter()
+
+    for _ in range(ACCESSES):
+        read()
+
+    elapsed = time.perf_counter() - started
+
+    return ACCESSES / elapsed
+
+
+def main() -> None:
+    for wallet_class in (WalletV4R2, HighloadWalletV3):
+        wallet, _, _, _ = wallet_class.create(None)  # noqa
+        assert rebuild_address(wallet) == wallet.address
+
+        def read_first() -> Address:
+            wallet._invalidate_state_init()  # noqa
+            return wallet.address
+
+        rebuilt = run(lambda: rebuild_address(wallet))
+        first = run(read_first)
+        cached = run(lambda: wallet.address)
+
+        print(f"{wallet_class.__name__}.address:")
+        print(f"  Rebuilt:      {rebuilt:,.0f} accesses/sec")
+        print(f"  First access: {first:,.0f} accesses/sec ({first / rebuilt:.0f}x)")
+        print(f"  Cached:       {cached:,.0f} accesses/sec ({cached / rebuilt:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
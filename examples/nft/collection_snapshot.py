@@ -0,0 +1,40 @@
+from stonutils.client import TonapiClient
+from stonutils.nft import CollectionSnapshot, CollectionStandard
+
+# API key for accessing the Tonapi (obtainable from https://tonconsole.com)
+API_KEY = ""
+
+# Set to True for test network, False for main network
+IS_TESTNET = True
+
+# Address of the NFT collection contract
+COLLECTION_ADDRESS = "EQ..."
+
+# Output file, CSV or JSONL by extension
+OUTPUT_PATH = "snapshot.csv"
+
+# Previous snapshot: items that did not change since are not fetched again
+PREVIOUS_PATH = "snapshot.csv"
+
+# Progress file: run the script again after a crash to resume
+CHECKPOINT_PATH = "snapshot.json"
+
+
+async def main() -> None:
+    client = TonapiClient(api_key=API_KEY, is_testnet=IS_TESTNET)
+
+    snapshot = CollectionSnapshot(
+        client=client,
+        collection_address=COLLECTION_ADDRESS,
+        collection_class=CollectionStandard,
+        checkpoint_path=CHECKPOINT_PATH,
+    )
+    count = await snapshot.export(OUTPUT_PATH, previous_path=PREVIOUS_PATH)
+
+    print(f"Exported {count} items of the collection at address: {COLLECTION_ADDRESS}.")
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+from pytoniq_core import Address
+
+from stonutils.client import TonapiClient
+from stonutils.nft import BatchMintPipeline, CollectionStandard
+from stonutils.nft.content import NFTOffchainContent
+from stonutils.wallet import WalletV4R2
+
+# API key for accessing the Tonapi (obtainable from https://tonconsole.com)
+API_KEY = ""
+
+# Set to True for test network, False for main network
+IS_TESTNET = True
+
+# Mnemonic phrase used to connect the wallet of the collection owner
+MNEMONIC: list[str] = []
+
+# Address of the owner of the NFTs and the NFT collection contract
+OWNER_ADDRESS = "UQ..."
+COLLECTION_ADDRESS = "EQ..."
+
+# Index of the first item to mint
+FROM_INDEX = 0
+
+# Number of items to mint
+ITEMS_COUNT = 100_000
+
+# Progress file: run the script again after a crash to resume
+CHECKPOINT_PATH = "batch_mint.json"
+
+
+async def main() -> None:
+    client = TonapiClient(api_key=API_KEY, is_testnet=IS_TESTNET)
+    wallet, _, _, _ = WalletV4R2.from_mnemonic(client, MNEMONIC)
+
+    pipeline = BatchMintPipeline(
+        wallet=wallet,
+        collection_address=COLLECTION_ADDRESS,
+        collection_class=CollectionStandard,
+        from_index=FROM_INDEX,
+        checkpoint_path=CHECKPOINT_PATH,
+    )
+
+    # items are generated lazily, the ones minted by a previous run are skipped
+    items = (
+        (
+            NFTOffchainContent(suffix_uri=f"{index}.json"),
+            Address(OWNER_ADDRESS),
+        )
+        for index in range(FROM_INDEX, FROM_INDEX + ITEMS_COUNT)
+    )
+
+    next_index = await pipeline.run(items)
+
+    print(f"Minted items up to index {next_index - 1} in the collection at address: {COLLECTION_ADDRESS}.")
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    asyncio.run(main())
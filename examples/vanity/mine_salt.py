@@ -0,0 +1,42 @@
+"""
+Find a salt for the Vanity contract whose address ends with the given suffix.
+
+The search runs on all CPU cores and can be interrupted at any time:
+the progress is saved to the checkpoint file and resumed on the next run.
+Pass the found salt to `Vanity(owner_address=..., salt=...)`, see deploy_contract.py.
+"""
+
+from stonutils.vanity import VanityMiner, VanityProgress
+
+# The wallet address from which the deployment will be made
+OWNER_ADDRESS = "EQC-3ilVr-W0Uc3pLrGJElwSaFxvhXXfkiQA3EwdVBHNNess"
+
+# The desired ending of the address
+SUFFIX = "NESS"
+
+# File the search progress is saved to
+CHECKPOINT_PATH = "vanity_checkpoint.json"
+
+
+def print_progress(progress: VanityProgress) -> None:
+    eta = f"{progress.eta:,.0f}s" if progress.eta is not None else "unknown"
+    print(f"\r{progress.attempts:,} attempts, {progress.attempts_per_second:,.0f}/s, ETA {eta}", end="")
+
+
+def main() -> None:
+    miner = VanityMiner(
+        owner_address=OWNER_ADDRESS,
+        suffix=SUFFIX,
+        case_sensitive=True,
+        bounceable=True,
+        checkpoint_path=CHECKPOINT_PATH,
+    )
+    results = miner.mine(results=1, progress=print_progress)
+
+    print()
+    for result in results:
+        print(f"Found: {result.address} salt: {result.salt}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Pre-generate deposit addresses: derive the WalletV5R1 addresses of one public key
+for a range of subwallet IDs and stream them to a CSV file.
+
+The derivation runs on all CPU cores and memory use does not grow with the number of addresses.
+"""
+
+import time
+
+from stonutils.wallet import WalletAddressDeriver, WalletV5R1
+
+# Public key of the deposit wallets, as a hex string
+PUBLIC_KEY = "8b9a5f1d9d2d9c5e1d0f4c7a3b6e2f1a0c9d8e7f6a5b4c3d2e1f0a9b8c7d6e5f"
+
+# Subwallet IDs to derive the addresses for
+WALLET_IDS = range(1_000_000)
+
+# Output file with public_key,wallet_id,address rows
+OUTPUT_PATH = "deposit_addresses.csv"
+
+
+def main() -> None:
+    deriver = WalletAddressDeriver(WalletV5R1, is_bounceable=False)
+
+    started = time.perf_counter()
+    count = deriver.write_csv(OUTPUT_PATH, PUBLIC_KEY, WALLET_IDS)
+    elapsed = time.perf_counter() - started
+
+    print(f"Derived {count:,} addresses in {elapsed:.1f}s ({count / elapsed * 60:,.0f} per minute)")
+
+
+if __name__ == "__main__":
+    main()
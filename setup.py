@@ -28,6 +28,7 @@ setuptools.setup(
     ],
     extras_require={
         "pytoniq": ["pytoniq~=0.1.39"],
+        "numpy": ["numpy>=1.21"],
     },
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -1,13 +1,24 @@
-from ._base import Client
+from ._base import Client, ResultFormat
 
+from .cache import CacheBackend, GetMethodCache, MemoryCache, SqliteCache
+from .limiter import RateLimiter, RequestPriority
 from .lite import LiteserverClient
+from .multi import MultiClient
 from .tonapi import TonapiClient
 from .toncenter import ToncenterClient
 
 __all__ = [
     "Client",
 
+    "CacheBackend",
+    "GetMethodCache",
     "LiteserverClient",
+    "MemoryCache",
+    "MultiClient",
+    "RateLimiter",
+    "RequestPriority",
+    "ResultFormat",
+    "SqliteCache",
     "TonapiClient",
     "ToncenterClient",
 ]
@@ -1,24 +1,179 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Any, Optional, List, Dict
+import time
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, TypeVar
 
 import aiohttp
+from pytoniq_core import Address, Cell, Slice
 
+from .cache import GetMethodCache
+from .limiter import RateLimiter, RequestPriority
 from ..account import RawAccount
 from ..exceptions import PytoniqDependencyError
 
+T = TypeVar("T")
+
+
+class ResultFormat(Enum):
+    """
+    The get method argument and result formats, one per API.
+
+    Contract helpers build get method arguments and parse results
+    according to the :attr:`Client.result_format` of the client.
+    """
+    TONAPI = "tonapi"
+    TONCENTER = "toncenter"
+    LITESERVER = "liteserver"
+
 
 class Client:
     """
     Base client class for interacting with the TON blockchain.
+
+    HTTP requests are sent through a single long-lived ``aiohttp.ClientSession``
+    which is created lazily on the first request and reused afterwards, so
+    connections, TLS sessions and DNS lookups are pooled between calls.
+    Close it with :meth:`close` or use the client as an async context manager.
+
+    Optionally, requests pass through a :class:`RateLimiter` which keeps the client
+    within the API quota and retries requests rejected with ``429 Too Many Requests``.
+
+    Identical concurrent :meth:`run_get_method` and :meth:`get_raw_account` calls are
+    coalesced: while a request is in flight, the same request made by other coroutines
+    waits for its result instead of being sent again. Subclasses implement
+    :meth:`_run_get_method` and :meth:`_get_raw_account`.
+
+    Get method results can also be cached across calls with a :class:`GetMethodCache`.
+
+    Many accounts are fetched at once with :meth:`get_raw_accounts` and
+    :meth:`get_account_balances`, which split the addresses into chunks of
+    ``bulk_chunk_size`` and use the cheapest bulk request of the provider.
+    Providers without a bulk request fetch one account per request,
+    with at most ``bulk_concurrency`` requests in flight.
     """
 
+    bulk_chunk_size: int = 1
+    bulk_concurrency: int = 10
+
+    # the format of get method arguments and results, None for a client no helper supports
+    result_format: Optional[ResultFormat] = None
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Initialize the Client.
+
+        :param kwargs: Client options:
+            - base_url: The base URL of the API. Defaults to an empty string.
+            - headers: Headers sent with every request. Defaults to an empty dict.
+            - timeout: The total request timeout in seconds. Defaults to 10.
+            - connector_limit: The total number of simultaneous connections in the pool. Defaults to 100.
+            - connector_limit_per_host: The number of simultaneous connections to one host.
+                Defaults to 0 (no limit).
+            - keepalive_timeout: How long an idle connection is kept open, in seconds. Defaults to 30.
+            - ttl_dns_cache: How long resolved DNS entries are cached, in seconds. Defaults to 300.
+            - rps: The request-per-second quota of the API key. If set, a rate limiter shared
+                by all clients with the same rate_limit_key is used. Defaults to None (no limit).
+            - rate_limit_key: The key identifying the quota. Defaults to the base URL.
+            - rate_limiter: An explicit RateLimiter instance, takes precedence over rps.
+            - max_retries: How many times a request throttled with 429 is retried
+                when rate limiting is enabled. Defaults to 3.
+            - coalesce_requests: Whether identical concurrent get method and account
+                requests share one in-flight request. Defaults to True.
+            - get_method_cache: A GetMethodCache for get method results. Defaults to None (no caching).
+        """
         self.base_url = kwargs.get("base_url", "")
         self.headers = kwargs.get("headers", {})
         self.timeout = kwargs.get("timeout", 10)
 
+        self.connector_limit = kwargs.get("connector_limit", 100)
+        self.connector_limit_per_host = kwargs.get("connector_limit_per_host", 0)
+        self.keepalive_timeout = kwargs.get("keepalive_timeout", 30)
+        self.ttl_dns_cache = kwargs.get("ttl_dns_cache", 300)
+
+        self.rate_limiter: Optional[RateLimiter] = kwargs.get("rate_limiter")
+        if self.rate_limiter is None and kwargs.get("rps"):
+            rate_limit_key = kwargs.get("rate_limit_key") or self.base_url
+            self.rate_limiter = RateLimiter.for_key(rate_limit_key, kwargs["rps"])
+        self.max_retries = kwargs.get("max_retries", 3)
+
+        self.coalesce_requests = kwargs.get("coalesce_requests", True)
+        self._in_flight: Dict[Hashable, List[Any]] = {}
+        self.get_method_cache: Optional[GetMethodCache] = kwargs.get("get_method_cache")
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing_tasks: Set[asyncio.Future] = set()
+
+    async def __aenter__(self) -> Client:
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the pooled HTTP session, creating it on first use.
+
+        A new session is also created if the previous one was closed
+        or belongs to another event loop, in which case the previous one is closed.
+
+        :return: The HTTP session.
+        """
+        loop = asyncio.get_running_loop()
+
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if self._session is not None and not self._session.closed:
+                self._close_stale_session(self._session, self._session_loop)
+
+            connector = aiohttp.TCPConnector(
+                limit=self.connector_limit,
+                limit_per_host=self.connector_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._session_loop = loop
+
+        return self._session
+
+    def _close_stale_session(
+            self,
+            session: aiohttp.ClientSession,
+            loop: Optional[asyncio.AbstractEventLoop],
+    ) -> None:
+        """
+        Close a session created in another event loop.
+
+        :param session: The session.
+        :param loop: The event loop the session was created in.
+        """
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+
+        # closing the connector does not need its loop to run, the transports are closed synchronously
+        task = asyncio.ensure_future(session.close())
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    async def close(self) -> None:
+        """
+        Close the pooled HTTP session and release its connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+        self._session = None
+        self._session_loop = None
+
     @staticmethod
     async def __read_content(response: aiohttp.ClientResponse) -> Any:
         """
@@ -40,6 +195,29 @@ class Client:
 
         return content
 
+    @staticmethod
+    def __read_retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+        """
+        Read the Retry-After header of the response.
+
+        :param response: The HTTP response object.
+        :return: The delay in seconds, or None if the header is missing or invalid.
+        """
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
     async def _request(
             self,
             method: str,
@@ -47,6 +225,7 @@ class Client:
             headers: Optional[Dict[str, Any]] = None,
             params: Optional[Dict[str, Any]] = None,
             body: Optional[Dict[str, Any]] = None,
+            priority: int = RequestPriority.READ,
     ) -> Dict[str, Any]:
         """
         Make an HTTP request.
@@ -56,33 +235,43 @@ class Client:
         :param headers: Optional headers to include in the request.
         :param params: Optional query parameters.
         :param body: Optional request body data.
+        :param priority: The request priority for the rate limiter. Defaults to RequestPriority.READ.
         :return: The response content as a dictionary.
         """
         url = self.base_url + path
-        self.headers.update(headers or {})
-        try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.request(
-                        method=method,
-                        url=url,
-                        params=params,
-                        json=body,
-                        timeout=self.timeout,
-                ) as response:
-                    content = await self.__read_content(response)
-
-                    if not response.ok:
-                        raise aiohttp.ClientResponseError(
-                            request_info=response.request_info,
-                            history=response.history,
-                            status=response.status,
-                            message=content.get("error", content)
-                        )
-
-                    return content
-
-        except aiohttp.ClientError:
-            raise
+        session = self._get_session()
+        attempt = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(priority)
+
+            async with session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    json=body,
+            ) as response:
+                content = await self.__read_content(response)
+
+                if response.status == 429 and self.rate_limiter is not None and attempt < self.max_retries:
+                    self.rate_limiter.on_throttle(self.__read_retry_after(response))
+                    attempt += 1
+                    continue
+
+                if not response.ok:
+                    raise aiohttp.ClientResponseError(
+                        request_info=response.request_info,
+                        history=response.history,
+                        status=response.status,
+                        message=str(content.get("error", content) if isinstance(content, dict) else content),
+                    )
+
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_success()
+
+                return content
 
     async def _get(
             self,
@@ -106,6 +295,7 @@ class Client:
             params: Optional[Dict[str, Any]] = None,
             body: Optional[Dict[str, Any]] = None,
             headers: Optional[Dict[str, Any]] = None,
+            priority: int = RequestPriority.READ,
     ) -> Dict[str, Any]:
         """
         Make a POST request.
@@ -113,9 +303,97 @@ class Client:
         :param method: The API method.
         :param body: The request body data.
         :param headers: Optional headers to include in the request.
+        :param priority: The request priority for the rate limiter. Defaults to RequestPriority.READ.
         :return: The response content as a dictionary.
         """
-        return await self._request("POST", method, headers, params=params, body=body)
+        return await self._request("POST", method, headers, params=params, body=body, priority=priority)
+
+    @staticmethod
+    def _normalize_stack_value(value: Any) -> Hashable:
+        """
+        Convert a get method argument to a hashable value identifying it.
+
+        :param value: The argument.
+        :return: The hashable value.
+        """
+        if isinstance(value, Slice):
+            return "slice", value.to_cell().hash
+        if isinstance(value, Cell):
+            return "cell", value.hash
+        if isinstance(value, Address):
+            return "address", value.to_str(is_user_friendly=False)
+        if isinstance(value, (list, tuple)):
+            return tuple(Client._normalize_stack_value(v) for v in value)
+
+        hash(value)
+        return type(value).__name__, value
+
+    @staticmethod
+    def _normalize_address(address: Any) -> str:
+        """
+        Convert an address to its raw form, so that different notations of one address match.
+
+        :param address: The address.
+        :return: The raw address, or the address as is if it cannot be parsed.
+        """
+        try:
+            return Address(address).to_str(is_user_friendly=False)
+        except Exception:  # noqa
+            return str(address)
+
+    @classmethod
+    def _copy_result(cls, result: Any) -> Any:
+        """
+        Copy the mutable parts of a shared result, so that every consumer
+        can read its slices and modify its containers independently.
+
+        :param result: The result.
+        :return: The copy.
+        """
+        if isinstance(result, Slice):
+            return result.copy()
+        if isinstance(result, list):
+            return [cls._copy_result(v) for v in result]
+        if isinstance(result, tuple):
+            return tuple(cls._copy_result(v) for v in result)
+        if isinstance(result, dict):
+            return {k: cls._copy_result(v) for k, v in result.items()}
+
+        return result
+
+    async def _single_flight(self, key: Optional[Hashable], request: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run the request, or join the identical request already in flight.
+
+        The request runs in its own task, so a cancelled caller does not
+        cancel it for the other callers. Callers joining a request get
+        copies of its result.
+
+        :param key: The key identifying the request, or None to never share it.
+        :param request: A coroutine function making the request.
+        :return: The result of the request.
+        """
+        if key is None or not self.coalesce_requests:
+            return await request()
+
+        shared = self._in_flight.get(key)
+        if shared is not None:
+            shared[1] += 1
+            return self._copy_result(await asyncio.shield(shared[0]))
+
+        task = asyncio.ensure_future(request())
+        shared = self._in_flight[key] = [task, 0]
+
+        def release(completed: asyncio.Future) -> None:
+            if self._in_flight.get(key) is shared:
+                del self._in_flight[key]
+            if not completed.cancelled():
+                completed.exception()  # mark the exception as retrieved
+
+        task.add_done_callback(release)
+        result = await asyncio.shield(task)
+
+        return self._copy_result(result) if shared[1] else result
 
     async def run_get_method(
             self,
@@ -126,6 +404,66 @@ class Client:
         """
         Run a get method on a specified address in the blockchain.
 
+        Identical concurrent calls share one request.
+
+        :param address: The address of the smart contract on the blockchain.
+        :param method_name: The name of the method to run on the smart contract.
+        :param stack: The stack of arguments to pass to the method. Defaults to None.
+        :return: The result of the get method call.
+        """
+        try:
+            key = (
+                "run_get_method",
+                self._normalize_address(address),
+                method_name,
+                self._normalize_stack_value(stack or []),
+            )
+        except TypeError:
+            key = None
+
+        cache = self.get_method_cache
+        if cache is None or key is None or not cache.is_cached(method_name):
+            return await self._single_flight(key, lambda: self._run_get_method(address, method_name, stack))
+
+        last_transaction_lt = None
+        if cache.needs_lt(method_name):
+            last_transaction_lt = cache.get_known_lt(key[1])
+            if last_transaction_lt is None:
+                last_transaction_lt = (await self.get_raw_account(address)).last_transaction_lt
+
+        cache_key = repr((self.__class__.__name__,) + key)
+        found, result = cache.get(cache_key, last_transaction_lt)
+        if found:
+            return self._copy_result(result)
+
+        result = await self._single_flight(key, lambda: self._run_get_method(address, method_name, stack))
+        if self._is_successful_result(result):
+            cache.set(cache_key, self._copy_result(result), last_transaction_lt)
+
+        return result
+
+    @staticmethod
+    def _is_successful_result(result: Any) -> bool:
+        """
+        Check whether a get method result reports a successful execution, so it can be cached.
+
+        :param result: The result of the get method call.
+        :return: False if the result reports a failed execution, True otherwise.
+        """
+        if isinstance(result, dict):
+            return result.get("success", True) and result.get("exit_code", 0) in (0, 1)
+
+        return True
+
+    async def _run_get_method(
+            self,
+            address: str,
+            method_name: str,
+            stack: Optional[List[Any]] = None,
+    ) -> Any:
+        """
+        Send a get method request. Implemented by subclasses.
+
         :param address: The address of the smart contract on the blockchain.
         :param method_name: The name of the method to run on the smart contract.
         :param stack: The stack of arguments to pass to the method. Defaults to None.
@@ -145,6 +483,23 @@ class Client:
         """
         Retrieve raw account information from the blockchain.
 
+        Identical concurrent calls share one request.
+
+        :param address: The blockchain account address.
+        :return: A dictionary containing the account information.
+        """
+        key = "get_raw_account", self._normalize_address(address)
+        raw_account = await self._single_flight(key, lambda: self._get_raw_account(address))
+
+        if self.get_method_cache is not None:
+            self.get_method_cache.observe_account(key[1], raw_account.last_transaction_lt)
+
+        return raw_account
+
+    async def _get_raw_account(self, address: str) -> RawAccount:
+        """
+        Send a raw account request. Implemented by subclasses.
+
         :param address: The blockchain account address.
         :return: A dictionary containing the account information.
         """
@@ -159,6 +514,114 @@ class Client:
         """
         raise NotImplementedError
 
+    async def _run_chunked(
+            self,
+            addresses: List[str],
+            fetch: Callable[[List[str]], Awaitable[List[T]]],
+            chunk_size: Optional[int],
+            concurrency: Optional[int],
+    ) -> List[T]:
+        """
+        Fetch data of many addresses in chunks, running a bounded number of chunks at once.
+
+        :param addresses: The addresses.
+        :param fetch: A coroutine function returning the data of a chunk of addresses, in order.
+        :param chunk_size: The number of addresses in a chunk. Defaults to bulk_chunk_size.
+        :param concurrency: The maximum number of chunks fetched at once. Defaults to bulk_concurrency.
+        :return: The data of the addresses, in order.
+        """
+        chunk_size = chunk_size or self.bulk_chunk_size
+        semaphore = asyncio.Semaphore(concurrency or self.bulk_concurrency)
+
+        async def fetch_chunk(chunk: List[str]) -> List[T]:
+            async with semaphore:
+                return await fetch(chunk)
+
+        chunks = await asyncio.gather(*[
+            fetch_chunk(addresses[i:i + chunk_size])
+            for i in range(0, len(addresses), chunk_size)
+        ])
+
+        return [item for chunk in chunks for item in chunk]
+
+    def _has_bulk_request(self, *method_names: str) -> bool:
+        """
+        Check whether the provider overrides any of the chunk fetching methods with a bulk request.
+        Otherwise a chunk is fetched with concurrent single account requests.
+
+        :param method_names: The names of the chunk fetching methods.
+        :return: True if a bulk request is available.
+        """
+        return any(getattr(type(self), name) is not getattr(Client, name) for name in method_names)
+
+    async def get_raw_accounts(
+            self,
+            addresses: List[str],
+            chunk_size: Optional[int] = None,
+            concurrency: Optional[int] = None,
+    ) -> List[RawAccount]:
+        """
+        Retrieve raw account information of many accounts.
+
+        :param addresses: The blockchain account addresses.
+        :param chunk_size: The number of accounts fetched in one request. Defaults to bulk_chunk_size.
+            Ignored by providers without a bulk request.
+        :param concurrency: The maximum number of requests in flight. Defaults to bulk_concurrency.
+        :return: The account information, in the order of the addresses.
+        """
+        if not self._has_bulk_request("_get_raw_accounts"):
+            chunk_size = 1
+
+        raw_accounts = await self._run_chunked(addresses, self._get_raw_accounts, chunk_size, concurrency)
+
+        if self.get_method_cache is not None:
+            for address, raw_account in zip(addresses, raw_accounts):
+                self.get_method_cache.observe_account(
+                    self._normalize_address(address), raw_account.last_transaction_lt,
+                )
+
+        return raw_accounts
+
+    async def _get_raw_accounts(self, addresses: List[str]) -> List[RawAccount]:
+        """
+        Fetch raw account information of a chunk of accounts.
+        Defaults to concurrent :meth:`get_raw_account` calls, providers with bulk requests override it.
+
+        :param addresses: The blockchain account addresses.
+        :return: The account information, in the order of the addresses.
+        """
+        return list(await asyncio.gather(*[self.get_raw_account(address) for address in addresses]))
+
+    async def get_account_balances(
+            self,
+            addresses: List[str],
+            chunk_size: Optional[int] = None,
+            concurrency: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Retrieve the balances of many accounts.
+
+        :param addresses: The blockchain account addresses.
+        :param chunk_size: The number of accounts fetched in one request. Defaults to bulk_chunk_size.
+            Ignored by providers without a bulk request.
+        :param concurrency: The maximum number of requests in flight. Defaults to bulk_concurrency.
+        :return: The balances, in the order of the addresses.
+        """
+        if not self._has_bulk_request("_get_account_balances", "_get_raw_accounts"):
+            chunk_size = 1
+
+        return await self._run_chunked(addresses, self._get_account_balances, chunk_size, concurrency)
+
+    async def _get_account_balances(self, addresses: List[str]) -> List[int]:
+        """
+        Fetch the balances of a chunk of accounts.
+        Defaults to the balances of :meth:`_get_raw_accounts`.
+
+        :param addresses: The blockchain account addresses.
+        :return: The balances, in the order of the addresses.
+        """
+        return [raw_account.balance for raw_account in await self._get_raw_accounts(addresses)]
+
 
 class LiteBalancer:
     """
@@ -184,6 +647,26 @@ class LiteBalancer:
     async def __aexit__(self, exc_type, exc_value, traceback) -> None:
         raise PytoniqDependencyError()
 
+    @property
+    def inited(self) -> bool:
+        return False
+
+    @property
+    def alive_peers_num(self) -> int:
+        return 0
+
+    async def start_up(self) -> None:
+        raise PytoniqDependencyError()
+
+    async def close_all(self) -> None:
+        raise PytoniqDependencyError()
+
+    async def get_masterchain_info(self) -> Any:
+        raise PytoniqDependencyError()
+
+    async def raw_get_account_state(self, address: Any) -> Any:
+        raise PytoniqDependencyError()
+
     async def run_get_method(self, address: str, method_name: str, stack: List[Any]) -> Any:
         raise PytoniqDependencyError()
 
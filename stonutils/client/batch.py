@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from ..exceptions import JsonRpcError, TonutilsException
+
+if TYPE_CHECKING:
+    from ._base import Client
+
+
+class JsonRpcBatcher:
+    """
+    Collects JSON-RPC calls and sends them to the API in batches.
+
+    A batch is sent when ``max_size`` calls are collected or ``window`` seconds
+    after its first call, whichever comes first. Each call resolves with its own
+    result or fails with its own error.
+    """
+
+    def __init__(
+            self,
+            client: Client,
+            path: str,
+            window: float = 0.01,
+            max_size: int = 100,
+    ) -> None:
+        """
+        Initialize the JsonRpcBatcher.
+
+        :param client: The client sending the batches.
+        :param path: The JSON-RPC endpoint path.
+        :param window: The maximum time in seconds a call waits for other calls. Defaults to 0.01.
+        :param max_size: The maximum number of calls in a batch. Defaults to 100.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be positive.")
+
+        self.client = client
+        self.path = path
+        self.window = window
+        self.max_size = max_size
+
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def call(self, method: str, params: Dict[str, Any]) -> Any:
+        """
+        Add a call to the current batch and wait for its result.
+
+        :param method: The JSON-RPC method.
+        :param params: The method parameters.
+        :return: The result of the call.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((method, params, future))
+
+        if len(self._pending) >= self.max_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        """
+        Send the collected calls without waiting for the window to pass.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+
+        task = asyncio.ensure_future(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """
+        Send the collected calls and wait until all batches are answered.
+        """
+        self.flush()
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _send(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        body = [
+            {"id": i, "jsonrpc": "2.0", "method": method, "params": params}
+            for i, (method, params, _) in enumerate(batch)
+        ]
+
+        try:
+            responses = await self.client._post(method=self.path, body=body)  # noqa
+        except asyncio.CancelledError:
+            for _, _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if isinstance(responses, dict):
+            responses = [responses] if "id" in responses else []
+        if not isinstance(responses, list):
+            responses = []
+
+        by_id = {response.get("id"): response for response in responses if isinstance(response, dict)}
+
+        for i, (method, _, future) in enumerate(batch):
+            if future.done():
+                continue
+
+            response = by_id.get(i)
+            if response is None:
+                future.set_exception(TonutilsException(f"No response to JSON-RPC call {method} in the batch."))
+            elif response.get("ok", "error" not in response):
+                future.set_result(response.get("result"))
+            else:
+                future.set_exception(JsonRpcError(method, str(response.get("error")), response.get("code")))
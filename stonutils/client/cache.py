@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+
+class CacheEntry(NamedTuple):
+    """
+    A cached get method result.
+
+    :param value: The result of the get method call.
+    :param last_transaction_lt: The logical time of the last account transaction
+        when the result was fetched, or None if it is unknown.
+    :param expires_at: Unix time after which the entry is stale, or None if it never expires.
+    """
+    value: Any
+    last_transaction_lt: Optional[int]
+    expires_at: Optional[float]
+
+
+class CacheBackend:
+    """
+    Base class of get method cache storages.
+    """
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Return the entry stored under the key, or None.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Store the entry under the key.
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """
+        Remove the entry stored under the key, if any.
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-memory LRU cache storage.
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+        """
+        Initialize the MemoryCache.
+
+        :param max_size: The maximum number of entries. The least recently used
+            entries are evicted first. Defaults to 10000.
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCache(CacheBackend):
+    """
+    On-disk cache storage backed by an SQLite database, so results survive restarts
+    and can be shared by several processes.
+
+    Values are stored pickled: only use database files you created yourself.
+    """
+
+    def __init__(self, path: str, max_size: Optional[int] = None) -> None:
+        """
+        Initialize the SqliteCache.
+
+        :param path: The database file path. Created if it does not exist.
+        :param max_size: The maximum number of entries. The least recently used
+            entries are evicted first. Defaults to None (no limit).
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS get_method_cache ("
+            "key TEXT PRIMARY KEY, "
+            "value BLOB NOT NULL, "
+            "last_transaction_lt INTEGER, "
+            "expires_at REAL, "
+            "used_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS get_method_cache_used_at ON get_method_cache (used_at)"
+        )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, last_transaction_lt, expires_at FROM get_method_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            if self.max_size is not None:
+                self._connection.execute(
+                    "UPDATE get_method_cache SET used_at = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+
+        return CacheEntry(pickle.loads(row[0]), row[1], row[2])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        value = pickle.dumps(entry.value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO get_method_cache VALUES (?, ?, ?, ?, ?)",
+                (key, value, entry.last_transaction_lt, entry.expires_at, time.time()),
+            )
+
+            if self.max_size is not None:
+                self._connection.execute(
+                    "DELETE FROM get_method_cache WHERE key IN ("
+                    "SELECT key FROM get_method_cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_size,),
+                )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM get_method_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM get_method_cache")
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM get_method_cache").fetchone()[0]
+
+
+class GetMethodCache:
+    """
+    Opt-in cache of get method results, passed to a client
+    with the ``get_method_cache`` option.
+
+    Entries are evicted by the backend (LRU) and expire after ``ttl``.
+    In strict mode an entry is only served while the last transaction
+    logical time of the account is the same as when it was fetched: the account
+    state is looked up before serving it (one request per account, shared
+    by all cached methods of the account and by concurrent calls), unless
+    it was looked up within ``lt_check_interval``, e.g. by a bulk
+    :meth:`Client.get_raw_accounts` call. Results of :attr:`IMMUTABLE_METHODS`
+    are served without the lookup.
+
+    Results of methods such as ``get_wallet_address`` or ``get_vault_address``
+    never change, see :attr:`IMMUTABLE_METHODS`.
+    """
+
+    IMMUTABLE_METHODS = frozenset({
+        "get_wallet_address",
+        "get_vault_address",
+        "get_pool_address",
+        "get_public_key",
+        "get_royalty_params",
+        "get_subwallet_id",
+        "get_nft_address_by_index",
+    })
+
+    def __init__(
+            self,
+            backend: Optional[CacheBackend] = None,
+            ttl: Optional[float] = None,
+            strict: bool = False,
+            methods: Optional[Iterable[str]] = None,
+            lt_check_interval: float = 1,
+            max_accounts: int = 10000,
+    ) -> None:
+        """
+        Initialize the GetMethodCache.
+
+        :param backend: The storage. Defaults to a new MemoryCache.
+        :param ttl: Time in seconds an entry is served for. Defaults to None (until evicted).
+        :param strict: Whether entries are invalidated when the account's
+            last_transaction_lt changes. Defaults to False.
+        :param methods: Names of the get methods to cache. Defaults to None (all methods).
+        :param lt_check_interval: In strict mode, time in seconds a looked up
+            last_transaction_lt is trusted for. Defaults to 1. With 0 the account is
+            looked up on every call, which saves the get method execution but no request.
+        :param max_accounts: In strict mode, the maximum number of accounts whose
+            last_transaction_lt is remembered, least recently seen first out. Defaults to 10000.
+        """
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttl = ttl
+        self.strict = strict
+        self.methods: Optional[Set[str]] = set(methods) if methods is not None else None
+        self.lt_check_interval = lt_check_interval
+        self.max_accounts = max_accounts
+
+        self.hits = 0
+        self.misses = 0
+
+        self._account_lts: OrderedDict[str, Tuple[int, float]] = OrderedDict()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The share of lookups served from the cache.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the cache metrics.
+
+        :return: A dictionary with the number of hits, misses, the hit rate and the number of entries.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "size": len(self.backend),
+        }
+
+    def is_cached(self, method_name: str) -> bool:
+        """
+        Check whether results of the get method are cached.
+        """
+        return self.methods is None or method_name in self.methods
+
+    def needs_lt(self, method_name: str) -> bool:
+        """
+        Check whether serving a cached result of the get method requires
+        the last transaction logical time of the account.
+        """
+        return self.strict and method_name not in self.IMMUTABLE_METHODS
+
+    def get_known_lt(self, address: str) -> Optional[int]:
+        """
+        Return the last transaction logical time of the account if it was
+        looked up within ``lt_check_interval``, or None.
+
+        :param address: The raw account address.
+        """
+        known = self._account_lts.get(address)
+        if known is None or time.monotonic() - known[1] > self.lt_check_interval:
+            return None
+
+        return known[0]
+
+    def observe_account(self, address: str, last_transaction_lt: int) -> None:
+        """
+        Record the last transaction logical time of an account. Only used in strict mode.
+
+        :param address: The raw account address.
+        :param last_transaction_lt: The logical time of its last transaction.
+        """
+        if not self.strict:
+            return
+
+        self._account_lts[address] = (last_transaction_lt, time.monotonic())
+        self._account_lts.move_to_end(address)
+
+        while len(self._account_lts) > self.max_accounts:
+            self._account_lts.popitem(last=False)
+
+    def get(self, key: str, last_transaction_lt: Optional[int] = None) -> Tuple[bool, Any]:
+        """
+        Look up a result.
+
+        :param key: The request key.
+        :param last_transaction_lt: In strict mode, the current logical time of the last account transaction.
+        :return: A (found, value) tuple.
+        """
+        entry = self.backend.get(key)
+
+        if entry is not None and (
+                (entry.expires_at is not None and time.time() >= entry.expires_at) or
+                (self.strict and entry.last_transaction_lt != last_transaction_lt)
+        ):
+            self.backend.delete(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        return True, entry.value
+
+    def set(self, key: str, value: Any, last_transaction_lt: Optional[int] = None) -> None:
+        """
+        Store a result.
+
+        :param key: The request key.
+        :param value: The result of the get method call.
+        :param last_transaction_lt: The logical time of the last account transaction before the call.
+        """
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        self.backend.set(key, CacheEntry(value, last_transaction_lt, expires_at))
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the metrics.
+        """
+        self.backend.clear()
+        self._account_lts.clear()
+        self.hits = 0
+        self.misses = 0
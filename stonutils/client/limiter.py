@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+
+class RequestPriority(IntEnum):
+    """
+    Priority classes of API requests. Lower values are served first.
+    """
+    SEND = 0
+    READ = 1
+
+
+class RateLimiter:
+    """
+    Asynchronous token bucket limiting the request rate to an API.
+
+    Waiting requests are served in priority order, so sending messages
+    is never stuck behind a queue of reads. The rate adapts to the server
+    in AIMD fashion: every ``429 Too Many Requests`` response cuts it
+    multiplicatively and pauses the bucket for the ``Retry-After`` period,
+    every successful response grows it back additively up to ``rps``.
+
+    Clients using the same API key should share one limiter,
+    see :meth:`for_key`. A limiter serves one event loop at a time:
+    used from another loop (e.g. after a new ``asyncio.run``), it drops
+    the waiters of the previous loop and dispatches in the new one.
+    """
+
+    _registry: Dict[str, RateLimiter] = {}
+
+    def __init__(
+            self,
+            rps: float,
+            burst: Optional[float] = None,
+            min_rps: Optional[float] = None,
+            increase_step: Optional[float] = None,
+            decrease_factor: float = 0.5,
+    ) -> None:
+        """
+        Initialize the RateLimiter.
+
+        :param rps: The maximum number of requests per second (the API quota).
+        :param burst: The bucket capacity. Defaults to one second worth of requests.
+        :param min_rps: The rate never drops below this value. Defaults to 10% of rps.
+        :param increase_step: The rate increase after each successful request. Defaults to 5% of rps.
+        :param decrease_factor: The rate multiplier applied on each throttled request. Defaults to 0.5.
+        """
+        if rps <= 0:
+            raise ValueError("rps must be positive.")
+
+        self.max_rps = rps
+        self.rps = rps
+        self.burst = burst or max(1.0, rps)
+        self.min_rps = min_rps or rps * 0.1
+        self.increase_step = increase_step or rps * 0.05
+        self.decrease_factor = decrease_factor
+
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def for_key(cls, key: str, rps: float, **kwargs) -> RateLimiter:
+        """
+        Get the limiter shared by all clients using the given API key,
+        creating it on first use. The registry holds a hash of the key, not the key itself.
+
+        :param key: The API key (or any other quota identifier).
+        :param rps: The maximum number of requests per second. Must match the existing limiter of the key.
+        :param kwargs: Additional arguments for a new limiter.
+        :return: The shared rate limiter.
+        """
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        limiter = cls._registry.get(digest)
+
+        if limiter is None:
+            limiter = cls._registry[digest] = cls(rps, **kwargs)
+        elif limiter.max_rps != rps:
+            raise ValueError(
+                f"A rate limiter with {limiter.max_rps} rps already exists for this key, "
+                f"cannot share it with {rps} rps."
+            )
+
+        return limiter
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rps)
+        self._updated_at = now
+
+    async def acquire(self, priority: int = RequestPriority.READ) -> None:
+        """
+        Wait until a request of the given priority may be sent.
+
+        :param priority: The request priority. Defaults to RequestPriority.READ.
+        """
+        self._refill()
+
+        if not self._waiters and self._tokens >= 1 and time.monotonic() >= self._paused_until:
+            self._tokens -= 1
+            return
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # the dispatcher and the waiters of another event loop can never run in this one
+            if self._dispatcher is not None and not self._dispatcher.done() and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._dispatcher.cancel)
+            self._dispatcher = None
+            self._waiters = []
+            self._loop = loop
+
+        waiter = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), waiter))
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        await waiter
+
+    async def _dispatch(self) -> None:
+        """
+        Hand out tokens to the waiting requests in priority order.
+        """
+        while self._waiters:
+            if self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+                continue
+
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                heapq.heappop(self._waiters)[2].set_result(None)
+            else:
+                await asyncio.sleep((1 - self._tokens) / self.rps)
+
+    def on_success(self) -> None:
+        """
+        Register a successful response: additively increase the rate.
+        """
+        self.rps = min(self.max_rps, self.rps + self.increase_step)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Register a throttled (429) response: multiplicatively decrease the rate
+        and pause the bucket.
+
+        :param retry_after: The Retry-After delay in seconds, if the server sent one.
+        """
+        self.rps = max(self.min_rps, self.rps * self.decrease_factor)
+        self._tokens = 0.0
+        self._updated_at = time.monotonic()
+
+        delay = retry_after if retry_after is not None else 1 / self.rps
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from pytoniq_core import Address, SimpleAccount
 
@@ -16,7 +18,8 @@ except ImportError:
     pytoniq_available = False
     from ._base import LiteBalancer
 
-from ._base import Client
+from ._base import Client, ResultFormat
+from .limiter import RequestPriority
 
 
 class LiteserverClient(Client):
@@ -25,13 +28,27 @@ class LiteserverClient(Client):
 
     This class provides methods to run get methods and send messages to the blockchain,
     with options for configuration and network selection.
+
+    By default every call connects to the lite servers and disconnects afterwards.
+    After :meth:`start` (or inside ``async with LiteserverClient(...)``) the connection
+    is kept open until :meth:`close`, so a single started client can be shared
+    by any number of wallets and contracts and each call costs one query round trip.
+
+    Bulk requests (:meth:`get_raw_accounts`, :meth:`get_account_balances`) run
+    up to ``bulk_concurrency`` concurrent account state queries over one connection.
     """
 
+    bulk_concurrency = 50
+    result_format = ResultFormat.LITESERVER
+
     def __init__(
             self,
             config: Optional[Dict[str, Any]] = None,
             is_testnet: Optional[bool] = False,
             trust_level: int = 2,
+            health_check_interval: float = 10,
+            reconnect_delay: float = 1,
+            **kwargs: Any,
     ) -> None:
         """
         Initialize the LiteClient.
@@ -45,8 +62,13 @@ class LiteserverClient(Client):
             For trustless communication with Lite servers, there are "Proofs" in TON. The trust_level argument
             in the LiteClient constructor defines how much you trust the Liteserver you communicate with.
             Refer to the documentation for more details: https://yungwine.gitbook.io/pytoniq-doc/liteclient/trust-levels
+        :param health_check_interval: Interval in seconds between health checks of a started client.
+            Defaults to 10.
+        :param reconnect_delay: Initial delay in seconds between reconnect attempts of a started client.
+            The delay doubles after each failed attempt up to one minute. Defaults to 1.
+        :param kwargs: Client options, see :class:`Client` (e.g. rps, coalesce_requests, get_method_cache).
         """
-        super().__init__()
+        super().__init__(**kwargs)
 
         if not pytoniq_available:
             raise PytoniqDependencyError()
@@ -58,7 +80,176 @@ class LiteserverClient(Client):
         else:
             self.client = LiteBalancer.from_mainnet_config(trust_level=trust_level)
 
-    async def run_get_method(
+        self.health_check_interval = health_check_interval
+        self.reconnect_delay = reconnect_delay
+
+        self._started = False
+        self._ready: Optional[asyncio.Event] = None
+        self._health_check_task: Optional[asyncio.Task] = None
+
+        # bulk requests sharing a connection opened for them
+        self._bulk_users = 0
+        self._bulk_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> LiteserverClient:
+        await self.start()
+        return self
+
+    async def start(self) -> None:
+        """
+        Connect to the lite servers and keep the connection open until :meth:`close`.
+
+        While started, the connection is checked in the background and
+        re-established if no lite server answers.
+        """
+        if not pytoniq_available:
+            raise PytoniqDependencyError()
+
+        if self._started:
+            return
+
+        await self.client.start_up()
+
+        self._ready = asyncio.Event()
+        self._ready.set()
+        self._started = True
+        self._health_check_task = asyncio.create_task(self._health_check())
+
+    async def close(self) -> None:
+        """
+        Stop the background health checks and disconnect from the lite servers.
+        Calls waiting for a reconnect fail with ConnectionError.
+        """
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            try:
+                await self._health_check_task
+            except asyncio.CancelledError:
+                pass
+            self._health_check_task = None
+
+        if self._started:
+            self._started = False
+            # wake the calls waiting for an interrupted reconnect, they see the client closed
+            self._ready.set()
+            if self.client.inited:
+                await self.client.close_all()
+
+        await super().close()
+
+    async def _health_check(self) -> None:
+        """
+        Periodically query the lite servers and reconnect when they stop answering.
+        """
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+
+            try:
+                if not self.client.alive_peers_num:
+                    raise ConnectionError("No alive lite servers.")
+                await asyncio.wait_for(
+                    self.client.get_masterchain_info(),
+                    timeout=self.health_check_interval,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa
+                await self._reconnect()
+
+    async def _reconnect(self) -> None:
+        """
+        Re-establish the connection, retrying with exponential backoff.
+        Calls made in the meantime wait until the connection is restored.
+        """
+        self._ready.clear()
+        delay = self.reconnect_delay
+
+        try:
+            await self.client.close_all()
+        except Exception:  # noqa
+            pass
+
+        while True:
+            try:
+                await self.client.start_up()
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60)
+
+        self._ready.set()
+
+    @asynccontextmanager
+    async def _connection(self, priority: int = RequestPriority.READ) -> AsyncIterator[LiteBalancer]:
+        """
+        Provide a connected LiteBalancer for a single call.
+
+        A started client reuses its open connection,
+        otherwise the connection is opened for the duration of the call.
+        The call waits for the rate limiter, if the client has one.
+
+        :param priority: The request priority for the rate limiter. Defaults to RequestPriority.READ.
+        """
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(priority)
+
+        if self._started:
+            await self._ready.wait()
+            if not self._started:
+                raise ConnectionError("The client was closed.")
+            yield self.client
+        else:
+            async with self.client:
+                yield self.client
+
+    @asynccontextmanager
+    async def _bulk_connection(self) -> AsyncIterator[None]:
+        """
+        Keep one connection open for all calls of a bulk request.
+
+        A client that is not started is started for the bulk request and
+        closed when the last concurrent bulk request using it completes.
+        """
+        if self._bulk_lock is None:
+            self._bulk_lock = asyncio.Lock()
+
+        async with self._bulk_lock:
+            owned = not self._started or self._bulk_users > 0
+            if owned:
+                if not self._started:
+                    await self.start()
+                self._bulk_users += 1
+
+        try:
+            yield
+        finally:
+            if owned:
+                async with self._bulk_lock:
+                    self._bulk_users -= 1
+                    if not self._bulk_users:
+                        await self.close()
+
+    async def get_raw_accounts(
+            self,
+            addresses: List[str],
+            chunk_size: Optional[int] = None,
+            concurrency: Optional[int] = None,
+    ) -> List[RawAccount]:
+        async with self._bulk_connection():
+            return await super().get_raw_accounts(addresses, chunk_size, concurrency)
+
+    async def get_account_balances(
+            self,
+            addresses: List[str],
+            chunk_size: Optional[int] = None,
+            concurrency: Optional[int] = None,
+    ) -> List[int]:
+        async with self._bulk_connection():
+            return await super().get_account_balances(addresses, chunk_size, concurrency)
+
+    async def _run_get_method(
             self,
             address: str,
             method_name: str,
@@ -67,35 +258,48 @@ class LiteserverClient(Client):
         if not pytoniq_available:
             raise PytoniqDependencyError()
 
-        async with self.client:
-            return await self.client.run_get_method(address, method_name, stack or [])
+        async with self._connection() as client:
+            return await client.run_get_method(address, method_name, stack or [])
 
     async def send_message(self, boc: str) -> None:
         if not pytoniq_available:
             raise PytoniqDependencyError()
 
-        async with self.client:
-            return await self.client.raw_send_message(bytes.fromhex(boc))
+        async with self._connection(RequestPriority.SEND) as client:
+            return await client.raw_send_message(bytes.fromhex(boc))
 
-    async def get_raw_account(self, address: str) -> RawAccount:
+    async def _get_raw_account(self, address: str) -> RawAccount:
         if not pytoniq_available:
             raise PytoniqDependencyError()
 
-        async with self.client:
+        async with self._connection() as client:
             address = Address(address)
-            account, shard_account = await self.client.raw_get_account_state(address)
+            account, shard_account = await client.raw_get_account_state(address)
             simple_account = SimpleAccount.from_raw(account, address)
 
+        if shard_account is None:
+            return RawAccount(
+                balance=0,
+                code=None,
+                data=None,
+                status=AccountStatus.nonexist,
+                last_transaction_lt=0,
+                last_transaction_hash="",
+            )
+
         status = (
             "uninit"
             if simple_account.state.type_ == "uninitialized" else
             simple_account.state.type_
         )
 
+        # uninit and frozen accounts have no code and data
+        state_init = simple_account.state.state_init
+
         return RawAccount(
             balance=int(simple_account.balance),
-            code=simple_account.state.state_init.code,
-            data=simple_account.state.state_init.data,
+            code=state_init.code if state_init is not None else None,
+            data=state_init.data if state_init is not None else None,
             status=AccountStatus(status),
             last_transaction_lt=shard_account.last_trans_lt,
             last_transaction_hash=shard_account.last_trans_hash.hex(),
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, TypeVar
+
+from pytoniq_core import Cell, Slice
+
+from ._base import Client, ResultFormat
+from .toncenter import ToncenterClient
+from ..account import RawAccount
+from ..exceptions import TonutilsException
+
+T = TypeVar("T")
+
+
+class _Backend:
+    """
+    A client wrapped with the statistics used for routing.
+    """
+
+    def __init__(self, client: Client, latency_samples: int) -> None:
+        self.client = client
+        self.in_flight = 0
+        self.latency = 0.0
+        self.latencies: Deque[float] = deque(maxlen=latency_samples)
+        self.failures = 0
+        self.cooldown_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    @property
+    def score(self) -> float:
+        return self.latency * (1 + self.in_flight)
+
+    def on_success(self, latency: float) -> None:
+        self.latency = latency if not self.latencies else 0.8 * self.latency + 0.2 * latency
+        self.latencies.append(latency)
+        self.failures = 0
+        self.cooldown_until = 0.0
+
+    def on_failure(self, cooldown: float) -> None:
+        self.failures += 1
+        self.cooldown_until = time.monotonic() + min(cooldown * 2 ** (self.failures - 1), 60.0)
+
+    def percentile(self, q: float) -> float:
+        latencies = sorted(self.latencies)
+        return latencies[int(q * (len(latencies) - 1))]
+
+
+class MultiClient(Client):
+    """
+    MultiClient class spreading requests over several clients.
+
+    Each call is routed to the healthiest, least loaded client and fails over
+    to the next one on errors or timeouts. Failing clients are put on
+    an exponentially growing cooldown. Reads can optionally be hedged: if the
+    chosen client has not answered within the given latency percentile,
+    the same request is sent to the next client and the first answer wins.
+
+    Any mix of TonapiClient, ToncenterClient and LiteserverClient can be used.
+    Get method arguments and results are translated for every client, and results
+    are returned in the ToncenterClient format (see :attr:`result_format`), so contract
+    helpers such as `JettonMaster.get_wallet_address` and `Wallet.get_seqno` accept it.
+    """
+
+    bulk_chunk_size = 100
+    result_format = ResultFormat.TONCENTER
+
+    def __init__(
+            self,
+            clients: List[Client],
+            request_timeout: float = 10,
+            hedge_percentile: Optional[float] = None,
+            hedge_min_samples: int = 20,
+            failure_cooldown: float = 5,
+    ) -> None:
+        """
+        Initialize the MultiClient.
+
+        :param clients: The clients to route requests to.
+        :param request_timeout: Timeout of a single attempt in seconds. Defaults to 10.
+        :param hedge_percentile: Latency percentile (0..1) after which a read request is duplicated
+            to the next client, e.g. 0.95. Defaults to None (no hedging).
+        :param hedge_min_samples: Number of latency samples needed before reads are hedged.
+            Clients with fewer samples use the latencies of all clients. Defaults to 20.
+        :param failure_cooldown: Initial time in seconds a failed client is skipped for.
+            Doubles with every consecutive failure up to one minute. Defaults to 5.
+        """
+        if not clients:
+            raise ValueError("At least one client is required.")
+
+        super().__init__()
+
+        self.request_timeout = request_timeout
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.failure_cooldown = failure_cooldown
+
+        self._backends = [_Backend(client, max(100, hedge_min_samples)) for client in clients]
+
+    @property
+    def clients(self) -> List[Client]:
+        return [backend.client for backend in self._backends]
+
+    async def __aenter__(self) -> MultiClient:
+        for backend in self._backends:
+            await backend.client.__aenter__()
+        return self
+
+    async def close(self) -> None:
+        """
+        Close all underlying clients.
+        """
+        for backend in self._backends:
+            await backend.client.close()
+
+    def _rank(self, backends: List[_Backend]) -> List[_Backend]:
+        """
+        Order the clients by preference: available clients first, by score,
+        then the cooling down ones, by the end of their cooldown.
+        """
+        available = sorted((b for b in backends if b.available), key=lambda b: b.score)
+        cooling = sorted((b for b in backends if not b.available), key=lambda b: b.cooldown_until)
+
+        return available + cooling
+
+    async def _attempt(self, backend: _Backend, operation: Callable[[Client], Awaitable[T]]) -> T:
+        backend.in_flight += 1
+        started_at = time.monotonic()
+
+        try:
+            result = await asyncio.wait_for(operation(backend.client), self.request_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            backend.on_failure(self.failure_cooldown)
+            raise
+        finally:
+            backend.in_flight -= 1
+
+        backend.on_success(time.monotonic() - started_at)
+        return result
+
+    def _hedge_delay(self, backend: _Backend) -> Optional[float]:
+        """
+        Time to wait for the client before hedging: the configured percentile of its latencies,
+        or of all latencies observed so far while the client has too few samples.
+        """
+        if self.hedge_percentile is None:
+            return None
+
+        if len(backend.latencies) >= self.hedge_min_samples:
+            return backend.percentile(self.hedge_percentile)
+
+        latencies = sorted(latency for b in self._backends for latency in b.latencies)
+        if len(latencies) < self.hedge_min_samples:
+            return None
+
+        return latencies[int(self.hedge_percentile * (len(latencies) - 1))]
+
+    async def _execute(
+            self,
+            operation: Callable[[Client], Awaitable[T]],
+            hedge: bool = False,
+            backends: Optional[List[_Backend]] = None,
+    ) -> T:
+        """
+        Run the operation on the best client, failing over and hedging as configured.
+
+        :param operation: A coroutine function taking a client.
+        :param hedge: Whether the operation may be duplicated to another client.
+        :param backends: Restrict routing to these clients. Defaults to all clients.
+        :return: The result of the first successful attempt.
+        """
+        candidates = self._rank(backends or self._backends)
+        if not candidates:
+            raise TonutilsException("No client can serve this request.")
+
+        pending: Set[asyncio.Task] = set()
+        started: Dict[asyncio.Task, _Backend] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch() -> None:
+            backend = candidates[len(started)]
+            task = asyncio.ensure_future(self._attempt(backend, operation))
+            pending.add(task)
+            started[task] = backend
+
+        launch()
+        try:
+            while pending:
+                delay = None
+                if hedge and len(pending) == 1 and len(started) < len(candidates):
+                    delay = self._hedge_delay(started[next(iter(pending))])
+
+                done, _ = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    launch()
+                    continue
+
+                for task in done:
+                    pending.discard(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+
+                if not pending and len(started) < len(candidates):
+                    launch()
+
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _convert_stack_arg(client: Client, value: Any) -> Any:
+        """
+        Convert a get method argument given in the ToncenterClient format
+        (an integer or a base64 encoded BoC) to the format of the client.
+        """
+        if isinstance(value, int) or client.result_format is ResultFormat.TONCENTER:
+            return value
+
+        if client.result_format is ResultFormat.TONAPI:
+            return base64.b64decode(value).hex()
+
+        if client.result_format is ResultFormat.LITESERVER:
+            return Cell.one_from_boc(base64.b64decode(value)).begin_parse()
+
+        return value
+
+    @classmethod
+    def _convert_tonapi_entry(cls, entry: Dict[str, Any]) -> Dict[str, Any]:
+        entry_type = entry.get("type")
+
+        if entry_type == "num":
+            return {"type": "num", "value": entry["num"]}
+        if entry_type in ("cell", "slice"):
+            return {"type": entry_type, "value": base64.b64encode(bytes.fromhex(entry[entry_type])).decode()}
+        if entry_type == "tuple":
+            return {"type": "tuple", "value": [cls._convert_tonapi_entry(e) for e in entry.get("tuple", [])]}
+
+        return {"type": entry_type, "value": None}
+
+    @classmethod
+    def _convert_lite_entry(cls, entry: Any) -> Dict[str, Any]:
+        if isinstance(entry, int):
+            return {"type": "num", "value": hex(entry)}
+        if isinstance(entry, Cell):
+            return {"type": "cell", "value": base64.b64encode(entry.to_boc()).decode()}
+        if isinstance(entry, Slice):
+            return {"type": "slice", "value": base64.b64encode(entry.to_cell().to_boc()).decode()}
+        if isinstance(entry, (list, tuple)):
+            return {"type": "tuple", "value": [cls._convert_lite_entry(e) for e in entry]}
+
+        return {"type": "null", "value": None}
+
+    @classmethod
+    def _convert_result(cls, client: Client, result: Any) -> Any:
+        """
+        Convert a get method result of the client to the ToncenterClient format.
+        """
+        if client.result_format is ResultFormat.TONAPI:
+            return {
+                "exit_code": result.get("exit_code", 0),
+                "stack": [cls._convert_tonapi_entry(e) for e in result.get("stack", [])],
+            }
+
+        if client.result_format is ResultFormat.LITESERVER:
+            return {
+                "exit_code": 0,
+                "stack": [cls._convert_lite_entry(e) for e in result],
+            }
+
+        return result
+
+    async def _run_get_method(
+            self,
+            address: str,
+            method_name: str,
+            stack: Optional[List[Any]] = None,
+    ) -> Any:
+        async def operation(client: Client) -> Any:
+            result = await client.run_get_method(
+                address=address,
+                method_name=method_name,
+                stack=[self._convert_stack_arg(client, v) for v in (stack or [])],
+            )
+            return self._convert_result(client, result)
+
+        return await self._execute(operation, hedge=True)
+
+    async def send_message(self, boc: str) -> None:
+        await self._execute(lambda client: client.send_message(boc))
+
+    async def _get_raw_account(self, address: str) -> RawAccount:
+        return await self._execute(lambda client: client.get_raw_account(address), hedge=True)
+
+    async def get_account_balance(self, address: str) -> int:
+        return await self._execute(lambda client: client.get_account_balance(address), hedge=True)
+
+    async def _get_raw_accounts(self, addresses: List[str]) -> List[RawAccount]:
+        return await self._execute(lambda client: client.get_raw_accounts(addresses))
+
+    async def _get_account_balances(self, addresses: List[str]) -> List[int]:
+        return await self._execute(lambda client: client.get_account_balances(addresses))
+
+    async def estimate_fee(
+            self,
+            address: str,
+            body: str,
+            init_code: str,
+            init_data: str,
+            ignore_chksig: bool = True,
+    ):
+        backends = [b for b in self._backends if isinstance(b.client, ToncenterClient)]
+        if not backends:
+            raise TonutilsException("Fee estimation requires a ToncenterClient.")
+
+        return await self._execute(
+            lambda client: client.estimate_fee(address, body, init_code, init_data, ignore_chksig),
+            backends=backends,
+        )
@@ -1,8 +1,9 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from pytoniq_core import Cell
 
-from ._base import Client
+from ._base import Client, ResultFormat
+from .limiter import RequestPriority
 from ..account import AccountStatus, RawAccount
 
 
@@ -12,13 +13,21 @@ class TonapiClient(Client):
 
     This class provides methods to run get methods and send messages to the blockchain,
     with options for network selection.
+
+    Tonapi has no bulk request returning account code and data, so
+    :meth:`get_raw_accounts` fetches the accounts concurrently, while
+    :meth:`get_account_balances` uses the bulk accounts request.
     """
 
+    bulk_chunk_size = 100
+    result_format = ResultFormat.TONAPI
+
     def __init__(
             self,
             api_key: Optional = None,
             is_testnet: Optional[bool] = False,
             base_url: Optional[str] = None,
+            **kwargs: Any,
     ) -> None:
         """
         Initialize the TonapiClient.
@@ -28,6 +37,8 @@ class TonapiClient(Client):
         :param is_testnet: Flag to indicate if testnet configuration should be used. Defaults to False.
         :param base_url: Optional base URL for the Tonapi service. If not provided,
             the default public URL will be used. You can specify your own API URL if needed.
+        :param kwargs: Additional client options such as timeout and connection pool settings.
+            See :class:`Client` for the full list.
         """
         if base_url is None:
             base_url = "https://tonapi.io" if not is_testnet else "https://testnet.tonapi.io"
@@ -36,9 +47,10 @@ class TonapiClient(Client):
         if api_key:
             headers = {"Authorization": f"Bearer {api_key}"}
 
-        super().__init__(base_url=base_url, headers=headers)
+        kwargs.setdefault("rate_limit_key", api_key)
+        super().__init__(base_url=base_url, headers=headers, **kwargs)
 
-    async def run_get_method(
+    async def _run_get_method(
             self,
             address: str,
             method_name: str,
@@ -55,25 +67,37 @@ class TonapiClient(Client):
     async def send_message(self, boc: str) -> None:
         method = "/v2/blockchain/message"
 
-        await self._post(method=method, body={"boc": boc})
+        await self._post(method=method, body={"boc": boc}, priority=RequestPriority.SEND)
 
-    async def get_raw_account(self, address: str) -> RawAccount:
+    async def _get_raw_account(self, address: str) -> RawAccount:
         method = f"/v2/blockchain/accounts/{address}"
         result = await self._get(method=method)
 
-        code = Cell.one_from_boc(result["code"])
-        data = Cell.one_from_boc(result["data"])
+        # uninit and nonexistent accounts have no code and data
+        code = Cell.one_from_boc(result["code"]) if result.get("code") else None
+        data = Cell.one_from_boc(result["data"]) if result.get("data") else None
 
         return RawAccount(
-            balance=int(result["balance"]),
+            balance=int(result.get("balance", 0)),
             code=code,
             data=data,
             status=AccountStatus(result["status"]),
-            last_transaction_lt=int(result["last_transaction_lt"]),
-            last_transaction_hash=result["last_transaction_hash"],
+            last_transaction_lt=int(result.get("last_transaction_lt", 0)),
+            last_transaction_hash=result.get("last_transaction_hash", ""),
         )
 
     async def get_account_balance(self, address: str) -> int:
         raw_account = await self.get_raw_account(address)
 
         return raw_account.balance
+
+    async def _get_account_balances(self, addresses: List[str]) -> List[int]:
+        method = "/v2/accounts/_bulk"
+        result = await self._post(method=method, body={"account_ids": addresses})  # noqa
+
+        balances: Dict[str, int] = {
+            self._normalize_address(account["address"]): int(account.get("balance", 0))
+            for account in result["accounts"]
+        }
+
+        return [balances.get(self._normalize_address(address), 0) for address in addresses]
@@ -1,9 +1,11 @@
 import base64
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from pytoniq_core import Cell, Address
 
-from ._base import Client
+from ._base import Client, ResultFormat
+from .batch import JsonRpcBatcher
+from .limiter import RequestPriority
 from ..account import AccountStatus, RawAccount
 from ..utils import boc_to_base64_string
 
@@ -14,13 +16,22 @@ class ToncenterClient(Client):
 
     This class provides methods to run get methods and send messages to the blockchain,
     with options for network selection.
+
+    With ``batch_window`` set, get method and account calls are sent in batches
+    through the v2 JSON-RPC endpoint instead of one request per call.
     """
 
+    bulk_chunk_size = 100
+    result_format = ResultFormat.TONCENTER
+
     def __init__(
             self,
             api_key: str,
             is_testnet: Optional[bool] = False,
             base_url: Optional[str] = None,
+            batch_window: Optional[float] = None,
+            batch_size: int = 100,
+            **kwargs: Any,
     ) -> None:
         """
         Initialize the ToncenterClient.
@@ -30,19 +41,95 @@ class ToncenterClient(Client):
         :param is_testnet: Flag to indicate if testnet configuration should be used. Defaults to False.
         :param base_url: Optional base URL for the Toncenter API. If not provided,
             the default public URL will be used. You can specify your own API URL if needed.
+        :param batch_window: Time in seconds calls are collected for before a batch is sent.
+            Defaults to None (no batching).
+        :param batch_size: The maximum number of calls in a batch. Defaults to 100.
+        :param kwargs: Additional client options such as timeout and connection pool settings.
+            See :class:`Client` for the full list.
         """
         if base_url is None:
             base_url = "https://toncenter.com" if not is_testnet else "https://testnet.toncenter.com"
         headers = {"X-Api-Key": api_key}
 
-        super().__init__(base_url=base_url, headers=headers)
+        kwargs.setdefault("rate_limit_key", api_key)
+        super().__init__(base_url=base_url, headers=headers, **kwargs)
+
+        self.batcher: Optional[JsonRpcBatcher] = None
+        if batch_window is not None:
+            self.batcher = JsonRpcBatcher(self, "/api/v2/jsonRPC", window=batch_window, max_size=batch_size)
+
+    async def close(self) -> None:
+        """
+        Send the pending batched calls and close the HTTP session.
+        """
+        if self.batcher is not None:
+            await self.batcher.close()
+
+        await super().close()
+
+    @classmethod
+    def _convert_v2_entry(cls, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert an element of a v2 tuple or list to the v3 stack entry format.
+        """
+        entry_type = entry.get("@type")
+
+        if entry_type == "tvm.stackEntryNumber":
+            return {"type": "num", "value": hex(int(entry["number"]["number"]))}
+        if entry_type == "tvm.stackEntryCell":
+            return {"type": "cell", "value": entry["cell"]["bytes"]}
+        if entry_type == "tvm.stackEntrySlice":
+            return {"type": "slice", "value": entry["slice"]["bytes"]}
+        if entry_type == "tvm.stackEntryTuple":
+            return {"type": "tuple", "value": [cls._convert_v2_entry(e) for e in entry["tuple"]["elements"]]}
+        if entry_type == "tvm.stackEntryList":
+            return {"type": "list", "value": [cls._convert_v2_entry(e) for e in entry["list"]["elements"]]}
+
+        return {"type": "null", "value": None}
+
+    @classmethod
+    def _convert_v2_stack(cls, stack: List[List[Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert a v2 get method result stack to the v3 format.
+        """
+        result = []
+
+        for entry_type, value in stack:
+            if entry_type == "num":
+                result.append({"type": "num", "value": value})
+            elif entry_type in ("cell", "slice"):
+                result.append({"type": entry_type, "value": value["bytes"]})
+            elif entry_type in ("tuple", "list"):
+                result.append({"type": entry_type, "value": [cls._convert_v2_entry(e) for e in value["elements"]]})
+            else:
+                result.append({"type": entry_type, "value": None})
+
+        return result
 
-    async def run_get_method(
+    async def _run_get_method(
             self,
             address: str,
             method_name: str,
             stack: Optional[List[Any]] = None,
     ) -> Any:
+        if self.batcher is not None:
+            result = await self.batcher.call(
+                "runGetMethod",
+                {
+                    "address": address,
+                    "method": method_name,
+                    "stack": [
+                        ["num", str(v)] if isinstance(v, int) else ["tvm.Slice", v]
+                        for v in (stack or [])
+                    ],
+                },
+            )
+            return {
+                "gas_used": result.get("gas_used"),
+                "exit_code": result.get("exit_code"),
+                "stack": self._convert_v2_stack(result.get("stack", [])),
+            }
+
         method = f"/api/v3/runGetMethod"
         body = {
             "address": address,
@@ -60,25 +147,75 @@ class ToncenterClient(Client):
     async def send_message(self, boc: str) -> None:
         method = "/api/v3/message"
 
-        await self._post(method=method, body={"boc": boc_to_base64_string(boc)})
+        await self._post(method=method, body={"boc": boc_to_base64_string(boc)}, priority=RequestPriority.SEND)
+
+    async def _get_raw_account(self, address: str) -> RawAccount:
+        if self.batcher is not None:
+            result = await self.batcher.call("getAddressInformation", {"address": address})
+            status = "uninit" if result["state"] == "uninitialized" else result["state"]
+
+            return RawAccount(
+                balance=int(result["balance"]),
+                code=Cell.one_from_boc(result["code"]) if result.get("code") else None,
+                data=Cell.one_from_boc(result["data"]) if result.get("data") else None,
+                status=AccountStatus(status),
+                last_transaction_lt=int(result["last_transaction_id"]["lt"]),
+                last_transaction_hash=base64.b64decode(result["last_transaction_id"]["hash"]).hex(),
+            )
 
-    async def get_raw_account(self, address: str) -> RawAccount:
         method = f"/api/v3/account"
         params = {"address": address}
         result = await self._get(method=method, params=params)
 
-        code = Cell.one_from_boc(result["code"])
-        data = Cell.one_from_boc(result["data"])
+        # uninit and nonexistent accounts have no code and data
+        code = Cell.one_from_boc(result["code"]) if result.get("code") else None
+        data = Cell.one_from_boc(result["data"]) if result.get("data") else None
 
         return RawAccount(
             balance=int(result["balance"]),
             code=code,
             data=data,
             status=AccountStatus(result["status"]),
-            last_transaction_lt=int(result["last_transaction_lt"]),
-            last_transaction_hash=base64.b64decode(result["last_transaction_hash"]).hex(),
+            last_transaction_lt=int(result.get("last_transaction_lt") or 0),
+            last_transaction_hash=base64.b64decode(result.get("last_transaction_hash") or "").hex(),
         )
 
+    async def _get_raw_accounts(self, addresses: List[str]) -> List[RawAccount]:
+        if self.batcher is not None:
+            return await super()._get_raw_accounts(addresses)
+
+        method = "/api/v3/accountStates"
+        params = [("address", address) for address in addresses] + [("include_boc", "true")]
+        result = await self._get(method=method, params=params)  # noqa
+
+        accounts = {self._normalize_address(account["address"]): account for account in result["accounts"]}
+        raw_accounts = []
+
+        for address in addresses:
+            account = accounts.get(self._normalize_address(address))
+
+            if account is None:
+                raw_accounts.append(RawAccount(
+                    balance=0,
+                    code=None,
+                    data=None,
+                    status=AccountStatus.nonexist,
+                    last_transaction_lt=0,
+                    last_transaction_hash="",
+                ))
+                continue
+
+            raw_accounts.append(RawAccount(
+                balance=int(account["balance"]),
+                code=Cell.one_from_boc(account["code_boc"]) if account.get("code_boc") else None,
+                data=Cell.one_from_boc(account["data_boc"]) if account.get("data_boc") else None,
+                status=AccountStatus(account["status"]),
+                last_transaction_lt=int(account.get("last_transaction_lt") or 0),
+                last_transaction_hash=base64.b64decode(account.get("last_transaction_hash") or "").hex(),
+            ))
+
+        return raw_accounts
+
     async def get_account_balance(self, address: str) -> int:
         raw_account = await self.get_raw_account(address)
 
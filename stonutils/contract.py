@@ -1,4 +1,6 @@
-from typing import Optional, Union, Any
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Union
 
 from pytoniq_core import (
     Address,
@@ -8,63 +10,210 @@ from pytoniq_core import (
     ExternalMsgInfo,
     InternalMsgInfo,
     MessageAny,
-    begin_cell,
 )
 
 from .account import RawAccount
-from .client import (
-    Client,
-    LiteserverClient,
-    TonapiClient,
-    ToncenterClient,
-)
+from .client import Client
 from .exceptions import UnknownClientError
 
 
+class CodeCell:
+    """
+    A parsed contract code cell with its hash and depth precomputed,
+    and the constant part of the StateInit representation that address
+    derivation hashes.
+
+    Instances are shared process-wide by :class:`CodeRegistry`
+    and must be treated as immutable.
+    """
+
+    __slots__ = ("cell", "hash", "depth", "state_init_prefix")
+
+    def __init__(self, cell: Cell) -> None:
+        self.cell = cell
+        self.hash = cell.hash
+        self.depth = cell.get_depth()
+        self.state_init_prefix = b"\x02\x01\x34" + self.depth.to_bytes(2, "big")
+
+    def calculate_state_init_hash(self, data_hash: bytes, data_depth: int) -> bytes:
+        """
+        Calculate the hash of a StateInit with this code and the given data,
+        i.e. the account address hash part.
+
+        :param data_hash: The hash of the data cell.
+        :param data_depth: The depth of the data cell.
+        :return: The StateInit hash.
+        """
+        return hashlib.sha256(
+            self.state_init_prefix + data_depth.to_bytes(2, "big") + self.hash + data_hash
+        ).digest()
+
+
+class CodeRegistry:
+    """
+    Process-wide registry of contract code cells.
+
+    Each code BoC is parsed once, on first use, and the resulting
+    :class:`CodeCell` is shared by all contracts using it.
+    """
+
+    _by_boc: Dict[str, CodeCell] = {}
+    _by_hash: Dict[bytes, CodeCell] = {}
+    _by_cell: Dict[int, CodeCell] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, code: Union[str, bytes]) -> CodeCell:
+        """
+        Get the code cell of a BoC, parsing it on first use.
+
+        :param code: The code BoC as a hex string or bytes.
+        :return: The shared code cell.
+        """
+        code_cell = cls._by_boc.get(code)
+
+        if code_cell is None:
+            with cls._lock:
+                code_cell = cls._by_boc.get(code)
+                if code_cell is None:
+                    code_cell = cls._register(Cell.one_from_boc(code))
+                    cls._by_boc[code] = code_cell
+
+        return code_cell
+
+    @classmethod
+    def _register(cls, cell: Cell) -> CodeCell:
+        code_cell = cls._by_hash.get(cell.hash)
+
+        if code_cell is None:
+            code_cell = cls._by_hash[cell.hash] = CodeCell(cell)
+            cls._by_cell[id(cell)] = code_cell
+
+        return code_cell
+
+    @classmethod
+    def register(cls, cell: Cell) -> CodeCell:
+        """
+        Register a code cell obtained elsewhere, e.g. fetched from the network.
+        If a cell with the same hash is already registered, that one is returned.
+
+        :param cell: The code cell.
+        :return: The shared code cell.
+        """
+        with cls._lock:
+            return cls._register(cell)
+
+    @classmethod
+    def get_cell(cls, code: Union[str, bytes, Cell]) -> Cell:
+        """
+        Get the shared code cell of a BoC. Cells are returned as is.
+
+        :param code: The code BoC as a hex string or bytes, or a cell.
+        :return: The code cell.
+        """
+        if isinstance(code, Cell):
+            return code
+
+        return cls.get(code).cell
+
+    @classmethod
+    def lookup(cls, cell: Cell) -> CodeCell:
+        """
+        Get the precomputed data of a code cell: the registered one
+        if the cell comes from the registry, otherwise computed for the cell.
+
+        :param cell: The code cell.
+        :return: The code cell data.
+        """
+        code_cell = cls._by_cell.get(id(cell))
+
+        if code_cell is None or code_cell.cell is not cell:
+            code_cell = CodeCell(cell)
+
+        return code_cell
+
+
 class Contract:
     """
     Base class representing a smart contract in the TON blockchain.
+
+    The state init and the address are computed on first access and cached
+    until `_code` or `_data` is reassigned. Code cells are shared through
+    :class:`CodeRegistry`, see :meth:`get_code_cell`.
     """
     CODE_HEX: str
 
-    _code: Cell
-    _data: Cell
+    @classmethod
+    def get_code_cell(cls) -> Cell:
+        """
+        Retrieve the code cell of the contract class, parsed once per process.
+        """
+        return CodeRegistry.get(cls.CODE_HEX).cell
+
+    @property
+    def _code(self) -> Cell:
+        return self.__dict__["_code"]
+
+    @_code.setter
+    def _code(self, value: Cell) -> None:
+        self.__dict__["_code"] = value
+        self._invalidate_state_init()
+
+    @property
+    def _data(self) -> Cell:
+        return self.__dict__["_data"]
+
+    @_data.setter
+    def _data(self, value: Cell) -> None:
+        self.__dict__["_data"] = value
+        self._invalidate_state_init()
+
+    def _invalidate_state_init(self) -> None:
+        """
+        Drop the cached state init and address.
+        """
+        self.__dict__.pop("_state_init", None)
+        self.__dict__.pop("_address", None)
 
     @property
     def code(self) -> Cell:
         """
         Retrieve the code of the contract.
         """
-        return self.state_init.code
+        return self._code
 
     @property
     def data(self) -> Cell:
         """
         Retrieve the data of the contract.
         """
-        return self.state_init.data
+        return self._data
 
     @property
     def address(self) -> Address:
         """
         Retrieve the address of the contract.
         """
-        return Address((0, self.state_init.serialize().hash))
+        address = self.__dict__.get("_address")
+
+        if address is None:
+            code_cell = CodeRegistry.lookup(self._code)
+            state_init_hash = code_cell.calculate_state_init_hash(self._data.hash, self._data.get_depth())
+            address = self.__dict__["_address"] = Address((0, state_init_hash))
+
+        return address
 
     @property
     def state_init(self) -> StateInit:
         """
         Retrieve the state init of the contract.
         """
-        return StateInit.deserialize(
-            begin_cell()
-            .store_uint(0, 2)
-            .store_dict(self._code)
-            .store_dict(self._data)
-            .store_uint(0, 1)
-            .end_cell()
-            .to_slice()
-        )
+        state_init = self.__dict__.get("_state_init")
+
+        if state_init is None:
+            state_init = self.__dict__["_state_init"] = StateInit(code=self._code, data=self._data)
+
+        return state_init
 
     @classmethod
     async def get_raw_account(
@@ -179,7 +328,7 @@ class Contract:
         if isinstance(address, Address):
             address = address.to_str()
 
-        if isinstance(client, (TonapiClient, ToncenterClient, LiteserverClient)):
+        if client.result_format is not None:
             balance = await client.get_account_balance(address)
         else:
             raise UnknownClientError(client.__class__.__name__)
@@ -22,7 +22,7 @@ class SubdomainManager(Contract):
             admin_address = Address(admin_address)
 
         self._data = self.create_data(admin_address, domains, seed).serialize()
-        self._code = Cell.one_from_boc(self.CODE_HEX)
+        self._code = self.get_code_cell()
 
     @classmethod
     def create_data(
@@ -30,3 +30,32 @@ class PytoniqDependencyError(TonutilsException):
             "The 'pytoniq' library is required to use LiteClient functionality. "
             "Please install it with 'pip install tonutils[pytoniq]'."
         )
+
+
+class NumpyDependencyError(TonutilsException):
+    """
+    Exception raised when numpy dependency is missing.
+
+    This exception informs the user that the numpy library is required
+    and provides guidance on how to install it.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            "The 'numpy' library is required for vectorized quotes. "
+            "Please install it with 'pip install stonutils[numpy]'."
+        )
+
+
+class JsonRpcError(TonutilsException):
+    """
+    Exception raised when a call of a JSON-RPC batch fails.
+
+    The other calls of the batch are not affected.
+    """
+
+    def __init__(self, method: str, error: str, code: int = None) -> None:
+        self.method = method
+        self.error = error
+        self.code = code
+        super().__init__(f"JSON-RPC call {method} failed ({code}): {error}")
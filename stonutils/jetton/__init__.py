@@ -5,6 +5,7 @@ from .contract import (
     JettonMasterStablecoin,
     JettonWalletStablecoin,
 )
+from .resolver import JettonWalletAddressResolver
 
 __all__ = [
     "JettonMaster",
@@ -12,4 +13,6 @@ __all__ = [
 
     "JettonMasterStablecoin",
     "JettonWalletStablecoin",
+
+    "JettonWalletAddressResolver",
 ]
@@ -8,13 +8,15 @@ from ...content import JettonStablecoinContent
 from ...data import JettonMasterData, JettonMasterStablecoinData
 from ....client import (
     Client,
-    LiteserverClient,
-    TonapiClient,
-    ToncenterClient,
+    ResultFormat,
 )
-from ....contract import Contract
+from ....contract import CodeRegistry, Contract
 from ....exceptions import UnknownClientError
-from ....utils import boc_to_base64_string
+from ....utils import (
+    address_to_bits,
+    boc_to_base64_string,
+    calculate_cell_hash,
+)
 
 
 class JettonMasterStablecoin(Contract):
@@ -32,7 +34,7 @@ class JettonMasterStablecoin(Contract):
         self.client = client
 
         self._data = self.create_data(content, admin_address, transfer_admin_address, jetton_wallet_code).serialize()
-        self._code = Cell.one_from_boc(self.CODE_HEX)
+        self._code = self.get_code_cell()
 
     @classmethod
     def create_data(
@@ -65,7 +67,7 @@ class JettonMasterStablecoin(Contract):
         if isinstance(jetton_master_address, str):
             jetton_master_address = Address(jetton_master_address)
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_jetton_data",
@@ -76,7 +78,7 @@ class JettonMasterStablecoin(Contract):
             content = Slice.one_from_boc(method_result["stack"][3]["cell"])
             jetton_wallet_code = Cell.one_from_boc(method_result["stack"][4]["cell"])
 
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_jetton_data",
@@ -87,7 +89,7 @@ class JettonMasterStablecoin(Contract):
             content = Slice.one_from_boc(method_result["stack"][3]["value"])
             jetton_wallet_code = Cell.one_from_boc(method_result["stack"][4]["value"])
 
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_jetton_data",
@@ -130,7 +132,7 @@ class JettonMasterStablecoin(Contract):
         if isinstance(jetton_master_address, str):
             jetton_master_address = Address(jetton_master_address)
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_wallet_address",
@@ -138,7 +140,7 @@ class JettonMasterStablecoin(Contract):
             )
             result = Address(method_result["decoded"]["jetton_wallet_address"])
 
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_wallet_address",
@@ -146,7 +148,7 @@ class JettonMasterStablecoin(Contract):
             )
             result = Slice.one_from_boc(method_result["stack"][0]["value"]).load_address()
 
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_wallet_address",
@@ -159,6 +161,38 @@ class JettonMasterStablecoin(Contract):
 
         return result
 
+    @classmethod
+    def calculate_wallet_address(
+            cls,
+            owner_address: Union[Address, str],
+            jetton_master_address: Union[Address, str],
+            jetton_wallet_code: Union[str, Cell] = JettonWalletStablecoin.CODE_HEX,
+    ) -> Address:
+        """
+        Calculate the address of the jetton wallet locally, without network requests.
+
+        The wallet data is laid out as in :class:`JettonWalletStablecoinData`: zero status
+        and balance, owner and master addresses.
+
+        :param owner_address: The address of the owner.
+        :param jetton_master_address: The address of the jetton master.
+        :param jetton_wallet_code: The jetton wallet code, as returned by `get_jetton_data`
+            (usually a library cell). Defaults to the code of :class:`JettonWalletStablecoin`.
+        :return: The address of the jetton wallet.
+        """
+        if isinstance(owner_address, str):
+            owner_address = Address(owner_address)
+
+        if isinstance(jetton_master_address, str):
+            jetton_master_address = Address(jetton_master_address)
+
+        code_cell = CodeRegistry.lookup(CodeRegistry.get_cell(jetton_wallet_code))
+        data_bits = (address_to_bits(owner_address) << 267) | address_to_bits(jetton_master_address)
+        data_hash = calculate_cell_hash(data_bits, 4 + 4 + 267 + 267)
+        data_depth = 0
+
+        return Address((0, code_cell.calculate_state_init_hash(data_hash, data_depth)))
+
     @classmethod
     def build_mint_body(
             cls,
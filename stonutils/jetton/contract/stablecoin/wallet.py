@@ -6,9 +6,7 @@ from .op_codes import *
 from ...data import JettonWalletStablecoinData
 from ....client import (
     Client,
-    LiteserverClient,
-    TonapiClient,
-    ToncenterClient,
+    ResultFormat,
 )
 from ....contract import Contract
 from ....exceptions import UnknownClientError
@@ -28,7 +26,7 @@ class JettonWalletStablecoin(Contract):
         self.client = client
 
         self._data = self.create_data(owner_address, jetton_master_address, balance).serialize()
-        self._code = Cell.one_from_boc(self.CODE_HEX)
+        self._code = self.get_code_cell()
 
     @classmethod
     def create_data(
@@ -59,7 +57,7 @@ class JettonWalletStablecoin(Contract):
         if isinstance(jetton_wallet_address, str):
             jetton_wallet_address = Address(jetton_wallet_address)
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             method_result = await client.run_get_method(
                 address=jetton_wallet_address.to_str(),
                 method_name="get_wallet_data",
@@ -68,7 +66,7 @@ class JettonWalletStablecoin(Contract):
             owner_address = Slice.one_from_boc(method_result["stack"][1]["cell"]).load_address()
             jetton_master_address = Slice.one_from_boc(method_result["stack"][2]["cell"]).load_address()
 
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             method_result = await client.run_get_method(
                 address=jetton_wallet_address.to_str(),
                 method_name="get_wallet_data",
@@ -77,7 +75,7 @@ class JettonWalletStablecoin(Contract):
             owner_address = Slice.one_from_boc(method_result["stack"][1]["value"]).load_address()
             jetton_master_address = Slice.one_from_boc(method_result["stack"][2]["value"]).load_address()
 
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             method_result = await client.run_get_method(
                 address=jetton_wallet_address.to_str(),
                 method_name="get_wallet_data",
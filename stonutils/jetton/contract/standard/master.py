@@ -8,13 +8,15 @@ from ...content import JettonOffchainContent, JettonOnchainContent
 from ...data import JettonMasterData
 from ....client import (
     Client,
-    LiteserverClient,
-    TonapiClient,
-    ToncenterClient,
+    ResultFormat,
 )
-from ....contract import Contract
+from ....contract import CodeRegistry, Contract
 from ....exceptions import UnknownClientError
-from ....utils import boc_to_base64_string
+from ....utils import (
+    address_to_bits,
+    boc_to_base64_string,
+    calculate_cell_hash,
+)
 
 
 class JettonMaster(Contract):
@@ -30,7 +32,7 @@ class JettonMaster(Contract):
         self.client = client
 
         self._data = self.create_data(content, admin_address, jetton_wallet_code).serialize()
-        self._code = Cell.one_from_boc(self.CODE_HEX)
+        self._code = self.get_code_cell()
 
     @classmethod
     def create_data(
@@ -61,7 +63,7 @@ class JettonMaster(Contract):
         if isinstance(jetton_master_address, str):
             jetton_master_address = Address(jetton_master_address)
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_jetton_data",
@@ -72,7 +74,7 @@ class JettonMaster(Contract):
             content = Slice.one_from_boc(method_result["stack"][3]["cell"])
             jetton_wallet_code = Cell.one_from_boc(method_result["stack"][4]["cell"])
 
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_jetton_data",
@@ -83,7 +85,7 @@ class JettonMaster(Contract):
             content = Slice.one_from_boc(method_result["stack"][3]["value"])
             jetton_wallet_code = Cell.one_from_boc(method_result["stack"][4]["value"])
 
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_jetton_data",
@@ -126,7 +128,7 @@ class JettonMaster(Contract):
         if isinstance(jetton_master_address, str):
             jetton_master_address = Address(jetton_master_address)
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_wallet_address",
@@ -134,7 +136,7 @@ class JettonMaster(Contract):
             )
             result = Address(method_result["decoded"]["jetton_wallet_address"])
 
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_wallet_address",
@@ -142,7 +144,7 @@ class JettonMaster(Contract):
             )
             result = Slice.one_from_boc(method_result["stack"][0]["value"]).load_address()
 
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             method_result = await client.run_get_method(
                 address=jetton_master_address.to_str(),
                 method_name="get_wallet_address",
@@ -155,6 +157,38 @@ class JettonMaster(Contract):
 
         return result
 
+    @classmethod
+    def calculate_wallet_address(
+            cls,
+            owner_address: Union[Address, str],
+            jetton_master_address: Union[Address, str],
+            jetton_wallet_code: Union[str, Cell] = JettonWallet.CODE_HEX,
+    ) -> Address:
+        """
+        Calculate the address of the jetton wallet locally, without network requests.
+
+        The wallet data is laid out as in :class:`JettonWalletData`: zero balance,
+        owner and master addresses and a reference to the wallet code.
+
+        :param owner_address: The address of the owner.
+        :param jetton_master_address: The address of the jetton master.
+        :param jetton_wallet_code: The jetton wallet code, as returned by `get_jetton_data`.
+            Defaults to the code of :class:`JettonWallet`.
+        :return: The address of the jetton wallet.
+        """
+        if isinstance(owner_address, str):
+            owner_address = Address(owner_address)
+
+        if isinstance(jetton_master_address, str):
+            jetton_master_address = Address(jetton_master_address)
+
+        code_cell = CodeRegistry.lookup(CodeRegistry.get_cell(jetton_wallet_code))
+        data_bits = (address_to_bits(owner_address) << 267) | address_to_bits(jetton_master_address)
+        data_hash = calculate_cell_hash(data_bits, 4 + 267 + 267, [code_cell.cell])
+        data_depth = code_cell.depth + 1
+
+        return Address((0, code_cell.calculate_state_init_hash(data_hash, data_depth)))
+
     @classmethod
     def build_mint_body(
             cls,
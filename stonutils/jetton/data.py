@@ -4,6 +4,7 @@ from typing import Union, Optional
 
 from pytoniq_core import Address, Cell, Slice, TlbScheme, begin_cell
 
+from ..contract import CodeRegistry
 from .content import JettonOnchainContent, JettonOffchainContent, JettonStablecoinContent
 
 
@@ -28,7 +29,7 @@ class JettonMasterData(TlbScheme):
         self.content = content
 
         if isinstance(jetton_wallet_code, str):
-            jetton_wallet_code = Cell.one_from_boc(jetton_wallet_code)
+            jetton_wallet_code = CodeRegistry.get_cell(jetton_wallet_code)
         self.jetton_wallet_code = jetton_wallet_code
 
     def serialize(self) -> Cell:
@@ -62,7 +63,7 @@ class JettonWalletData(TlbScheme):
             jetton_master_address = Address(jetton_master_address)
 
         if isinstance(jetton_wallet_code, str):
-            jetton_wallet_code = Cell.one_from_boc(jetton_wallet_code)
+            jetton_wallet_code = CodeRegistry.get_cell(jetton_wallet_code)
 
         self.owner_address = owner_address
         self.jetton_master_address = jetton_master_address
@@ -111,7 +112,7 @@ class JettonMasterStablecoinData(TlbScheme):
         self.content = content
 
         if isinstance(jetton_wallet_code, str):
-            jetton_wallet_code = Cell.one_from_boc(jetton_wallet_code)
+            jetton_wallet_code = CodeRegistry.get_cell(jetton_wallet_code)
         self.jetton_wallet_code = jetton_wallet_code
 
     def serialize(self) -> Cell:
@@ -1,8 +1,11 @@
+from .cache import DedustAddressCache
+from .quote import SwapQuote
 from .contract import (
     Asset,
     AssetType,
     Factory,
     Pool,
+    PoolState,
     PoolType,
     SwapParams,
     SwapStep,
@@ -10,14 +13,20 @@ from .contract import (
     VaultJetton,
     VaultNative
 )
+from .router import Route, Router
 
 __all__ = (
     "Asset",
     "AssetType",
+    "DedustAddressCache",
     "Factory",
     "Pool",
+    "PoolState",
     "PoolType",
+    "Route",
+    "Router",
     "SwapParams",
+    "SwapQuote",
     "SwapStep",
     "Vault",
     "VaultJetton",
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from pytoniq_core import Address
+
+if TYPE_CHECKING:
+    from .contract import Asset, PoolType
+
+
+class DedustAddressCache:
+    """
+    Cache of DeDust pool and vault addresses.
+
+    The factory derives these addresses from the pool type and the assets
+    alone, so they never change and a cached address never goes stale.
+    The cache is kept in memory and, with a path, saved to a JSON file
+    (replaced atomically) so it survives restarts. New addresses are saved
+    in the background off the event loop (see :meth:`schedule_save`),
+    call :meth:`flush` to wait until they are written.
+
+    :class:`Factory` uses :attr:`Factory.address_cache`, shared by every
+    factory and wallet of the process. To persist it, set
+    ``Factory.address_cache = DedustAddressCache("dedust.json")``.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Initialize the DedustAddressCache.
+
+        :param path: Optional JSON file path the addresses are loaded from and saved to.
+            Created if it does not exist.
+        """
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._vaults: Dict[str, str] = {}
+        self._pools: Dict[str, str] = {}
+
+        self._dirty = False
+        self._save_task: Optional[asyncio.Future] = None
+
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+
+            self._vaults.update(state.get("vaults", {}))
+            self._pools.update(state.get("pools", {}))
+
+    @staticmethod
+    def asset_key(asset: Asset) -> str:
+        """
+        Return the key of an asset: ``native`` or ``jetton:<raw address>``.
+        """
+        if asset.address is None:
+            return asset.asset_type.name.lower()
+
+        return f"{asset.asset_type.name.lower()}:{asset.address.to_str(is_user_friendly=False)}"
+
+    @classmethod
+    def pool_key(cls, pool_type: PoolType, assets: List[Asset]) -> str:
+        """
+        Return the key of a pool. The order of the assets is kept, as passed to the factory.
+        """
+        return "/".join([pool_type.name.lower()] + [cls.asset_key(asset) for asset in assets])
+
+    def get_vault(self, asset: Asset) -> Optional[Address]:
+        """
+        Return the cached vault address of the asset, or None.
+        """
+        address = self._vaults.get(self.asset_key(asset))
+        return Address(address) if address is not None else None
+
+    def set_vault(self, asset: Asset, address: Address) -> None:
+        """
+        Cache the vault address of the asset.
+        """
+        with self._lock:
+            self._vaults[self.asset_key(asset)] = address.to_str(is_user_friendly=False)
+
+    def get_pool(self, pool_type: PoolType, assets: List[Asset]) -> Optional[Address]:
+        """
+        Return the cached pool address, or None.
+        """
+        address = self._pools.get(self.pool_key(pool_type, assets))
+        return Address(address) if address is not None else None
+
+    def set_pool(self, pool_type: PoolType, assets: List[Asset], address: Address) -> None:
+        """
+        Cache the pool address.
+        """
+        with self._lock:
+            self._pools[self.pool_key(pool_type, assets)] = address.to_str(is_user_friendly=False)
+
+    def save(self) -> None:
+        """
+        Save the addresses to the file, if the cache has a path.
+        """
+        if self.path is None:
+            return
+
+        with self._lock:
+            state = {"vaults": dict(self._vaults), "pools": dict(self._pools)}
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        # a unique temporary file, so concurrent saves never write to the same one
+        fd, temporary_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def schedule_save(self) -> None:
+        """
+        Save the addresses in a background thread, if the cache has a path.
+        Saves requested while one is running are coalesced into one more save.
+        """
+        if self.path is None:
+            return
+
+        self._dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.ensure_future(self._save_pending())
+
+    async def _save_pending(self) -> None:
+        while self._dirty:
+            self._dirty = False
+            await asyncio.to_thread(self.save)
+
+    async def flush(self) -> None:
+        """
+        Save the addresses in a background thread and wait until they are written.
+        """
+        if self.path is None:
+            return
+
+        self.schedule_save()
+        await asyncio.shield(self._save_task)
+
+    def clear(self) -> None:
+        """
+        Remove all addresses. The file is left untouched until the next save.
+        """
+        with self._lock:
+            self._vaults.clear()
+            self._pools.clear()
+
+    def __len__(self) -> int:
+        return len(self._vaults) + len(self._pools)
@@ -1,6 +1,6 @@
 from .asset import Asset, AssetType
 from .factory import Factory
-from .pool import Pool, PoolType
+from .pool import Pool, PoolState, PoolType
 from .vault import SwapParams, SwapStep, Vault, VaultNative, VaultJetton
 
 __all__ = [
@@ -8,6 +8,7 @@ __all__ = [
     "AssetType",
     "Factory",
     "Pool",
+    "PoolState",
     "PoolType",
     "SwapParams",
     "SwapStep",
@@ -34,6 +34,24 @@ class Asset:
     def jetton(minter: Union[Address, str]) -> Asset:
         return Asset(AssetType.JETTON, minter)
 
+    @staticmethod
+    def from_slice(cs: Slice) -> Asset:
+        asset_type = AssetType(cs.load_uint(4))
+
+        if asset_type == AssetType.NATIVE:
+            return Asset.native()
+
+        return Asset.jetton(Address((cs.load_int(8), cs.load_bytes(32))))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Asset):
+            return NotImplemented
+
+        return self.asset_type == other.asset_type and self.address == other.address
+
+    def __hash__(self) -> int:
+        return hash((self.asset_type, self.address.to_str(is_user_friendly=False) if self.address else None))
+
     def to_slice(self) -> Slice:
         if self.asset_type == AssetType.NATIVE:
             return (
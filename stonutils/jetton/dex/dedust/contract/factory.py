@@ -1,16 +1,16 @@
-from typing import List
+import asyncio
+from typing import Iterable, List, Tuple
 
 from pytoniq_core import Cell, begin_cell, Address, Slice
 
 from .asset import Asset
 from .pool import PoolType, Pool
 from .vault import VaultJetton, VaultNative
+from ..cache import DedustAddressCache
 from ..op_codes import *
 from .....client import (
     Client,
-    TonapiClient,
-    ToncenterClient,
-    LiteserverClient,
+    ResultFormat,
 )
 from .....exceptions import UnknownClientError
 from .....utils import boc_to_base64_string
@@ -19,6 +19,9 @@ from .....utils import boc_to_base64_string
 class Factory:
     ADDRESS = "EQBfBWT7X2BHg9tXAxzhz2aKiNTU1tpt5NsiK0uSDW_YAJ67"  # noqa
 
+    # pool and vault addresses never change: shared by all factories and wallets
+    address_cache: DedustAddressCache = DedustAddressCache()
+
     def __init__(self, client: Client) -> None:
         self.client = client
 
@@ -41,21 +44,35 @@ class Factory:
             client: Client,
             asset: Asset,
     ) -> Address:
-        if isinstance(client, TonapiClient):
+        address = cls.address_cache.get_vault(asset)
+        if address is None:
+            address = await cls._fetch_vault_address(client, asset)
+            cls.address_cache.set_vault(asset, address)
+            cls.address_cache.schedule_save()
+
+        return address
+
+    @classmethod
+    async def _fetch_vault_address(
+            cls,
+            client: Client,
+            asset: Asset,
+    ) -> Address:
+        if client.result_format is ResultFormat.TONAPI:
             method_result = await client.run_get_method(
                 address=cls.ADDRESS,
                 method_name="get_vault_address",
                 stack=[asset.to_boc().hex()],
             )
             address = Slice.one_from_boc(method_result["stack"][0]["cell"]).load_address()
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             method_result = await client.run_get_method(
                 address=cls.ADDRESS,
                 method_name="get_vault_address",
                 stack=[boc_to_base64_string(asset.to_boc())],
             )
             address = Slice.one_from_boc(method_result["stack"][0]["value"]).load_address()
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             method_result = await client.run_get_method(
                 address=cls.ADDRESS,
                 method_name="get_vault_address",
@@ -84,7 +101,22 @@ class Factory:
             pool_type: PoolType,
             assets: List[Asset],
     ) -> Address:
-        if isinstance(client, TonapiClient):
+        address = cls.address_cache.get_pool(pool_type, assets)
+        if address is None:
+            address = await cls._fetch_pool_address(client, pool_type, assets)
+            cls.address_cache.set_pool(pool_type, assets, address)
+            cls.address_cache.schedule_save()
+
+        return address
+
+    @classmethod
+    async def _fetch_pool_address(
+            cls,
+            client: Client,
+            pool_type: PoolType,
+            assets: List[Asset],
+    ) -> Address:
+        if client.result_format is ResultFormat.TONAPI:
             method_result = await client.run_get_method(
                 address=cls.ADDRESS,
                 method_name="get_pool_address",
@@ -95,7 +127,7 @@ class Factory:
                 ]
             )
             address = Address(method_result["decoded"].get("pool_address"))
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             method_result = await client.run_get_method(
                 address=cls.ADDRESS,
                 method_name="get_pool_address",
@@ -106,7 +138,7 @@ class Factory:
                 ]
             )
             address = Slice.one_from_boc(method_result["stack"][0]["value"]).load_address()
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             method_result = await client.run_get_method(
                 address=cls.ADDRESS,
                 method_name="get_pool_address",
@@ -126,3 +158,57 @@ class Factory:
         pool_address = await self.get_pool_address(self.client, pool_type, assets)
 
         return Pool(pool_address)
+
+    @classmethod
+    async def warm_address_cache(
+            cls,
+            client: Client,
+            assets: Iterable[Asset],
+            pool_types: Iterable[PoolType] = (PoolType.VOLATILE,),
+            concurrency: int = 10,
+    ) -> int:
+        """
+        Fetch the missing vault addresses of the assets and the addresses of
+        their pools with TON, in both asset orders, and save the cache once.
+
+        :param client: The client to use.
+        :param assets: The assets, e.g. ``[Asset.jetton(address), ...]``.
+        :param pool_types: The pool types to fetch. Defaults to volatile pools only.
+        :param concurrency: The maximum number of get method calls in flight. Defaults to 10.
+        :return: The number of addresses fetched.
+        """
+        cache = cls.address_cache
+        native = Asset.native()
+        vaults: List[Asset] = []
+        pools: List[Tuple[PoolType, List[Asset]]] = []
+
+        for asset in [native, *assets]:
+            if cache.get_vault(asset) is None:
+                vaults.append(asset)
+            if asset.address is None:
+                continue
+
+            for pool_type in pool_types:
+                for pair in ([native, asset], [asset, native]):
+                    if cache.get_pool(pool_type, pair) is None:
+                        pools.append((pool_type, pair))
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_vault(asset_: Asset) -> None:
+            async with semaphore:
+                cache.set_vault(asset_, await cls._fetch_vault_address(client, asset_))
+
+        async def fetch_pool(pool_type_: PoolType, assets_: List[Asset]) -> None:
+            async with semaphore:
+                cache.set_pool(pool_type_, assets_, await cls._fetch_pool_address(client, pool_type_, assets_))
+
+        try:
+            await asyncio.gather(
+                *[fetch_vault(asset) for asset in vaults],
+                *[fetch_pool(pool_type, pair) for pool_type, pair in pools],
+            )
+        finally:
+            await cache.flush()
+
+        return len(vaults) + len(pools)
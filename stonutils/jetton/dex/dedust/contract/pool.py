@@ -1,7 +1,26 @@
+from __future__ import annotations
+
+import asyncio
+import time
 from enum import Enum
-from typing import Union
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from pytoniq_core import Address, Slice
 
-from pytoniq_core import Address
+from .asset import Asset
+from ..exceptions import AssetError
+from ..quote import (
+    SwapQuote,
+    quote_stable,
+    quote_stable_array,
+    quote_volatile,
+    quote_volatile_array,
+)
+from .....client import (
+    Client,
+    ResultFormat,
+)
+from .....exceptions import UnknownClientError
 
 
 class PoolType(Enum):
@@ -9,7 +28,76 @@ class PoolType(Enum):
     STABLE = 1
 
 
+class PoolState(NamedTuple):
+    """
+    The state of a pool needed to quote swaps.
+
+    :param pool_type: The pool type.
+    :param assets: The two assets of the pool, in the order of the reserves.
+    :param reserves: The reserves of the assets.
+    :param fee_numerator: The trade fee numerator.
+    :param fee_denominator: The trade fee denominator.
+    :param fetched_at: Unix time the reserves were fetched at.
+    """
+    pool_type: PoolType
+    assets: Tuple[Asset, Asset]
+    reserves: Tuple[int, int]
+    fee_numerator: int
+    fee_denominator: int
+    fetched_at: float
+
+    @property
+    def trade_fee(self) -> float:
+        """
+        The trade fee as a fraction of the amount in.
+        """
+        return self.fee_numerator / self.fee_denominator
+
+    def get_reserves(self, asset_in: Asset) -> Tuple[int, int]:
+        """
+        Return the (reserve in, reserve out) pair of a swap of the asset.
+        """
+        if asset_in == self.assets[0]:
+            return self.reserves
+        if asset_in == self.assets[1]:
+            return self.reserves[1], self.reserves[0]
+
+        raise AssetError("Asset is not in the pool.")
+
+    def quote(self, asset_in: Asset, amount_in: int) -> SwapQuote:
+        """
+        Quote a swap of the asset against the reserves.
+
+        :param asset_in: The asset sent to the pool.
+        :param amount_in: The amount sent, in the smallest units of the asset.
+        :return: A SwapQuote.
+        """
+        reserve_in, reserve_out = self.get_reserves(asset_in)
+        quote = quote_stable if self.pool_type == PoolType.STABLE else quote_volatile
+
+        return quote(amount_in, reserve_in, reserve_out, self.fee_numerator, self.fee_denominator)
+
+    def quote_many(self, asset_in: Asset, amounts_in: Sequence[int]) -> Any:
+        """
+        Quote many amounts of the asset at once. Requires NumPy.
+
+        :param asset_in: The asset sent to the pool.
+        :param amounts_in: The amounts sent.
+        :return: The NumPy array of expected amounts out (float64 estimates).
+        """
+        reserve_in, reserve_out = self.get_reserves(asset_in)
+        quote = quote_stable_array if self.pool_type == PoolType.STABLE else quote_volatile_array
+
+        return quote(amounts_in, reserve_in, reserve_out, self.fee_numerator, self.fee_denominator)
+
+
 class Pool:
+    """
+    A DeDust pool.
+
+    :meth:`update` fetches the reserves, and once per pool its assets,
+    type and trade fee, so swaps can be quoted locally with :meth:`quote`.
+    """
 
     def __init__(
             self,
@@ -19,3 +107,113 @@ class Pool:
             address = Address(address)
 
         self.address = address
+        self.state: Optional[PoolState] = None
+
+    @staticmethod
+    def _parse_stack(client: Client, method_result: Any) -> List[Any]:
+        if client.result_format is ResultFormat.TONAPI:
+            return [
+                int(item["num"], 16) if item["type"] == "num" else
+                Slice.one_from_boc(item.get("cell") or item.get("slice"))
+                for item in method_result["stack"]
+            ]
+        elif client.result_format is ResultFormat.TONCENTER:
+            return [
+                int(item["value"], 16) if item["type"] == "num" else
+                Slice.one_from_boc(item["value"])
+                for item in method_result["stack"]
+            ]
+        elif client.result_format is ResultFormat.LITESERVER:
+            return [
+                item.begin_parse() if hasattr(item, "begin_parse") else item
+                for item in method_result
+            ]
+        else:
+            raise UnknownClientError(client.__class__.__name__)
+
+    async def _run_get_method(self, client: Client, method_name: str) -> List[Any]:
+        method_result = await client.run_get_method(
+            address=self.address.to_str(),
+            method_name=method_name,
+        )
+        return self._parse_stack(client, method_result)
+
+    async def update(self, client: Client, max_age: float = 0) -> PoolState:
+        """
+        Fetch the pool state. The assets, type and trade fee of the pool are
+        fetched with the first update only, then just the reserves are refreshed.
+
+        :param client: The client to use.
+        :param max_age: Time in seconds the cached reserves are served for
+            without a request. Defaults to 0 (always refresh).
+        :return: The PoolState, also stored in :attr:`state`.
+        """
+        state = self.state
+        if state is not None and time.time() - state.fetched_at < max_age:
+            return state
+
+        if state is None:
+            assets, reserves, trade_fee, is_stable = await asyncio.gather(
+                self._run_get_method(client, "get_assets"),
+                self._run_get_method(client, "get_reserves"),
+                self._run_get_method(client, "get_trade_fee"),
+                self._run_get_method(client, "is_stable"),
+            )
+            state = PoolState(
+                pool_type=PoolType.STABLE if is_stable[0] else PoolType.VOLATILE,
+                assets=(Asset.from_slice(assets[0]), Asset.from_slice(assets[1])),
+                reserves=(reserves[0], reserves[1]),
+                fee_numerator=trade_fee[0],
+                fee_denominator=trade_fee[1],
+                fetched_at=time.time(),
+            )
+        else:
+            reserves = await self._run_get_method(client, "get_reserves")
+            state = state._replace(reserves=(reserves[0], reserves[1]), fetched_at=time.time())
+
+        self.state = state
+        return state
+
+    @classmethod
+    async def update_many(
+            cls,
+            client: Client,
+            pools: Sequence[Pool],
+            max_age: float = 0,
+            concurrency: int = 10,
+    ) -> List[PoolState]:
+        """
+        Update many pools concurrently.
+
+        :param client: The client to use.
+        :param pools: The pools.
+        :param max_age: See :meth:`update`.
+        :param concurrency: The maximum number of pools updated at once. Defaults to 10.
+        :return: The PoolStates, in the order of the pools.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def update(pool: Pool) -> PoolState:
+            async with semaphore:
+                return await pool.update(client, max_age)
+
+        return list(await asyncio.gather(*[update(pool) for pool in pools]))
+
+    async def quote(
+            self,
+            client: Client,
+            asset_in: Asset,
+            amount_in: int,
+            max_age: float = 0,
+    ) -> SwapQuote:
+        """
+        Quote a swap from the current reserves.
+
+        :param client: The client to use.
+        :param asset_in: The asset sent to the pool.
+        :param amount_in: The amount sent, in the smallest units of the asset.
+        :param max_age: Time in seconds the cached reserves are used for. Defaults to 0.
+        :return: A SwapQuote. Use :meth:`SwapQuote.min_amount_out` as the swap limit.
+        """
+        state = await self.update(client, max_age)
+        return state.quote(asset_in, amount_in)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+from ....exceptions import NumpyDependencyError
+
+try:
+    # noinspection PyPackageRequirements
+    import numpy as np
+
+    numpy_available = True
+except ImportError:
+    np = None
+    numpy_available = False
+
+STABLE_MAX_ITERATIONS = 255
+
+
+class SwapQuote(NamedTuple):
+    """
+    The expected result of a swap, calculated from the pool reserves.
+
+    :param amount_in: The amount sent to the pool.
+    :param amount_out: The expected amount received.
+    :param trade_fee: The part of the amount in kept by the pool as the trade fee.
+    :param price_impact: The relative difference between the execution price
+        (after the fee) and the spot price, from 0 to 1.
+    """
+    amount_in: int
+    amount_out: int
+    trade_fee: int
+    price_impact: float
+
+    def min_amount_out(self, slippage: float) -> int:
+        """
+        Return the minimum amount out for the given slippage tolerance,
+        to be used as the swap limit.
+
+        :param slippage: The tolerated relative decrease of the amount out, e.g. 0.01 for 1%.
+        """
+        if not 0 <= slippage < 1:
+            raise ValueError("slippage must be in [0, 1).")
+
+        return self.amount_out * int((1 - slippage) * 10 ** 9) // 10 ** 9
+
+
+def _take_fee(amount_in: int, fee_numerator: int, fee_denominator: int) -> int:
+    return amount_in * fee_numerator // fee_denominator
+
+
+def _stable_invariant(x: int, y: int) -> int:
+    return x * y * (x * x + y * y)
+
+
+def _stable_get_y(x: int, k: int, y: int) -> int:
+    # solve x^3 y + x y^3 = k for y with Newton's method, starting from the current reserve
+    for _ in range(STABLE_MAX_ITERATIONS):
+        f = _stable_invariant(x, y)
+        derivative = x * (x * x + 3 * y * y)
+        if derivative == 0:
+            return 0
+
+        step = (f - k) // derivative
+        if step == 0:
+            # round up so the pool never pays out more than the invariant allows
+            while _stable_invariant(x, y) < k:
+                y += 1
+            return y
+
+        y -= step
+
+    return y
+
+
+def quote_volatile(
+        amount_in: int,
+        reserve_in: int,
+        reserve_out: int,
+        fee_numerator: int,
+        fee_denominator: int,
+) -> SwapQuote:
+    """
+    Quote a swap in a volatile (constant product) pool.
+
+    :param amount_in: The amount sent to the pool.
+    :param reserve_in: The reserve of the asset sent.
+    :param reserve_out: The reserve of the asset received.
+    :param fee_numerator: The trade fee numerator.
+    :param fee_denominator: The trade fee denominator.
+    :return: A SwapQuote.
+    """
+    trade_fee = _take_fee(amount_in, fee_numerator, fee_denominator)
+    amount_in_after_fee = amount_in - trade_fee
+
+    if reserve_in <= 0 or reserve_out <= 0 or amount_in_after_fee <= 0:
+        return SwapQuote(amount_in, 0, trade_fee, 0.0 if amount_in_after_fee <= 0 else 1.0)
+
+    amount_out = amount_in_after_fee * reserve_out // (reserve_in + amount_in_after_fee)
+    price_impact = amount_in_after_fee / (reserve_in + amount_in_after_fee)
+
+    return SwapQuote(amount_in, amount_out, trade_fee, price_impact)
+
+
+def quote_stable(
+        amount_in: int,
+        reserve_in: int,
+        reserve_out: int,
+        fee_numerator: int,
+        fee_denominator: int,
+) -> SwapQuote:
+    """
+    Quote a swap in a stable pool, whose invariant is ``x^3 y + x y^3``.
+
+    Reserves are compared as stored in the pool, so the assets of the pool
+    are expected to have the same number of decimals.
+
+    :param amount_in: The amount sent to the pool.
+    :param reserve_in: The reserve of the asset sent.
+    :param reserve_out: The reserve of the asset received.
+    :param fee_numerator: The trade fee numerator.
+    :param fee_denominator: The trade fee denominator.
+    :return: A SwapQuote.
+    """
+    trade_fee = _take_fee(amount_in, fee_numerator, fee_denominator)
+    amount_in_after_fee = amount_in - trade_fee
+
+    if reserve_in <= 0 or reserve_out <= 0 or amount_in_after_fee <= 0:
+        return SwapQuote(amount_in, 0, trade_fee, 0.0 if amount_in_after_fee <= 0 else 1.0)
+
+    k = _stable_invariant(reserve_in, reserve_out)
+    y = _stable_get_y(reserve_in + amount_in_after_fee, k, reserve_out)
+    amount_out = max(0, reserve_out - y)
+
+    # the spot price of the curve is dy/dx = y (3x^2 + y^2) / (x (x^2 + 3y^2))
+    spot_price = (
+            reserve_out * (3 * reserve_in * reserve_in + reserve_out * reserve_out) /
+            (reserve_in * (reserve_in * reserve_in + 3 * reserve_out * reserve_out))
+    )
+    price_impact = max(0.0, 1 - amount_out / amount_in_after_fee / spot_price)
+
+    return SwapQuote(amount_in, amount_out, trade_fee, price_impact)
+
+
+def _require_numpy() -> None:
+    if not numpy_available:
+        raise NumpyDependencyError()
+
+
+def quote_volatile_array(
+        amount_in: Any,
+        reserve_in: Any,
+        reserve_out: Any,
+        fee_numerator: Any,
+        fee_denominator: Any,
+) -> Any:
+    """
+    Quote many volatile pool swaps at once with NumPy.
+
+    The arguments are broadcast against each other, so either many amounts
+    can be quoted in one pool or one amount in many pools.
+    Calculations are done with float64, so the results are estimates
+    accurate to about 15 significant digits.
+
+    :return: The array of expected amounts out.
+    """
+    _require_numpy()
+
+    amount_in = np.asarray(amount_in, dtype=np.float64)
+    reserve_in = np.asarray(reserve_in, dtype=np.float64)
+    reserve_out = np.asarray(reserve_out, dtype=np.float64)
+
+    amount_in_after_fee = amount_in * (1 - np.asarray(fee_numerator, dtype=np.float64) / fee_denominator)
+    amount_out = amount_in_after_fee * reserve_out / (reserve_in + amount_in_after_fee)
+
+    return np.floor(np.where((reserve_in > 0) & (reserve_out > 0), amount_out, 0.0))
+
+
+def quote_stable_array(
+        amount_in: Any,
+        reserve_in: Any,
+        reserve_out: Any,
+        fee_numerator: Any,
+        fee_denominator: Any,
+) -> Any:
+    """
+    Quote many stable pool swaps at once with NumPy.
+
+    The arguments are broadcast against each other, see :func:`quote_volatile_array`.
+    Amounts are scaled by the reserve in, so the invariant stays within the float64 range.
+
+    :return: The array of expected amounts out.
+    """
+    _require_numpy()
+
+    amount_in, reserve_in, reserve_out = np.broadcast_arrays(
+        np.asarray(amount_in, dtype=np.float64),
+        np.asarray(reserve_in, dtype=np.float64),
+        np.asarray(reserve_out, dtype=np.float64),
+    )
+    valid = (reserve_in > 0) & (reserve_out > 0)
+    scale = np.where(valid, reserve_in, 1.0)
+
+    amount_in_after_fee = amount_in * (1 - np.asarray(fee_numerator, dtype=np.float64) / fee_denominator)
+    x0, y0 = reserve_in / scale, reserve_out / scale
+    x = x0 + amount_in_after_fee / scale
+    k = x0 * y0 * (x0 * x0 + y0 * y0)
+
+    y = y0.copy()
+    for _ in range(STABLE_MAX_ITERATIONS):
+        derivative = x * (x * x + 3 * y * y)
+        step = (x * y * (x * x + y * y) - k) / np.where(derivative > 0, derivative, 1.0)
+        y = y - step
+        if np.all(np.abs(step) <= 1e-12 * np.maximum(y, 1.0)):
+            break
+
+    amount_out = np.clip((y0 - y) * scale, 0.0, None)
+
+    return np.floor(np.where(valid, amount_out, 0.0))
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .contract import Asset, Factory, Pool, PoolType, SwapStep
+from .quote import SwapQuote, quote_stable, quote_volatile
+from ....account import AccountStatus
+from ....client import Client
+
+
+class Route(NamedTuple):
+    """
+    A swap route through one or more pools.
+
+    :param assets: The assets along the route, from the asset sent to the asset received.
+    :param pools: The pools swapped in, one per hop.
+    :param quotes: The quote of every hop.
+    """
+    assets: Tuple[Asset, ...]
+    pools: Tuple[Pool, ...]
+    quotes: Tuple[SwapQuote, ...]
+
+    @property
+    def amount_in(self) -> int:
+        return self.quotes[0].amount_in
+
+    @property
+    def amount_out(self) -> int:
+        return self.quotes[-1].amount_out
+
+    def to_swap_step(self, slippage: float = 0.0) -> SwapStep:
+        """
+        Build the SwapStep chain of the route.
+
+        The returned step is the first hop: pass its ``pool_address``, ``limit``
+        and ``next_`` to ``VaultNative.create_swap_payload`` or
+        ``VaultJetton.create_swap_payload``. Only the last hop carries a limit,
+        the minimum amount received for the slippage tolerance.
+
+        :param slippage: The tolerated relative decrease of the amount out, e.g. 0.01 for 1%.
+        :return: The first SwapStep.
+        """
+        step = SwapStep(self.pools[-1].address, self.quotes[-1].min_amount_out(slippage))
+
+        for pool in reversed(self.pools[:-1]):
+            step = SwapStep(pool.address, next_=step)
+
+        return step
+
+
+class Router:
+    """
+    Finds the best DeDust swap route over a graph of known pools.
+
+    The graph is kept in memory and routes are searched with the states
+    the pools were last updated to (see :meth:`Pool.update`), so a search
+    makes no network requests. Call :meth:`update` to refresh the reserves.
+
+    A route of up to ``max_hops`` pools is searched hop by hop, keeping
+    the best amount reached at every asset, and never swaps twice in the same pool.
+    """
+
+    def __init__(self, pools: Iterable[Pool] = ()) -> None:
+        """
+        Initialize the Router.
+
+        :param pools: Pools with a fetched state. Pools without a state are ignored.
+        """
+        self.pools: List[Pool] = []
+
+        # assets are numbered, an edge is (pool, next asset index, whether the asset in is the first of the pool)
+        self._assets: List[Asset] = []
+        self._indexes: Dict[Asset, int] = {}
+        self._edges: List[List[Tuple[Pool, int, bool]]] = []
+
+        for pool in pools:
+            self.add_pool(pool)
+
+    def add_pool(self, pool: Pool) -> None:
+        """
+        Add a pool to the graph. The pool must have a fetched state.
+        """
+        if pool.state is None:
+            return
+
+        index_0, index_1 = [self._get_index(asset) for asset in pool.state.assets]
+        self.pools.append(pool)
+        self._edges[index_0].append((pool, index_1, True))
+        self._edges[index_1].append((pool, index_0, False))
+
+    def _get_index(self, asset: Asset) -> int:
+        index = self._indexes.get(asset)
+        if index is None:
+            index = self._indexes[asset] = len(self._assets)
+            self._assets.append(asset)
+            self._edges.append([])
+
+        return index
+
+    @classmethod
+    async def from_assets(
+            cls,
+            client: Client,
+            assets: Iterable[Asset],
+            pairs: Optional[Iterable[Tuple[Asset, Asset]]] = None,
+            pool_types: Iterable[PoolType] = (PoolType.VOLATILE,),
+            concurrency: int = 10,
+    ) -> Router:
+        """
+        Build a router over the pools of the assets.
+
+        Pool addresses come from the factory address cache (see
+        :meth:`Factory.warm_address_cache`). Pools that are not deployed are skipped,
+        any other failure to fetch a pool is raised.
+
+        :param client: The client to use.
+        :param assets: The assets. Every asset is paired with TON.
+        :param pairs: Additional asset pairs with their own pools.
+        :param pool_types: The pool types to look up. Defaults to volatile pools only.
+        :param concurrency: The maximum number of requests in flight. Defaults to 10.
+        :return: The Router.
+        """
+        native = Asset.native()
+        keys = [[native, asset] for asset in assets if asset != native]
+        keys.extend([a, b] for a, b in pairs or ())
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get_pool(pool_type: PoolType, pair: List[Asset]) -> Optional[Pool]:
+            async with semaphore:
+                pool = Pool(await Factory.get_pool_address(client, pool_type, pair))
+                try:
+                    await pool.update(client)
+                except Exception:
+                    # only a pool that was never deployed is skipped, other failures would hide pools
+                    raw_account = await client.get_raw_account(pool.address.to_str())
+                    if raw_account.status in (AccountStatus.uninit, AccountStatus.nonexist):
+                        return None
+                    raise
+
+                return pool
+
+        results = await asyncio.gather(*[get_pool(pool_type, pair) for pool_type in pool_types for pair in keys])
+
+        return cls(pool for pool in results if pool is not None)
+
+    async def update(self, client: Client, max_age: float = 0, concurrency: int = 10) -> None:
+        """
+        Refresh the reserves of the pools.
+
+        :param client: The client to use.
+        :param max_age: Time in seconds cached reserves are kept for. Defaults to 0.
+        :param concurrency: The maximum number of pools updated at once. Defaults to 10.
+        """
+        await Pool.update_many(client, self.pools, max_age, concurrency)
+
+    def find_route(
+            self,
+            asset_in: Asset,
+            asset_out: Asset,
+            amount_in: int,
+            max_hops: int = 3,
+    ) -> Optional[Route]:
+        """
+        Find the route with the largest amount out.
+
+        :param asset_in: The asset sent.
+        :param asset_out: The asset received.
+        :param amount_in: The amount sent, in the smallest units of the asset.
+        :param max_hops: The maximum number of pools in the route. Defaults to 3.
+        :return: The best Route, or None if the assets are not connected.
+        """
+        source, target = self._indexes.get(asset_in), self._indexes.get(asset_out)
+        if source is None or target is None or source == target:
+            return None
+
+        # asset index -> (amount, asset indexes, pools, quotes) of the best path reaching it
+        frontier: Dict[int, Tuple[int, Tuple[int, ...], Tuple[Pool, ...], Tuple[SwapQuote, ...]]] = {
+            source: (amount_in, (source,), (), ()),
+        }
+        best: Optional[Tuple[int, Tuple[int, ...], Tuple[Pool, ...], Tuple[SwapQuote, ...]]] = None
+
+        for _ in range(max_hops):
+            reached: Dict[int, Tuple[int, Tuple[int, ...], Tuple[Pool, ...], Tuple[SwapQuote, ...]]] = {}
+
+            for index, (amount, path, pools, quotes) in frontier.items():
+                for pool, next_index, is_first in self._edges[index]:
+                    if next_index == source or pool in pools:
+                        continue
+
+                    state = pool.state
+                    reserve_0, reserve_1 = state.reserves
+                    quote = (quote_stable if state.pool_type == PoolType.STABLE else quote_volatile)(
+                        amount,
+                        reserve_0 if is_first else reserve_1,
+                        reserve_1 if is_first else reserve_0,
+                        state.fee_numerator,
+                        state.fee_denominator,
+                    )
+                    if quote.amount_out <= 0:
+                        continue
+
+                    current = reached.get(next_index)
+                    if current is None or quote.amount_out > current[0]:
+                        reached[next_index] = (
+                            quote.amount_out,
+                            path + (next_index,),
+                            pools + (pool,),
+                            quotes + (quote,),
+                        )
+
+            # paths are not continued past the asset out
+            found = reached.pop(target, None)
+            if found is not None and (best is None or found[0] > best[0]):
+                best = found
+
+            if not reached:
+                break
+            frontier = reached
+
+        if best is None:
+            return None
+
+        return Route(tuple(self._assets[index] for index in best[1]), best[2], best[3])
+
+    def find_routes(
+            self,
+            asset_in: Asset,
+            asset_out: Asset,
+            amounts_in: Sequence[int],
+            max_hops: int = 3,
+    ) -> List[Optional[Route]]:
+        """
+        Find the best route for each of the amounts.
+        """
+        return [self.find_route(asset_in, asset_out, amount_in, max_hops) for amount_in in amounts_in]
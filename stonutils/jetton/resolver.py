@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
+
+import aiohttp
+from pytoniq_core import Address, Cell
+
+from .contract import (
+    JettonMaster,
+    JettonMasterStablecoin,
+    JettonWallet,
+    JettonWalletStablecoin,
+)
+from ..client import Client
+from ..contract import CodeRegistry
+
+JettonMasterType = Union[Type[JettonMaster], Type[JettonMasterStablecoin]]
+
+# errors after which loading a master is retried instead of falling back to the get method for good
+_TRANSIENT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, OSError)
+
+
+class JettonWalletAddressResolver:
+    """
+    Resolves jetton wallet addresses locally whenever possible.
+
+    The jetton wallet code is fetched once per master with `get_jetton_data`.
+    If its hash is a known wallet code (see :meth:`register_wallet_code`),
+    wallet addresses are calculated locally with no network requests,
+    otherwise the `get_wallet_address` get method is used. Library cells
+    are resolved by the hash of the library they point to.
+
+    By default the local calculation is checked once per master against
+    the get method before it is trusted. The check runs concurrently with
+    `get_jetton_data`, so the first lookup of a master costs one round trip.
+    Masters whose data cannot be parsed fall back to the get method.
+    """
+
+    _wallet_codes: Dict[bytes, JettonMasterType] = {
+        JettonWallet.get_code_cell().hash: JettonMaster,
+        JettonWalletStablecoin.get_code_cell().hash: JettonMasterStablecoin,
+    }
+
+    def __init__(self, client: Client, verify: bool = True, concurrency: int = 10) -> None:
+        """
+        Initialize the JettonWalletAddressResolver.
+
+        :param client: The client to use.
+        :param verify: Whether the local calculation is checked against the get method
+            once per master. Defaults to True.
+        :param concurrency: The maximum number of get method calls in flight when
+            resolving many addresses of a master with unknown wallet code. Defaults to 10.
+        """
+        self.client = client
+        self.verify = verify
+        self.concurrency = concurrency
+
+        # master -> (task loading it, owner whose wallet address was fetched with it)
+        self._masters: Dict[str, Tuple[asyncio.Task, str]] = {}
+
+    @classmethod
+    def register_wallet_code(cls, code_hash: Union[bytes, str], master_class: JettonMasterType) -> None:
+        """
+        Register a jetton wallet code whose data is laid out as for the given master class.
+
+        :param code_hash: The hash of the wallet code, as bytes or hex.
+        :param master_class: JettonMaster (JettonWalletData layout) or
+            JettonMasterStablecoin (JettonWalletStablecoinData layout).
+        """
+        if isinstance(code_hash, str):
+            code_hash = bytes.fromhex(code_hash)
+
+        cls._wallet_codes[code_hash] = master_class
+
+    @staticmethod
+    def _get_code_hash(code: Cell) -> bytes:
+        """
+        Return the hash of the code, or of the library the code cell points to.
+        """
+        if code.type_ == 2:
+            return code.begin_parse().skip_bits(8).load_bytes(32)
+
+        return code.hash
+
+    async def _get_master_code(self, jetton_master_address: Address) -> Optional[Tuple[Cell, JettonMasterType]]:
+        try:
+            jetton_data = await JettonMaster.get_jetton_data(self.client, jetton_master_address)
+            code = CodeRegistry.register(jetton_data.jetton_wallet_code).cell
+        except _TRANSIENT_ERRORS:
+            raise
+        except Exception:
+            # masters whose data cannot be parsed are resolved with the get method
+            return None
+
+        master_class = self._wallet_codes.get(self._get_code_hash(code))
+        if master_class is None:
+            return None
+
+        return code, master_class
+
+    async def _load_master(
+            self,
+            jetton_master_address: Address,
+            owner_address: Address,
+    ) -> Tuple[Optional[Tuple[Cell, JettonMasterType]], Optional[Address]]:
+        """
+        Load the wallet code of a master. With verify, the wallet address of the owner
+        is fetched with the get method concurrently and checks the local calculation,
+        so loading a master takes a single round trip.
+
+        :return: The wallet code and the master class, or None if addresses can only be
+            resolved with the get method, and the wallet address of the owner if it was fetched.
+        """
+        if not self.verify:
+            return await self._get_master_code(jetton_master_address), None
+
+        wallet_code, expected = await asyncio.gather(
+            self._get_master_code(jetton_master_address),
+            JettonMaster.get_wallet_address(self.client, owner_address, jetton_master_address),
+        )
+
+        if wallet_code is not None:
+            code, master_class = wallet_code
+            if master_class.calculate_wallet_address(owner_address, jetton_master_address, code) != expected:
+                wallet_code = None
+
+        return wallet_code, expected
+
+    def _get_master_task(self, jetton_master_address: Address, owner_address: Address) -> Tuple[asyncio.Task, str]:
+        key = jetton_master_address.to_str(is_user_friendly=False)
+        entry = self._masters.get(key)
+
+        if entry is None or (entry[0].done() and (entry[0].cancelled() or entry[0].exception() is not None)):
+            task = asyncio.ensure_future(self._load_master(jetton_master_address, owner_address))
+            entry = self._masters[key] = (task, owner_address.to_str(is_user_friendly=False))
+
+        return entry
+
+    async def get_wallet_code(
+            self,
+            jetton_master_address: Union[Address, str],
+    ) -> Optional[Tuple[Cell, JettonMasterType]]:
+        """
+        Get the wallet code of a master and the master class calculating its wallet addresses.
+
+        :param jetton_master_address: The address of the jetton master.
+        :return: The wallet code and the master class, or None if addresses
+            of this master can only be resolved with the get method.
+        """
+        if isinstance(jetton_master_address, str):
+            jetton_master_address = Address(jetton_master_address)
+
+        task, _ = self._get_master_task(jetton_master_address, jetton_master_address)
+        wallet_code, _ = await asyncio.shield(task)
+
+        return wallet_code
+
+    async def get_wallet_address(
+            self,
+            owner_address: Union[Address, str],
+            jetton_master_address: Union[Address, str],
+    ) -> Address:
+        """
+        Get the address of the jetton wallet.
+
+        :param owner_address: The address of the owner.
+        :param jetton_master_address: The address of the jetton master.
+        :return: The address of the jetton wallet.
+        """
+        if isinstance(owner_address, str):
+            owner_address = Address(owner_address)
+
+        if isinstance(jetton_master_address, str):
+            jetton_master_address = Address(jetton_master_address)
+
+        task, loaded_for = self._get_master_task(jetton_master_address, owner_address)
+        wallet_code, expected = await asyncio.shield(task)
+
+        if wallet_code is not None:
+            code, master_class = wallet_code
+            return master_class.calculate_wallet_address(owner_address, jetton_master_address, code)
+
+        # the master was loaded together with the address of this owner
+        if expected is not None and loaded_for == owner_address.to_str(is_user_friendly=False):
+            return expected
+
+        return await JettonMaster.get_wallet_address(self.client, owner_address, jetton_master_address)
+
+    async def get_wallet_addresses(
+            self,
+            owner_addresses: Iterable[Union[Address, str]],
+            jetton_master_address: Union[Address, str],
+    ) -> List[Address]:
+        """
+        Get the addresses of the jetton wallets of many owners.
+
+        :param owner_addresses: The addresses of the owners.
+        :param jetton_master_address: The address of the jetton master.
+        :return: The addresses of the jetton wallets, in the order of the owners.
+        """
+        if isinstance(jetton_master_address, str):
+            jetton_master_address = Address(jetton_master_address)
+
+        wallet_code = await self.get_wallet_code(jetton_master_address)
+
+        if wallet_code is not None:
+            code, master_class = wallet_code
+            return [
+                master_class.calculate_wallet_address(owner_address, jetton_master_address, code)
+                for owner_address in owner_addresses
+            ]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def get_wallet_address(owner_address: Union[Address, str]) -> Address:
+            async with semaphore:
+                return await JettonMaster.get_wallet_address(self.client, owner_address, jetton_master_address)
+
+        return list(await asyncio.gather(*[get_wallet_address(owner) for owner in owner_addresses]))
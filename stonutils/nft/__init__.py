@@ -2,6 +2,8 @@ from .contract.base import Collection, NFT
 from .contract.editable import CollectionEditable, CollectionEditableModified, NFTEditable, NFTEditableModified
 from .contract.soulbound import CollectionSoulbound, CollectionSoulboundModified, NFTSoulbound, NFTSoulboundModified
 from .contract.standard import CollectionStandard, CollectionStandardModified, NFTStandard, NFTStandardModified
+from .batch_mint import BatchMintPipeline, BatchMintStalledError, MintBatch
+from .snapshot import CollectionSnapshot, SnapshotRow
 
 __all__ = [
     "Collection",
@@ -19,4 +21,10 @@ __all__ = [
     "CollectionStandardModified",
     "NFTStandard",
     "NFTStandardModified",
+
+    "BatchMintPipeline",
+    "BatchMintStalledError",
+    "MintBatch",
+    "CollectionSnapshot",
+    "SnapshotRow",
 ]
@@ -0,0 +1,389 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from pytoniq_core import Address, Cell
+
+from .contract.base import Collection
+from .contract.standard import CollectionStandard
+from ..exceptions import TonutilsException
+from ..wallet.seqno import SeqnoManager
+
+if TYPE_CHECKING:
+    from ..wallet import Wallet
+
+# the standard, editable and soulbound collections throw 399 once the item counter reaches 250
+MAX_BATCH_ITEMS = 249
+# the compute phase of a basechain transaction is limited to 1M gas
+MAX_COMPUTE_GAS = 1000000
+# estimated gas the collection spends per minted item (dictionary read, item StateInit and
+# address, message cell and send), rounded up; it is not measured on chain, collections
+# doing more work per item need a lower gas_per_item or max_items_per_batch
+GAS_PER_ITEM = 6000
+# the body travels inside the external message of the wallet, limited to 64 KiB
+MAX_BODY_SIZE = 60000
+# an internal message can hold at most 2^13 cells
+MAX_BODY_CELLS = 8000
+# seconds after a message expires before it is considered lost
+EXPIRY_MARGIN = 10
+
+
+class BatchMintStalledError(TonutilsException):
+    """
+    Exception raised when batches keep getting lost without the collection
+    minting any item, e.g. because the collection rejects the batches.
+    """
+
+    def __init__(self, next_index: int, resets: int) -> None:
+        self.next_index = next_index
+        self.resets = resets
+        super().__init__(
+            f"{resets} batches in a row were lost without minting an item, "
+            f"the next item index of the collection is still {next_index}."
+        )
+
+
+class MintBatch(NamedTuple):
+    """
+    A batch mint message sent to the collection.
+
+    :param from_index: The index of the first item of the batch.
+    :param count: The number of items in the batch.
+    :param valid_until: The expiration time of the external message carrying the batch.
+    :param message_hash: The hash of the external message, or None if sending it did not complete.
+    """
+    from_index: int
+    count: int
+    valid_until: int
+    message_hash: Optional[str] = None
+
+    @property
+    def end_index(self) -> int:
+        return self.from_index + self.count
+
+
+class BatchMintPipeline:
+    """
+    Mints a large number of collection items in batches.
+
+    Items are split into batch mint bodies as large as the limits allow:
+    at most ``max_items_per_batch`` items, and a body of at most
+    ``max_body_size`` bytes and ``MAX_BODY_CELLS`` cells, measured on the
+    serialized body. The collections reject batches of 250 items or more,
+    and the default batch size keeps the gas the collection spends on
+    a batch under the compute limit.
+
+    The gas per item is an estimate, ``GAS_PER_ITEM``, not a measurement of
+    the collection. A batch running out of gas is lost, and resending it
+    ends with :class:`BatchMintStalledError`: for a collection doing more
+    work per item, pass a larger ``gas_per_item`` or a smaller
+    ``max_items_per_batch``, checked against the gas used by a batch mint
+    transaction of that collection.
+
+    Up to ``max_in_flight`` batches are sent ahead, one external message each,
+    with consecutive seqnos so the collection receives them in order.
+    A batch is confirmed when the ``next_item_index`` of the collection passes
+    its end. If a batch expires unconfirmed, the pipeline waits until every
+    sent batch has expired and continues from the index stored on chain.
+    After ``max_resets`` such resets in a row without any item minted,
+    it stops with :class:`BatchMintStalledError`.
+
+    With a checkpoint file, the batches are recorded before they are sent,
+    and a restarted pipeline waits until the recorded batches have expired
+    before reading the index from chain, so no item is minted twice.
+
+    Only seqno based wallets are supported: highload wallets do not
+    process their messages in order.
+    """
+
+    def __init__(
+            self,
+            wallet: Wallet,
+            collection_address: Union[Address, str],
+            collection_class: Type[Collection] = CollectionStandard,
+            from_index: int = 0,
+            amount_per_one: int = 20000000,
+            fee_per_one: int = 30000000,
+            max_items_per_batch: Optional[int] = None,
+            gas_per_item: int = GAS_PER_ITEM,
+            max_body_size: int = MAX_BODY_SIZE,
+            max_in_flight: int = 4,
+            valid_for: int = 60,
+            poll_interval: float = 5.0,
+            max_resets: int = 3,
+            checkpoint_path: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the BatchMintPipeline.
+
+        :param wallet: The wallet of the collection owner. It sends the batch mint messages.
+        :param collection_address: The address of the collection.
+        :param collection_class: The collection class building the batch mint bodies,
+            e.g. CollectionStandard or CollectionEditableModified. Defaults to CollectionStandard.
+        :param from_index: The index of the first item of the items iterable. Defaults to 0.
+        :param amount_per_one: The amount in nanoton sent to each item. Defaults to 20000000.
+        :param fee_per_one: The amount in nanoton per item left to the collection for gas. Defaults to 30000000.
+        :param max_items_per_batch: The maximum number of items in a batch, at most 249.
+            Defaults to the number of items whose gas fits 80% of the compute limit.
+        :param gas_per_item: The gas the collection spends per minted item, used for the
+            default max_items_per_batch. Defaults to GAS_PER_ITEM, an estimate for the
+            standard, editable and soulbound collections, not measured on chain.
+        :param max_body_size: The maximum size in bytes of a serialized batch body. Defaults to 60000.
+        :param max_in_flight: The maximum number of unconfirmed batches. Defaults to 4.
+        :param valid_for: Seconds an external message is valid for. Defaults to 60.
+        :param poll_interval: Seconds between the checks of the collection. Defaults to 5.
+        :param max_resets: The number of lost batches in a row without any item minted
+            after which the pipeline stops. Defaults to 3.
+        :param checkpoint_path: Optional JSON file the progress is saved to and resumed from.
+        """
+        # imported here: the wallet package imports this package
+        from ..wallet import HighloadWalletV2, HighloadWalletV3
+
+        if isinstance(wallet, (HighloadWalletV2, HighloadWalletV3)):
+            raise ValueError("Highload wallets do not process messages in order, use a seqno based wallet.")
+
+        if max_items_per_batch is None:
+            max_items_per_batch = min(MAX_BATCH_ITEMS, int(MAX_COMPUTE_GAS * 0.8) // gas_per_item)
+
+        if not 0 < max_items_per_batch <= MAX_BATCH_ITEMS:
+            raise ValueError(f"max_items_per_batch must be between 1 and {MAX_BATCH_ITEMS}.")
+
+        if isinstance(collection_address, str):
+            collection_address = Address(collection_address)
+
+        self.wallet = wallet
+        self.collection_address = collection_address
+        self.collection_class = collection_class
+        self.from_index = from_index
+        self.amount_per_one = amount_per_one
+        self.fee_per_one = fee_per_one
+        self.max_items_per_batch = max_items_per_batch
+        self.max_body_size = max_body_size
+        self.max_in_flight = max_in_flight
+        self.valid_for = valid_for
+        self.poll_interval = poll_interval
+        self.max_resets = max_resets
+        self.checkpoint_path = checkpoint_path
+
+        self.seqno_manager = wallet.seqno_manager or SeqnoManager(wallet, valid_for=valid_for)
+        self._owns_seqno_manager = wallet.seqno_manager is None
+
+        # the index of the next item to confirm, and the batches sent but not confirmed yet
+        self.next_index = from_index
+        self.pending: List[MintBatch] = []
+
+    def _config(self) -> Dict[str, Any]:
+        return {
+            "collection_address": self.collection_address.to_str(is_user_friendly=False),
+            "collection_class": self.collection_class.__name__,
+            "from_index": self.from_index,
+        }
+
+    def load_checkpoint(self) -> bool:
+        """
+        Restore the progress from the checkpoint file, if it exists and was
+        written for the same collection and items.
+
+        :return: Whether the progress was restored.
+        """
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return False
+
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+
+        if checkpoint.get("config") != self._config():
+            return False
+
+        self.next_index = checkpoint["next_index"]
+        self.pending = [MintBatch(**batch) for batch in checkpoint["pending"]]
+
+        return True
+
+    def save_checkpoint(self) -> None:
+        """
+        Write the progress to the checkpoint file.
+        """
+        if self.checkpoint_path is None:
+            return
+
+        checkpoint = {
+            "config": self._config(),
+            "next_index": self.next_index,
+            "pending": [batch._asdict() for batch in self.pending],
+        }
+
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    @staticmethod
+    def _count_cells(cell: Cell) -> int:
+        seen, stack = set(), [cell]
+
+        while stack:
+            current = stack.pop()
+            if current.hash in seen:
+                continue
+            seen.add(current.hash)
+            stack.extend(current.refs)
+
+        return len(seen)
+
+    def build_body(self, items: Sequence[Tuple], from_index: int) -> Tuple[int, Cell]:
+        """
+        Build the largest batch mint body for the leading items that fits the limits.
+
+        :param items: The items, as accepted by ``build_batch_mint_body`` of the collection class.
+        :param from_index: The index of the first item.
+        :return: A (number of items, body) tuple.
+        """
+        count = min(len(items), self.max_items_per_batch)
+
+        while True:
+            body = self.collection_class.build_batch_mint_body(
+                data=list(items[:count]),
+                from_index=from_index,
+                amount_per_one=self.amount_per_one,
+            )
+            size, cells = len(body.to_boc()), self._count_cells(body)
+
+            if size <= self.max_body_size and cells <= MAX_BODY_CELLS:
+                return count, body
+
+            if count == 1:
+                raise ValueError(f"The item {from_index} does not fit in a batch mint body.")
+
+            # shrink in proportion to the excess, with a margin for the dictionary overhead
+            ratio = min(self.max_body_size / size, MAX_BODY_CELLS / cells)
+            count = max(1, min(count - 1, int(count * ratio * 0.95)))
+
+    async def _get_chain_index(self) -> int:
+        return await self.collection_class.get_next_item_index(self.wallet.client, self.collection_address)
+
+    async def _wait_pending_expired(self) -> None:
+        if self.pending:
+            delay = max(batch.valid_until for batch in self.pending) + EXPIRY_MARGIN - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def _reset(self) -> None:
+        # batches that can still land may not be sent again
+        await self._wait_pending_expired()
+
+        self.next_index = await self._get_chain_index()
+        self.pending = []
+        self.seqno_manager.invalidate()
+        self.save_checkpoint()
+
+    async def _send(self, items: Sequence[Tuple], from_index: int) -> MintBatch:
+        count, body = self.build_body(items, from_index)
+        message = self.wallet.create_wallet_internal_message(
+            destination=self.collection_address,
+            value=count * (self.amount_per_one + self.fee_per_one),
+            body=body,
+        )
+
+        async with self.seqno_manager.reserve() as reservation:
+            # recorded before sending: a crash while sending must not lead to sending it again
+            batch = MintBatch(from_index, count, reservation.valid_until)
+            self.pending.append(batch)
+            self.save_checkpoint()
+
+            message_hash = await self.wallet.raw_transfer(
+                messages=[message],
+                seqno=reservation.seqno,
+                valid_until=reservation.valid_until,
+            )
+
+        self.pending[self.pending.index(batch)] = batch = batch._replace(message_hash=message_hash)
+        self.save_checkpoint()
+
+        return batch
+
+    def _confirm(self, chain_index: int) -> None:
+        self.next_index = max(self.next_index, chain_index)
+        self.pending = [batch for batch in self.pending if batch.end_index > self.next_index]
+        self.save_checkpoint()
+
+    async def run(self, items: Iterable[Tuple]) -> int:
+        """
+        Mint the items.
+
+        The first item of ``items`` is minted at ``from_index``. When resuming,
+        pass the same items again: the ones already minted are skipped.
+
+        :param items: The items, as accepted by ``build_batch_mint_body`` of the collection class,
+            e.g. (content, owner address) tuples for CollectionStandard.
+        :return: The index of the next item, one past the last minted item.
+        """
+        try:
+            return await self._run(items)
+        finally:
+            if self._owns_seqno_manager:
+                await self.seqno_manager.close()
+
+    async def _run(self, items: Iterable[Tuple]) -> int:
+        self.load_checkpoint()
+        await self._reset()
+
+        if self.next_index < self.from_index:
+            raise ValueError(
+                f"The next item index of the collection is {self.next_index}, "
+                f"items cannot be minted from {self.from_index}."
+            )
+
+        iterator: Iterator[Tuple] = iter(items)
+        # buffer[0] is the item at buffer_start, items are kept until they are confirmed
+        buffer: List[Tuple] = []
+        buffer_start = self.from_index
+        send_index = self.next_index
+        exhausted = False
+        # lost batches in a row without any item minted
+        stalled_resets = 0
+
+        while True:
+            # drop the confirmed items, including any minted before this run
+            confirmed = self.next_index - buffer_start
+            if confirmed > len(buffer):
+                next(itertools.islice(iterator, confirmed - len(buffer) - 1, None), None)
+            del buffer[:confirmed]
+            buffer_start = self.next_index
+
+            while not exhausted and len(self.pending) < self.max_in_flight:
+                offset = send_index - buffer_start
+                missing = offset + self.max_items_per_batch - len(buffer)
+                if missing > 0:
+                    buffer.extend(itertools.islice(iterator, missing))
+
+                chunk = buffer[offset:offset + self.max_items_per_batch]
+                if not chunk:
+                    exhausted = True
+                    break
+
+                batch = await self._send(chunk, send_index)
+                send_index = batch.end_index
+
+            if not self.pending:
+                return self.next_index
+
+            await asyncio.sleep(self.poll_interval)
+            self._confirm(await self._get_chain_index())
+
+            if self.pending and time.time() > self.pending[0].valid_until + EXPIRY_MARGIN:
+                # the oldest batch was lost, and the later ones cannot be minted without it
+                lost_from = self.pending[0].from_index
+                await self._reset()
+
+                stalled_resets = stalled_resets + 1 if self.next_index <= lost_from else 0
+                if stalled_resets >= self.max_resets:
+                    raise BatchMintStalledError(self.next_index, stalled_resets)
+
+                send_index = self.next_index
+                exhausted = False
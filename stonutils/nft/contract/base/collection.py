@@ -1,16 +1,28 @@
 from __future__ import annotations
 
-from typing import Union
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple, Union
 
-from pytoniq_core import Address, Slice
+from pytoniq_core import Address, Cell, Slice
 
 from ...royalty_params import RoyaltyParams
-from ....client import Client, TonapiClient, ToncenterClient, LiteserverClient
-from ....contract import Contract
+from ....client import Client, ResultFormat
+from ....contract import CodeRegistry, Contract
 from ....exceptions import UnknownClientError
+from ....utils import address_to_bits, calculate_cell_hash
 
 
 class Collection(Contract):
+    # the code of the items minted by collections of the class, set by subclasses
+    NFT_ITEM_CODE_HEX: Optional[str] = None
+
+    # the maximum number of collections whose item code is cached
+    ITEM_CODES_MAX_SIZE = 1000
+
+    # (collection raw address, verified) -> item code, the least recently used first
+    _item_codes: OrderedDict[Tuple[str, bool], Cell] = OrderedDict()
 
     @classmethod
     async def get_royalty_params(
@@ -28,7 +40,7 @@ class Collection(Contract):
         if isinstance(collection_address, str):
             collection_address = Address(collection_address)
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             method_result = await client.run_get_method(
                 address=collection_address.to_str(),
                 method_name="royalty_params",
@@ -37,7 +49,7 @@ class Collection(Contract):
             factor = int(method_result["decoded"]["denominator"])
             royalty_address = Address(method_result["decoded"]["destination"])
 
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             method_result = await client.run_get_method(
                 address=collection_address.to_str(),
                 method_name="royalty_params",
@@ -46,7 +58,7 @@ class Collection(Contract):
             factor = int(method_result["stack"][1]["value"], 16)
             royalty_address = Slice.one_from_boc(method_result["stack"][2]["value"]).load_address()
 
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             method_result = await client.run_get_method(
                 address=collection_address.to_str(),
                 method_name="royalty_params",
@@ -59,3 +71,222 @@ class Collection(Contract):
             raise UnknownClientError(client.__class__.__name__)
 
         return RoyaltyParams(base, factor, royalty_address)
+
+    @classmethod
+    async def get_next_item_index(
+            cls,
+            client: Client,
+            collection_address: Union[Address, str],
+    ) -> int:
+        """
+        Gets the index of the next item to be minted in the collection.
+
+        :param client: The client instance.
+        :param collection_address: The address of the collection.
+        :return: The next item index.
+        """
+        if isinstance(collection_address, str):
+            collection_address = Address(collection_address)
+
+        method_result = await client.run_get_method(
+            address=collection_address.to_str(),
+            method_name="get_collection_data",
+        )
+
+        if client.result_format is ResultFormat.TONAPI:
+            next_item_index = int(method_result["decoded"]["next_item_index"])
+        elif client.result_format is ResultFormat.TONCENTER:
+            next_item_index = int(method_result["stack"][0]["value"], 16)
+        elif client.result_format is ResultFormat.LITESERVER:
+            next_item_index = int(method_result[0])
+        else:
+            raise UnknownClientError(client.__class__.__name__)
+
+        return next_item_index
+
+    @classmethod
+    async def get_nft_address_by_index(
+            cls,
+            client: Client,
+            collection_address: Union[Address, str],
+            index: int,
+    ) -> Address:
+        """
+        Gets the address of a collection item with the get method of the collection.
+
+        :param client: The client instance.
+        :param collection_address: The address of the collection.
+        :param index: The index of the item.
+        :return: The address of the item.
+        """
+        if isinstance(collection_address, str):
+            collection_address = Address(collection_address)
+
+        method_result = await client.run_get_method(
+            address=collection_address.to_str(),
+            method_name="get_nft_address_by_index",
+            stack=[index],
+        )
+
+        if client.result_format is ResultFormat.TONAPI:
+            item_address = Address(method_result["decoded"]["address"])
+        elif client.result_format is ResultFormat.TONCENTER:
+            item_address = Slice.one_from_boc(method_result["stack"][0]["value"]).load_address()
+        elif client.result_format is ResultFormat.LITESERVER:
+            item_address = method_result[0].load_address()
+        else:
+            raise UnknownClientError(client.__class__.__name__)
+
+        return item_address
+
+    @classmethod
+    def calculate_item_addresses(
+            cls,
+            indexes: Iterable[int],
+            collection_address: Union[Address, str],
+            nft_item_code: Union[str, Cell, None] = None,
+    ) -> List[Address]:
+        """
+        Calculate the addresses of collection items locally, without network requests.
+
+        The item is deployed with its index (64 bits) and the collection address
+        as data, as in the standard, editable and soulbound collections.
+
+        :param indexes: The indexes of the items.
+        :param collection_address: The address of the collection.
+        :param nft_item_code: The item code, as stored in the collection data.
+            Defaults to the item code of the collection class.
+        :return: The addresses of the items, in the order of the indexes.
+        """
+        if isinstance(collection_address, str):
+            collection_address = Address(collection_address)
+
+        if nft_item_code is None:
+            nft_item_code = cls.NFT_ITEM_CODE_HEX
+            if nft_item_code is None:
+                raise ValueError(f"{cls.__name__} has no default item code, pass nft_item_code.")
+
+        code_cell = CodeRegistry.lookup(CodeRegistry.get_cell(nft_item_code))
+        collection_bits = address_to_bits(collection_address)
+
+        # the item data has no references: its depth is 0 and only its hash changes
+        state_init_hasher = hashlib.sha256(code_cell.state_init_prefix + b"\x00\x00" + code_cell.hash)
+        addresses = []
+
+        for index in indexes:
+            hasher = state_init_hasher.copy()
+            hasher.update(calculate_cell_hash((index << 267) | collection_bits, 64 + 267))
+            addresses.append(Address((0, hasher.digest())))
+
+        return addresses
+
+    @classmethod
+    def calculate_item_address(
+            cls,
+            index: int,
+            collection_address: Union[Address, str],
+            nft_item_code: Union[str, Cell, None] = None,
+    ) -> Address:
+        """
+        Calculate the address of a collection item locally, see :meth:`calculate_item_addresses`.
+        """
+        return cls.calculate_item_addresses([index], collection_address, nft_item_code)[0]
+
+    @classmethod
+    async def get_item_code(
+            cls,
+            client: Client,
+            collection_address: Union[Address, str],
+            verify: bool = True,
+    ) -> Optional[Cell]:
+        """
+        Gets the item code stored in the collection data. It is fetched once
+        per collection and cached, for up to ``ITEM_CODES_MAX_SIZE`` collections.
+        A missing code is not cached: the collection may not be deployed yet.
+
+        :param client: The client instance.
+        :param collection_address: The address of the collection.
+        :param verify: Whether the address of the first item calculated with the code
+            is checked against the get method of the collection. Defaults to True.
+        :return: The item code, or None if the collection data has another layout or the check failed.
+        """
+        if isinstance(collection_address, str):
+            collection_address = Address(collection_address)
+
+        key = (collection_address.to_str(is_user_friendly=False), verify)
+        if key in cls._item_codes:
+            cls._item_codes.move_to_end(key)
+            return cls._item_codes[key]
+
+        account = await client.get_raw_account(collection_address.to_str())
+
+        try:
+            cs = account.data.begin_parse()
+            cs.load_address()
+            cs.skip_bits(64)
+            cs.load_ref()
+            nft_item_code = CodeRegistry.register(cs.load_ref()).cell
+        except Exception:
+            return None
+
+        if verify:
+            expected = await cls.get_nft_address_by_index(client, collection_address, 0)
+            if cls.calculate_item_address(0, collection_address, nft_item_code) != expected:
+                return None
+
+        cls._item_codes[key] = nft_item_code
+        while len(cls._item_codes) > cls.ITEM_CODES_MAX_SIZE:
+            cls._item_codes.popitem(last=False)
+
+        return nft_item_code
+
+    @classmethod
+    async def get_item_addresses(
+            cls,
+            client: Client,
+            collection_address: Union[Address, str],
+            indexes: Iterable[int],
+            verify: bool = True,
+            concurrency: int = 10,
+    ) -> List[Address]:
+        """
+        Gets the addresses of collection items.
+
+        The addresses are calculated locally with the item code of the collection
+        (see :meth:`get_item_code`), so only the first call for a collection makes
+        network requests. If the item code cannot be used, the get method of
+        the collection is called for each item instead.
+
+        :param client: The client instance.
+        :param collection_address: The address of the collection.
+        :param indexes: The indexes of the items, e.g. ``range(10000)``.
+        :param verify: See :meth:`get_item_code`. Defaults to True.
+        :param concurrency: The maximum number of get method calls in flight
+            when falling back to the get method. Defaults to 10.
+        :return: The addresses of the items, in the order of the indexes.
+        """
+        nft_item_code = await cls.get_item_code(client, collection_address, verify)
+
+        if nft_item_code is not None:
+            return cls.calculate_item_addresses(indexes, collection_address, nft_item_code)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get_address(index: int) -> Address:
+            async with semaphore:
+                return await cls.get_nft_address_by_index(client, collection_address, index)
+
+        return list(await asyncio.gather(*[get_address(index) for index in indexes]))
+
+    @classmethod
+    async def get_item_address(
+            cls,
+            client: Client,
+            collection_address: Union[Address, str],
+            index: int,
+            verify: bool = True,
+    ) -> Address:
+        """
+        Gets the address of a collection item, see :meth:`get_item_addresses`.
+        """
+        return (await cls.get_item_addresses(client, collection_address, [index], verify))[0]
@@ -6,7 +6,7 @@ from pytoniq_core import Address, Cell, Slice, begin_cell
 
 from ...data import NFTData
 from ...op_codes import *
-from ....client import Client, TonapiClient, ToncenterClient, LiteserverClient
+from ....client import Client, ResultFormat
 from ....contract import Contract
 from ....exceptions import UnknownClientError
 
@@ -22,7 +22,7 @@ class NFT(Contract):
         if isinstance(nft_address, str):
             nft_address = Address(nft_address)
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             method_result = await client.run_get_method(
                 address=nft_address.to_str(),
                 method_name="get_nft_data",
@@ -32,7 +32,7 @@ class NFT(Contract):
             collection_address = Address(method_result["decoded"]["collection_address"])
             content = Slice.one_from_boc(method_result["decoded"]["individual_content"]).load_snake_string()
 
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             method_result = await client.run_get_method(
                 address=nft_address.to_str(),
                 method_name="get_nft_data",
@@ -42,7 +42,7 @@ class NFT(Contract):
             owner_address = Slice.one_from_boc(method_result["stack"][3]["value"]).load_address()
             content = Slice.one_from_boc(method_result["stack"][4]["value"]).load_snake_string()
 
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             method_result = await client.run_get_method(
                 address=nft_address.to_str(),
                 method_name="get_nft_data",
@@ -21,6 +21,8 @@ from ...royalty_params import RoyaltyParams
 
 class CollectionEditableBase(Collection):
 
+    NFT_ITEM_CODE_HEX = NFTEditable.CODE_HEX
+
     def __init__(
             self,
             owner_address: Address,
@@ -33,7 +35,7 @@ class CollectionEditableBase(Collection):
             royalty_params: RoyaltyParams,
     ) -> None:
         self._data = self.create_data(owner_address, next_item_index, content, royalty_params).serialize()
-        self._code = Cell.one_from_boc(self.CODE_HEX)
+        self._code = self.get_code_cell()
 
     @classmethod
     def create_data(
@@ -52,7 +54,7 @@ class CollectionEditableBase(Collection):
             next_item_index=next_item_index,
             content=content,
             royalty_params=royalty_params,
-            nft_item_code=NFTEditable.CODE_HEX,
+            nft_item_code=cls.NFT_ITEM_CODE_HEX,
         )
 
     @classmethod
@@ -24,7 +24,7 @@ class NFTEditableBase(NFT):
             content: Optional[Union[NFTOffchainContent, NFTModifiedOnchainContent, NFTModifiedOffchainContent]] = None,
     ) -> None:
         self._data = self.create_data(index, collection_address, owner_address, content).serialize()
-        self._code = Cell.one_from_boc(self.CODE_HEX)
+        self._code = self.get_code_cell()
 
     @classmethod
     def create_data(
@@ -4,6 +4,7 @@ from typing import Optional, Union
 
 from pytoniq_core import Address, Cell, Slice, TlbScheme, begin_cell
 
+from ..contract import CodeRegistry
 from .content import BaseOnchainContent, BaseOffchainContent
 from .royalty_params import RoyaltyParams
 
@@ -29,7 +30,7 @@ class CollectionData(TlbScheme):
         self.content = content
 
         if isinstance(nft_item_code, str):
-            nft_item_code = Cell.one_from_boc(nft_item_code)
+            nft_item_code = CodeRegistry.get_cell(nft_item_code)
         self.nft_item_code = nft_item_code
 
         if isinstance(royalty_params, RoyaltyParams):
@@ -47,7 +47,7 @@ class SaleV3R3(Contract):
             royalty_fee=royalty_fee,
             price=price,
         ).serialize()
-        self._code = Cell.one_from_boc(self.CODE_HEX)
+        self._code = self.get_code_cell()
 
     @classmethod
     def create_data(
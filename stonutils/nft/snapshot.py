@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from pytoniq_core import Address, Cell
+
+from .contract.base import NFT, Collection
+from ..account import RawAccount
+from ..client import Client
+
+
+class SnapshotRow(NamedTuple):
+    """
+    The state of a collection item.
+
+    :param index: The index of the item.
+    :param address: The address of the item.
+    :param owner: The address of the owner, or None if the item is not deployed or initialized.
+    :param content: The individual content of the item, or None if it is not deployed or initialized.
+    :param last_transaction_lt: The logical time of the last transaction of the item, 0 if it is not deployed.
+    """
+    index: int
+    address: str
+    owner: Optional[str]
+    content: Optional[str]
+    last_transaction_lt: int
+
+
+class CollectionSnapshot:
+    """
+    Exports the owner and content of every item of a collection.
+
+    Item addresses are calculated locally (see :meth:`Collection.get_item_addresses`)
+    and the item accounts are fetched in bulk with :meth:`Client.get_raw_accounts`,
+    which uses the bulk endpoints of the backend where available, and bounded
+    concurrent requests otherwise. The owner and content are read from the account
+    data, laid out as in the standard, editable and soulbound items; other items
+    fall back to :meth:`NFT.get_nft_data`.
+
+    Rows are streamed to a CSV or JSONL file in index order. With a checkpoint
+    file, an interrupted export resumes after the last chunk written.
+    Given a previous snapshot, rows of items whose ``last_transaction_lt``
+    did not change are copied from it instead of being parsed or fetched again.
+    """
+
+    def __init__(
+            self,
+            client: Client,
+            collection_address: Union[Address, str],
+            collection_class: Type[Collection] = Collection,
+            chunk_size: int = 1000,
+            concurrency: int = 10,
+            checkpoint_path: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the CollectionSnapshot.
+
+        :param client: The client to use.
+        :param collection_address: The address of the collection.
+        :param collection_class: The collection class used for the get methods. Defaults to Collection.
+        :param chunk_size: The number of items fetched and written at a time. Defaults to 1000.
+        :param concurrency: The maximum number of get_nft_data calls in flight for items
+            whose data cannot be read locally. Defaults to 10.
+        :param checkpoint_path: Optional JSON file the progress is saved to and resumed from.
+        """
+        if isinstance(collection_address, str):
+            collection_address = Address(collection_address)
+
+        self.client = client
+        self.collection_address = collection_address
+        self.collection_class = collection_class
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.checkpoint_path = checkpoint_path
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    @staticmethod
+    def parse_item_data(data: Cell) -> Tuple[Optional[Address], Optional[str]]:
+        """
+        Read the owner and individual content from the data of an item.
+
+        :param data: The data cell of the item.
+        :return: An (owner address, content) tuple, both None if the item is not initialized.
+        """
+        cs = data.begin_parse()
+        cs.skip_bits(64)
+        cs.load_address()
+
+        if cs.remaining_bits == 0:
+            return None, None
+
+        owner_address = cs.load_address()
+        content = cs.load_ref().begin_parse().load_snake_string()
+
+        return owner_address, content
+
+    async def _get_nft_data(self, address: Address) -> Tuple[Optional[Address], Optional[str]]:
+        async with self._semaphore:
+            nft_data = await NFT.get_nft_data(self.client, address)
+
+        return nft_data.owner_address, nft_data.content
+
+    async def _to_row(
+            self,
+            index: int,
+            address: Address,
+            account: RawAccount,
+            previous: Optional[SnapshotRow],
+    ) -> SnapshotRow:
+        address_str = address.to_str()
+
+        if account.data is None:
+            return SnapshotRow(index, address_str, None, None, account.last_transaction_lt or 0)
+
+        if (
+                previous is not None and
+                previous.address == address_str and
+                previous.last_transaction_lt == account.last_transaction_lt
+        ):
+            return previous
+
+        try:
+            owner_address, content = self.parse_item_data(account.data)
+        except Exception:
+            owner_address, content = await self._get_nft_data(address)
+
+        return SnapshotRow(
+            index=index,
+            address=address_str,
+            owner=owner_address.to_str() if owner_address is not None else None,
+            content=content,
+            last_transaction_lt=account.last_transaction_lt,
+        )
+
+    async def fetch_rows(
+            self,
+            indexes: Sequence[int],
+            previous: Optional[Dict[int, SnapshotRow]] = None,
+    ) -> List[SnapshotRow]:
+        """
+        Fetch the rows of the items.
+
+        :param indexes: The indexes of the items.
+        :param previous: Rows of a previous snapshot by index, reused for unchanged items.
+        :return: The rows, in the order of the indexes.
+        """
+        addresses = await self.collection_class.get_item_addresses(
+            self.client, self.collection_address, indexes, concurrency=self.concurrency,
+        )
+        accounts = await self.client.get_raw_accounts([address.to_str() for address in addresses])
+        previous = previous or {}
+
+        return list(await asyncio.gather(*[
+            self._to_row(index, address, account, previous.get(index))
+            for index, address, account in zip(indexes, addresses, accounts)
+        ]))
+
+    async def iter_rows(
+            self,
+            start: int = 0,
+            end: Optional[int] = None,
+            previous: Optional[Dict[int, SnapshotRow]] = None,
+    ) -> AsyncIterator[List[SnapshotRow]]:
+        """
+        Fetch the rows of a range of items chunk by chunk, in index order.
+        The next chunk is fetched while the current one is consumed.
+
+        :param start: The first index. Defaults to 0.
+        :param end: The index after the last one. Defaults to the next item index of the collection.
+        :param previous: Rows of a previous snapshot by index, reused for unchanged items.
+        :return: An async iterator of row chunks.
+        """
+        if end is None:
+            end = await self.collection_class.get_next_item_index(self.client, self.collection_address)
+
+        chunks = [range(i, min(i + self.chunk_size, end)) for i in range(start, end, self.chunk_size)]
+        if not chunks:
+            return
+
+        task = asyncio.ensure_future(self.fetch_rows(chunks[0], previous))
+
+        try:
+            for chunk in chunks[1:]:
+                rows = await task
+                task = asyncio.ensure_future(self.fetch_rows(chunk, previous))
+                yield rows
+
+            yield await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+    @staticmethod
+    def _get_format(path: str, format_: Optional[str]) -> str:
+        format_ = format_ or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        if format_ not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported format: {format_}.")
+
+        return format_
+
+    @classmethod
+    def read(cls, path: str, format_: Optional[str] = None) -> Dict[int, SnapshotRow]:
+        """
+        Read a snapshot file.
+
+        :param path: The CSV or JSONL file path.
+        :param format_: ``csv`` or ``jsonl``. Defaults to the file extension.
+        :return: The rows by index.
+        """
+        rows: Dict[int, SnapshotRow] = {}
+
+        with open(path, newline="", encoding="utf-8") as f:
+            if cls._get_format(path, format_) == "csv":
+                records: Any = csv.DictReader(f)
+            else:
+                records = (json.loads(line) for line in f if line.strip())
+
+            for record in records:
+                row = SnapshotRow(
+                    index=int(record["index"]),
+                    address=record["address"],
+                    owner=record["owner"] or None,
+                    content=record["content"] if record["owner"] else None,
+                    last_transaction_lt=int(record["last_transaction_lt"]),
+                )
+                rows[row.index] = row
+
+        return rows
+
+    @staticmethod
+    def _encode(rows: Iterable[Sequence[Any]], format_: str) -> bytes:
+        buffer = io.StringIO(newline="")
+
+        if format_ == "csv":
+            csv.writer(buffer).writerows(["" if value is None else value for value in row] for row in rows)
+        else:
+            buffer.writelines(json.dumps(row._asdict()) + "\n" for row in rows)
+
+        return buffer.getvalue().encode("utf-8")
+
+    def _config(self, path: str, format_: str) -> Dict[str, Any]:
+        return {
+            "collection_address": self.collection_address.to_str(is_user_friendly=False),
+            "path": os.path.abspath(path),
+            "format": format_,
+        }
+
+    def _load_checkpoint(self, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return None
+
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+
+        return checkpoint if checkpoint.get("config") == config else None
+
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    async def export(
+            self,
+            path: str,
+            previous_path: Optional[str] = None,
+            format_: Optional[str] = None,
+    ) -> int:
+        """
+        Export the rows of all items of the collection to a file.
+
+        :param path: The output CSV or JSONL file path.
+        :param previous_path: Optional previous snapshot (may be the output path itself):
+            items whose last_transaction_lt did not change keep their previous row.
+        :param format_: ``csv`` or ``jsonl``. Defaults to the file extension of the path.
+        :return: The number of rows written by this run.
+        """
+        format_ = self._get_format(path, format_)
+        previous = None
+        if previous_path is not None and os.path.exists(previous_path):
+            previous = self.read(previous_path, format_)
+
+        config = self._config(path, format_)
+        checkpoint = self._load_checkpoint(config)
+        end = await self.collection_class.get_next_item_index(self.client, self.collection_address)
+
+        # written in binary mode: the checkpoint offset is a byte offset to truncate to
+        if checkpoint is not None:
+            # drop the rows written after the last checkpoint
+            f = open(path, "r+b")
+            f.truncate(checkpoint["offset"])
+            f.seek(checkpoint["offset"])
+            start = checkpoint["next_index"]
+        else:
+            f = open(path, "wb")
+            start = 0
+
+        count = 0
+
+        with f:
+            if checkpoint is None and format_ == "csv":
+                f.write(self._encode([SnapshotRow._fields], format_))
+
+            async for rows in self.iter_rows(start, end, previous):
+                f.write(self._encode(rows, format_))
+                count += len(rows)
+
+                if self.checkpoint_path is not None:
+                    f.flush()
+                    self._save_checkpoint({
+                        "config": config,
+                        "next_index": rows[-1].index + 1,
+                        "offset": f.tell(),
+                    })
+
+        if self.checkpoint_path is not None and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+        return count
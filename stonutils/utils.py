@@ -3,7 +3,7 @@ import hashlib
 import hmac
 import json
 import os
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, Sequence, Tuple, Union
 
 from Cryptodome.Cipher import AES
 from nacl.bindings import crypto_scalarmult
@@ -164,3 +164,39 @@ def serialize_onchain_dict(data: Dict[str, Any]) -> Cell:
         dict_cell.set(key, cell.end_cell(), hash_key=True)
 
     return dict_cell.serialize()
+
+
+def address_to_bits(address: Address) -> int:
+    """
+    Return the 267-bit addr_std serialization of an address as an integer,
+    as stored in a cell by ``store_address``.
+
+    :param address: The address (without anycast).
+    :return: The serialized address.
+    """
+    return (0b100 << 264) | ((address.wc & 0xFF) << 256) | int.from_bytes(address.hash_part, "big")
+
+
+def calculate_cell_hash(bits: int, bit_length: int, refs: Sequence[Cell] = ()) -> bytes:
+    """
+    Calculate the hash of an ordinary cell directly from its data,
+    without building the cell. Gives the same result as ``Cell.hash``.
+
+    :param bits: The cell data as an integer of bit_length bits.
+    :param bit_length: The number of data bits (up to 1023).
+    :param refs: The referenced cells (up to 4).
+    :return: The representation hash of the cell.
+    """
+    full_bytes, rest = divmod(bit_length, 8)
+
+    if rest:
+        data = ((bits << (8 - rest)) | (1 << (7 - rest))).to_bytes(full_bytes + 1, "big")
+    else:
+        data = bits.to_bytes(full_bytes, "big")
+
+    representation = bytes((len(refs), full_bytes * 2 + (1 if rest else 0))) + data
+    representation += b"".join(ref.get_depth().to_bytes(2, "big") for ref in refs)
+    representation += b"".join(ref.hash for ref in refs)
+
+    return hashlib.sha256(representation).digest()
+
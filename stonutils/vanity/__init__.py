@@ -1,5 +1,9 @@
 from .contract import Vanity
+from .miner import VanityMiner, VanityProgress, VanityResult
 
 __all__ = [
     "Vanity",
+    "VanityMiner",
+    "VanityProgress",
+    "VanityResult",
 ]
@@ -15,7 +15,7 @@ class Vanity(Contract):
             salt: Optional[str] = None,
     ) -> None:
         self._data = self.create_data(owner_address, salt).serialize()
-        self._code = Cell.one_from_boc(self.CODE_HEX)
+        self._code = self.get_code_cell()
 
     @classmethod
     def create_data(
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from pytoniq_core import Address
+
+from .contract import Vanity
+from ..contract import CodeRegistry
+from ..utils import address_to_bits
+
+BASE64_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+
+
+class VanityResult(NamedTuple):
+    """
+    A found vanity address.
+
+    :param address: The address in the requested user-friendly form.
+    :param salt: The salt to pass to :class:`Vanity`, as a hex string.
+    """
+    address: str
+    salt: str
+
+
+class VanityProgress(NamedTuple):
+    """
+    Progress of a mining run.
+
+    :param attempts: The number of salts tried, including resumed runs.
+    :param attempts_per_second: The current mining speed.
+    :param elapsed: Seconds since the run started.
+    :param eta: Expected seconds until the requested number of results is found,
+        or None if it cannot be estimated (regex patterns).
+    :param results: The number of results found so far.
+    """
+    attempts: int
+    attempts_per_second: float
+    elapsed: float
+    eta: Optional[float]
+    results: int
+
+
+def _mine_batch(
+        data_prefix: bytes,
+        state_init_prefix: bytes,
+        tag: bytes,
+        seed: bytes,
+        start: int,
+        count: int,
+        prefix: Optional[str],
+        suffix: Optional[str],
+        regex: Optional[str],
+        case_sensitive: bool,
+) -> List[int]:
+    """
+    Try the salts ``seed + counter`` for counters in ``[start, start + count)``.
+    Runs in a worker process.
+
+    :return: The counters of the matching salts.
+    """
+    # data cell: d1 = 0 refs, d2 = 2 * 66 bytes, 5 + 267 constant bits, 256 bits of salt
+    data_hasher = hashlib.sha256(b"\x00\x84" + data_prefix)
+    # StateInit cell: descriptors, flags, code depth, data depth, code hash, then data hash
+    state_init_hasher = hashlib.sha256(state_init_prefix)
+
+    crc16 = binascii.crc_hqx
+    b64encode = base64.urlsafe_b64encode
+    pattern = re.compile(regex, 0 if case_sensitive else re.IGNORECASE) if regex is not None else None
+
+    if not case_sensitive:
+        prefix = prefix.lower() if prefix is not None else None
+        suffix = suffix.lower() if suffix is not None else None
+
+    found = []
+
+    for counter in range(start, start + count):
+        salt = seed + counter.to_bytes(8, "big")
+
+        data_hash = data_hasher.copy()
+        data_hash.update(salt)
+        state_init_hash = state_init_hasher.copy()
+        state_init_hash.update(data_hash.digest())
+
+        address = tag + state_init_hash.digest()
+        address = b64encode(address + crc16(address, 0).to_bytes(2, "big")).decode()
+        candidate = address if case_sensitive else address.lower()
+
+        if prefix is not None and not candidate.startswith(prefix, 2):
+            continue
+        if suffix is not None and not candidate.endswith(suffix):
+            continue
+        if pattern is not None and pattern.search(address) is None:
+            continue
+
+        found.append(counter)
+
+    return found
+
+
+class VanityMiner:
+    """
+    Searches salts for the :class:`Vanity` contract whose address matches a pattern,
+    using all CPU cores.
+
+    The constant parts of the data cell (owner address) and of the StateInit
+    (code hash and depths) are hashed once, so each attempt only hashes the salt
+    and the resulting data cell hash. Salts are a random seed followed by
+    a counter, so a run can be resumed from a checkpoint file.
+
+    The prefix is matched right after the two tag characters of the address
+    (``EQ``/``UQ`` on mainnet), the suffix at its end, and the regex anywhere
+    in the full address.
+    """
+
+    def __init__(
+            self,
+            owner_address: Union[Address, str],
+            prefix: Optional[str] = None,
+            suffix: Optional[str] = None,
+            regex: Optional[str] = None,
+            case_sensitive: bool = True,
+            bounceable: bool = True,
+            is_testnet: bool = False,
+            workers: Optional[int] = None,
+            batch_size: int = 50000,
+            checkpoint_path: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the VanityMiner.
+
+        :param owner_address: The address allowed to deploy the vanity contract.
+        :param prefix: The required beginning of the address, after the two tag characters.
+        :param suffix: The required ending of the address.
+        :param regex: A regular expression the address must contain a match of.
+        :param case_sensitive: Whether letters must match in case. Defaults to True.
+        :param bounceable: Whether the pattern applies to the bounceable form of the address.
+            Defaults to True.
+        :param is_testnet: Whether the pattern applies to the testnet form of the address.
+            Defaults to False.
+        :param workers: The number of worker processes. Defaults to the number of CPU cores.
+        :param batch_size: The number of salts a worker tries per task. Defaults to 50000.
+        :param checkpoint_path: Optional JSON file the progress is saved to and resumed from.
+        """
+        if prefix is None and suffix is None and regex is None:
+            raise ValueError("At least one of prefix, suffix or regex is required.")
+
+        for part in (prefix, suffix):
+            if part is not None and any(c not in BASE64_ALPHABET for c in part):
+                raise ValueError(f"{part!r} contains characters that cannot appear in an address.")
+
+        # the third character encodes the low bits of the workchain byte (0) and two hash bits
+        if prefix and prefix[0] not in ("ABCD" if case_sensitive else "ABCDabcd"):
+            raise ValueError("The prefix of a basechain address must start with A, B, C or D.")
+
+        if isinstance(owner_address, str):
+            owner_address = Address(owner_address)
+
+        self.owner_address = owner_address
+        self.prefix = prefix
+        self.suffix = suffix
+        self.regex = regex
+        self.case_sensitive = case_sensitive
+        self.bounceable = bounceable
+        self.is_testnet = is_testnet
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path
+
+        code_cell = CodeRegistry.get(Vanity.CODE_HEX)
+        self._state_init_prefix = code_cell.state_init_prefix + b"\x00\x00" + code_cell.hash  # data depth is 0
+        self._data_prefix = address_to_bits(owner_address).to_bytes(34, "big")  # 5 zero bits + address
+        self._tag = bytes((
+            (0x11 if bounceable else 0x51) | (0x80 if is_testnet else 0),
+            0x00,
+        ))
+
+        self.seed = os.urandom(24)
+        self.next_counter = 0
+        self.attempts = 0
+        self.results: List[VanityResult] = []
+
+    @property
+    def expected_attempts(self) -> Optional[float]:
+        """
+        The expected number of attempts per result, or None for regex patterns.
+        """
+        if self.regex is not None:
+            return None
+
+        attempts = 4.0 if self.prefix else 1.0
+        for char in (self.prefix or "")[1:] + (self.suffix or ""):
+            attempts *= 64 if self.case_sensitive or not char.isalpha() else 32
+
+        return attempts
+
+    def _config(self) -> Dict[str, Union[str, bool, None]]:
+        return {
+            "owner_address": self.owner_address.to_str(is_user_friendly=False),
+            "prefix": self.prefix,
+            "suffix": self.suffix,
+            "regex": self.regex,
+            "case_sensitive": self.case_sensitive,
+            "bounceable": self.bounceable,
+            "is_testnet": self.is_testnet,
+        }
+
+    def load_checkpoint(self) -> bool:
+        """
+        Restore the progress from the checkpoint file, if it exists and was
+        written for the same owner and pattern.
+
+        :return: Whether the progress was restored.
+        """
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return False
+
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+
+        if checkpoint.get("config") != self._config():
+            return False
+
+        self.seed = bytes.fromhex(checkpoint["seed"])
+        self.next_counter = checkpoint["next_counter"]
+        self.attempts = checkpoint["attempts"]
+        self.results = [VanityResult(**result) for result in checkpoint["results"]]
+
+        return True
+
+    def save_checkpoint(self) -> None:
+        """
+        Write the progress to the checkpoint file.
+        """
+        if self.checkpoint_path is None:
+            return
+
+        checkpoint = {
+            "config": self._config(),
+            "seed": self.seed.hex(),
+            "next_counter": self.next_counter,
+            "attempts": self.attempts,
+            "results": [result._asdict() for result in self.results],
+        }
+
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def _to_result(self, counter: int) -> VanityResult:
+        salt = (self.seed + counter.to_bytes(8, "big")).hex()
+        address = Vanity(self.owner_address, salt).address.to_str(
+            is_bounceable=self.bounceable,
+            is_test_only=self.is_testnet,
+        )
+
+        return VanityResult(address=address, salt=salt)
+
+    def mine(
+            self,
+            results: int = 1,
+            timeout: Optional[float] = None,
+            progress: Optional[Callable[[VanityProgress], None]] = None,
+            checkpoint_interval: float = 10,
+    ) -> List[VanityResult]:
+        """
+        Search salts until the requested number of results is found or the timeout passes.
+
+        The progress is resumed from the checkpoint file when possible
+        and saved to it periodically and on exit.
+
+        :param results: The number of results to find, including restored ones. Defaults to 1.
+        :param timeout: The maximum run time in seconds. Defaults to None (no limit).
+        :param progress: Optional callback receiving a VanityProgress after each batch.
+        :param checkpoint_interval: Seconds between checkpoint writes. Defaults to 10.
+        :return: All results found, including restored ones.
+        """
+        self.load_checkpoint()
+
+        started_at = time.monotonic()
+        saved_at = started_at
+        run_attempts = 0
+        expected_attempts = self.expected_attempts
+
+        pending: Dict[Future, Tuple[int, int]] = {}
+        completed: Dict[int, int] = {}
+        next_start = self.next_counter
+
+        def submit() -> None:
+            nonlocal next_start
+            future = executor.submit(
+                _mine_batch,
+                self._data_prefix,
+                self._state_init_prefix,
+                self._tag,
+                self.seed,
+                next_start,
+                self.batch_size,
+                self.prefix,
+                self.suffix,
+                self.regex,
+                self.case_sensitive,
+            )
+            pending[future] = (next_start, self.batch_size)
+            next_start += self.batch_size
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while len(self.results) < results:
+                    while len(pending) < self.workers * 2:
+                        submit()
+
+                    remaining = None if timeout is None else timeout - (time.monotonic() - started_at)
+                    if remaining is not None and remaining <= 0:
+                        break
+
+                    done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        start, count = pending.pop(future)
+                        for counter in future.result():
+                            result = self._to_result(counter)
+                            if result not in self.results:
+                                self.results.append(result)
+                        self.attempts += count
+                        run_attempts += count
+                        completed[start] = count
+
+                    # salts below next_counter are all tried
+                    while self.next_counter in completed:
+                        self.next_counter += completed.pop(self.next_counter)
+
+                    elapsed = time.monotonic() - started_at
+                    speed = run_attempts / elapsed if elapsed > 0 else 0.0
+
+                    if progress is not None:
+                        eta = None
+                        if expected_attempts is not None and speed > 0:
+                            eta = expected_attempts * max(0, results - len(self.results)) / speed
+                        progress(VanityProgress(self.attempts, speed, elapsed, eta, len(self.results)))
+
+                    if time.monotonic() - saved_at >= checkpoint_interval:
+                        self.save_checkpoint()
+                        saved_at = time.monotonic()
+            finally:
+                for future in pending:
+                    future.cancel()
+                self.save_checkpoint()
+
+        return self.results
@@ -11,6 +11,17 @@ from .contract import (
     WalletV4R2,
     WalletV5R1,
 )
+from .bulk import DerivedAddress, WalletAddressDeriver
+from .processed import ProcessedQueryTracker
+from .query_id import (
+    FileQueryIdStore,
+    HighloadQueryIdAllocator,
+    QueryIdExhaustedError,
+    QueryIdStore,
+    SqliteQueryIdStore,
+)
+from .seqno import SeqnoManager, SeqnoReservation
+from .transfer_queue import TransferQueue
 
 __all__ = [
     "Wallet",
@@ -24,4 +35,16 @@ __all__ = [
     "WalletV4R1",
     "WalletV4R2",
     "WalletV5R1",
+
+    "DerivedAddress",
+    "WalletAddressDeriver",
+    "ProcessedQueryTracker",
+    "FileQueryIdStore",
+    "HighloadQueryIdAllocator",
+    "QueryIdExhaustedError",
+    "QueryIdStore",
+    "SqliteQueryIdStore",
+    "SeqnoManager",
+    "SeqnoReservation",
+    "TransferQueue",
 ]
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import csv
+import hashlib
+import itertools
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from .contract import (
+    HighloadWalletV2,
+    HighloadWalletV3,
+    PreprocessedWalletV2,
+    PreprocessedWalletV2R1,
+    Wallet,
+    WalletV3R1,
+    WalletV3R2,
+    WalletV4R1,
+    WalletV4R2,
+    WalletV5R1,
+)
+from .utils import generate_wallet_id
+from ..contract import CodeRegistry
+
+PublicKey = Union[bytes, str]
+
+# (public_key, wallet_id) pairs, wallet_id is None for the wallet class default
+Item = Tuple[PublicKey, Optional[int]]
+
+
+class DerivedAddress(NamedTuple):
+    """
+    A derived wallet address.
+
+    :param public_key: The public key, as a hex string.
+    :param wallet_id: The wallet ID the address was derived with, or None for the default.
+    :param address: The wallet address.
+    """
+    public_key: str
+    wallet_id: Optional[int]
+    address: str
+
+
+def _v3_data(public_key: int, wallet_id: int = 698983191, seqno: int = 0) -> Tuple[int, int]:
+    # seqno(32) wallet_id(32) public_key(256)
+    return (seqno << 288) | (wallet_id << 256) | public_key, 320
+
+
+def _v4_data(public_key: int, wallet_id: int = 698983191, seqno: int = 0) -> Tuple[int, int]:
+    # seqno(32) wallet_id(32) public_key(256) plugins(1)
+    return (seqno << 289) | (wallet_id << 257) | (public_key << 1), 321
+
+
+def _v5_data(
+        public_key: int,
+        wallet_id: int = 0,
+        seqno: int = 0,
+        workchain: int = 0,
+        wallet_version: int = 0,
+        network_global_id: int = -239,
+) -> Tuple[int, int]:
+    # is_signature_allowed(1) seqno(32) wallet_id(32) public_key(256) extensions(1)
+    wallet_id = generate_wallet_id(
+        subwallet_id=wallet_id,
+        workchain=workchain,
+        wallet_version=wallet_version,
+        network_global_id=network_global_id,
+    )
+    return (1 << 321) | (seqno << 289) | (wallet_id << 257) | (public_key << 1), 322
+
+
+def _highload_v2_data(public_key: int, wallet_id: int = 698983191, last_cleaned: int = 0) -> Tuple[int, int]:
+    # wallet_id(32) last_cleaned(64) public_key(256) old_queries(1)
+    return (wallet_id << 321) | (last_cleaned << 257) | (public_key << 1), 353
+
+
+def _highload_v3_data(public_key: int, wallet_id: int = 698983191, timeout: int = 60 * 5) -> Tuple[int, int]:
+    # public_key(256) wallet_id(32) last_cleaned(64) old_queries(1) queries(1) timeout(22)
+    return (public_key << 120) | (wallet_id << 88) | timeout, 376
+
+
+def _preprocessed_data(public_key: int, wallet_id: Optional[int] = None, seqno: int = 0) -> Tuple[int, int]:
+    # public_key(256) seqno(16)
+    return (public_key << 16) | seqno, 272
+
+
+DataLayout = Callable[..., Tuple[int, int]]
+
+DATA_LAYOUTS: Dict[Type[Wallet], DataLayout] = {
+    WalletV3R1: _v3_data,
+    WalletV3R2: _v3_data,
+    WalletV4R1: _v4_data,
+    WalletV4R2: _v4_data,
+    WalletV5R1: _v5_data,
+    HighloadWalletV2: _highload_v2_data,
+    HighloadWalletV3: _highload_v3_data,
+    PreprocessedWalletV2: _preprocessed_data,
+    PreprocessedWalletV2R1: _preprocessed_data,
+}
+
+
+def _to_public_key(public_key: PublicKey) -> bytes:
+    if isinstance(public_key, str):
+        public_key = bytes.fromhex(public_key)
+
+    if len(public_key) != 32:
+        raise ValueError(f"Public key must be 32 bytes, got {len(public_key)}.")
+
+    return public_key
+
+
+def _strict_zip(public_keys: Iterable[PublicKey], wallet_ids: Iterable[int]) -> Iterator[Item]:
+    sentinel = object()
+
+    for public_key, wallet_id in itertools.zip_longest(public_keys, wallet_ids, fillvalue=sentinel):
+        if public_key is sentinel or wallet_id is sentinel:
+            raise ValueError("public_keys and wallet_ids must have the same length.")
+        yield public_key, wallet_id
+
+
+def _derive_chunk(
+        wallet_class: Type[Wallet],
+        state_init_prefix: bytes,
+        tag: Optional[bytes],
+        is_url_safe: bool,
+        options: Dict[str, Any],
+        items: List[Item],
+) -> List[DerivedAddress]:
+    """
+    Derive the addresses of a chunk of (public key, wallet ID) pairs.
+    Runs in a worker process.
+    """
+    layout = DATA_LAYOUTS.get(wallet_class)
+    code_cell = CodeRegistry.get(wallet_class.CODE_HEX)
+
+    # StateInit cell: descriptors, flags, code depth, data depth 0, code hash, then data hash
+    state_init_hasher = hashlib.sha256(state_init_prefix)
+    sha256 = hashlib.sha256
+    crc16 = binascii.crc_hqx
+    b64encode = base64.urlsafe_b64encode if is_url_safe else base64.b64encode
+
+    results = []
+
+    for public_key, wallet_id in items:
+        public_key = _to_public_key(public_key)
+        kwargs = options if wallet_id is None else {**options, "wallet_id": wallet_id}
+
+        if layout is not None:
+            bits, bit_length = layout(int.from_bytes(public_key, "big"), **kwargs)
+            full_bytes, rest = divmod(bit_length, 8)
+            # data cell with no refs: d1 = 0, d2, then the data with its completion tag
+            data_hash = sha256(
+                bytes((0, full_bytes * 2 + 1)) +
+                ((bits << (8 - rest)) | (1 << (7 - rest))).to_bytes(full_bytes + 1, "big")
+                if rest else
+                bytes((0, full_bytes * 2)) + bits.to_bytes(full_bytes, "big")
+            ).digest()
+            state_init_hash = state_init_hasher.copy()
+            state_init_hash.update(data_hash)
+            hash_part = state_init_hash.digest()
+        else:
+            data = wallet_class.create_data(public_key, **kwargs).serialize()
+            hash_part = code_cell.calculate_state_init_hash(data.hash, data.get_depth())
+
+        if tag is None:
+            address = "0:" + hash_part.hex()
+        else:
+            address = tag + hash_part
+            address = b64encode(address + crc16(address, 0).to_bytes(2, "big")).decode()
+
+        results.append(DerivedAddress(public_key.hex(), wallet_id, address))
+
+    return results
+
+
+class WalletAddressDeriver:
+    """
+    Derives basechain wallet addresses for many public keys and wallet IDs,
+    using all CPU cores.
+
+    Instead of creating a wallet object per address, the data cell of
+    the known wallet classes (see :data:`DATA_LAYOUTS`) is hashed directly
+    from its bits, and the constant part of the StateInit (code hash and depths)
+    is hashed once per chunk. Other wallet classes fall back to ``create_data``.
+
+    Wallet IDs are the ones passed to the wallet class constructor,
+    e.g. the subwallet ID for WalletV5R1.
+    """
+
+    def __init__(
+            self,
+            wallet_class: Type[Wallet],
+            workers: Optional[int] = None,
+            chunk_size: int = 20000,
+            is_user_friendly: bool = True,
+            is_bounceable: bool = True,
+            is_test_only: bool = False,
+            is_url_safe: bool = True,
+            **kwargs,
+    ) -> None:
+        """
+        Initialize the WalletAddressDeriver.
+
+        :param wallet_class: The wallet class, e.g. WalletV4R2.
+        :param workers: The number of worker processes. Defaults to the number of CPU cores.
+            With 1 worker the addresses are derived in the current process.
+        :param chunk_size: The number of addresses a worker derives per task. Defaults to 20000.
+        :param is_user_friendly: Whether addresses are user-friendly rather than raw. Defaults to True.
+        :param is_bounceable: Whether user-friendly addresses are bounceable. Defaults to True.
+        :param is_test_only: Whether user-friendly addresses are testnet only. Defaults to False.
+        :param is_url_safe: Whether user-friendly addresses are URL-safe. Defaults to True.
+        :param kwargs: Additional data fields of the wallet class (e.g. timeout for HighloadWalletV3,
+            network_global_id for WalletV5R1).
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive.")
+
+        self.wallet_class = wallet_class
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.is_url_safe = is_url_safe
+        self.options = kwargs
+
+        code_cell = CodeRegistry.get(wallet_class.CODE_HEX)
+        self._state_init_prefix = code_cell.state_init_prefix + b"\x00\x00" + code_cell.hash
+        self._tag = bytes((
+            (0x11 if is_bounceable else 0x51) | (0x80 if is_test_only else 0),
+            0x00,
+        )) if is_user_friendly else None
+
+    @staticmethod
+    def _pairs(
+            public_keys: Union[PublicKey, Iterable[PublicKey]],
+            wallet_ids: Union[Optional[int], Iterable[int]],
+    ) -> Iterator[Item]:
+        """
+        Pair the public keys with the wallet IDs. A single public key or wallet ID
+        is used with every item of the other argument, two iterables are zipped.
+        """
+        single_key = isinstance(public_keys, (bytes, str))
+        single_id = wallet_ids is None or isinstance(wallet_ids, int)
+
+        if single_key and single_id:
+            return iter([(public_keys, wallet_ids)])
+        if single_key:
+            return ((public_keys, wallet_id) for wallet_id in wallet_ids)
+        if single_id:
+            return ((public_key, wallet_ids) for public_key in public_keys)
+
+        return _strict_zip(public_keys, wallet_ids)
+
+    def _submit(self, executor: Optional[ProcessPoolExecutor], items: List[Item]) -> Union[Future, List]:
+        args = (
+            self.wallet_class,
+            self._state_init_prefix,
+            self._tag,
+            self.is_url_safe,
+            self.options,
+            items,
+        )
+        if executor is None:
+            return _derive_chunk(*args)
+
+        return executor.submit(_derive_chunk, *args)
+
+    def derive(
+            self,
+            public_keys: Union[PublicKey, Iterable[PublicKey]],
+            wallet_ids: Union[Optional[int], Iterable[int]] = None,
+    ) -> Iterator[DerivedAddress]:
+        """
+        Derive the wallet addresses, in the order of the input.
+
+        The input is consumed lazily and at most two chunks per worker
+        are in flight, so any number of addresses can be derived in flat memory.
+
+        :param public_keys: A public key or an iterable of public keys, as bytes or hex.
+        :param wallet_ids: A wallet ID or an iterable of wallet IDs, e.g. ``range(1000000)``.
+            Defaults to None (the default wallet ID of the wallet class).
+        :return: An iterator of DerivedAddress.
+        """
+        pairs = self._pairs(public_keys, wallet_ids)
+        chunks = iter(lambda: list(itertools.islice(pairs, self.chunk_size)), [])
+
+        if self.workers == 1:
+            for chunk in chunks:
+                yield from self._submit(None, chunk)
+            return
+
+        pending: Deque[Future] = deque()
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                for chunk in chunks:
+                    pending.append(self._submit(executor, chunk))
+
+                    if len(pending) >= self.workers * 2:
+                        yield from pending.popleft().result()
+
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def write_csv(
+            self,
+            path: str,
+            public_keys: Union[PublicKey, Iterable[PublicKey]],
+            wallet_ids: Union[Optional[int], Iterable[int]] = None,
+            header: bool = True,
+    ) -> int:
+        """
+        Derive the wallet addresses and stream them to a CSV file
+        with ``public_key,wallet_id,address`` rows.
+
+        :param path: The output file path.
+        :param public_keys: A public key or an iterable of public keys, as bytes or hex.
+        :param wallet_ids: A wallet ID or an iterable of wallet IDs.
+            Defaults to None (the default wallet ID of the wallet class).
+        :param header: Whether to write a header row. Defaults to True.
+        :return: The number of addresses written.
+        """
+        results = self.derive(public_keys, wallet_ids)
+        count = 0
+
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            if header:
+                writer.writerow(DerivedAddress._fields)
+
+            for chunk in iter(lambda: list(itertools.islice(results, self.chunk_size)), []):
+                writer.writerows(
+                    (result.public_key, "" if result.wallet_id is None else result.wallet_id, result.address)
+                    for result in chunk
+                )
+                count += len(chunk)
+
+        return count
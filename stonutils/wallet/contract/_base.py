@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import time
-from typing import Optional, List, Union, Tuple, Any
+from typing import Dict, Optional, List, Union, Tuple, Any
 
 from pytoniq_core import (
     Address,
@@ -28,15 +29,14 @@ from ..data import (
     SwapJettonToJettonData,
 )
 from ..op_codes import *
+from ..seqno import SeqnoManager
 from ...client import (
     Client,
-    LiteserverClient,
-    TonapiClient,
-    ToncenterClient,
+    ResultFormat,
 )
 from ...contract import Contract
 from ...exceptions import UnknownClientError
-from ...jetton import JettonMaster, JettonWallet
+from ...jetton import JettonMaster, JettonWallet, JettonWalletAddressResolver
 from ...jetton.dex.dedust import (
     Asset,
     Factory,
@@ -56,6 +56,7 @@ class Wallet(Contract):
     """
     A class representing a TON blockchain wallet.
     """
+    MAX_MESSAGES = 4
 
     def __init__(
             self,
@@ -77,9 +78,12 @@ class Wallet(Contract):
         self.public_key = public_key
         self.private_key = private_key
         self.wallet_id = wallet_id
+        self.seqno_manager: Optional[SeqnoManager] = None
+        self.jetton_resolver: Optional[JettonWalletAddressResolver] = None
+        self._jetton_wallet_addresses: Dict[str, Address] = {}
 
         self._data = self.create_data(public_key, wallet_id=wallet_id, **kwargs).serialize()
-        self._code = Cell.one_from_boc(self.CODE_HEX)
+        self._code = self.get_code_cell()
 
     @classmethod
     def create_data(cls, *args, **kwargs) -> Any:
@@ -125,7 +129,7 @@ class Wallet(Contract):
             - op_code: The operation code. Defaults to None.
         :return: The serialized message cell.
         """
-        assert len(messages) <= 4, 'For common wallet, maximum messages amount is 4'
+        assert len(messages) <= self.MAX_MESSAGES, f'For common wallet, maximum messages amount is {self.MAX_MESSAGES}'
 
         seqno = kwargs.get("seqno", None)
         wallet_id = kwargs.get("wallet_id", self.wallet_id)
@@ -294,11 +298,11 @@ class Wallet(Contract):
             method_name="seqno",
         )
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             seqno = int(method_result["decoded"]["state"] or 0)
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             seqno = int(method_result["stack"][0]["value"], 16)
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             seqno = int(method_result[0])
         else:
             raise UnknownClientError(client.__class__.__name__)
@@ -322,11 +326,11 @@ class Wallet(Contract):
             method_name="get_public_key",
         )
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             public_key = int(method_result["decoded"]["public_key"] or 0)
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             public_key = int(method_result["stack"][0]["value"], 16)
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             public_key = int(method_result[0])
         else:
             raise UnknownClientError(client.__class__.__name__)
@@ -349,6 +353,11 @@ class Wallet(Contract):
 
         seqno = kwargs.get("seqno", None)
 
+        if seqno is None and self.seqno_manager is not None:
+            kwargs.pop("seqno", None)
+            async with self.seqno_manager.reserve(kwargs.pop("valid_until", None)) as reservation:
+                return await self.create_raw_transfer_msg_b64(messages, **kwargs, **reservation._asdict())
+
         if seqno is None:
             try:
                 kwargs["seqno"] = await self.get_seqno(self.client, self.address)
@@ -383,6 +392,11 @@ class Wallet(Contract):
 
         seqno = kwargs.get("seqno", None)
 
+        if seqno is None and self.seqno_manager is not None:
+            kwargs.pop("seqno", None)
+            async with self.seqno_manager.reserve(kwargs.pop("valid_until", None)) as reservation:
+                return await self.raw_transfer(messages, **kwargs, **reservation._asdict())
+
         if seqno is None:
             try:
                 kwargs["seqno"] = await self.get_seqno(self.client, self.address)
@@ -457,6 +471,64 @@ class Wallet(Contract):
 
         return message_hash
 
+    def create_transfer_message(self, data: TransferData) -> WalletMessage:
+        """
+        Create the wallet message of a transfer.
+
+        :param data: The transfer data.
+        :return: The wallet message.
+        """
+        return self.create_wallet_internal_message(
+            destination=data.destination,
+            value=to_nano(data.amount),
+            body=data.body,
+            state_init=data.state_init,
+            **data.other,
+        )
+
+    def create_nft_transfer_message(self, data: TransferNFTData) -> WalletMessage:
+        """
+        Create the wallet message of an NFT transfer.
+
+        :param data: The NFT transfer data.
+        :return: The wallet message.
+        """
+        return self.create_wallet_internal_message(
+            destination=data.nft_address,
+            value=to_nano(data.amount),
+            body=NFTStandard.build_transfer_body(
+                new_owner_address=data.destination,
+                forward_payload=data.forward_payload,
+                forward_amount=to_nano(data.forward_amount),
+            ),
+            **data.other,
+        )
+
+    def create_jetton_transfer_message(
+            self,
+            data: TransferJettonData,
+            jetton_wallet_address: Union[Address, str],
+    ) -> WalletMessage:
+        """
+        Create the wallet message of a jetton transfer.
+
+        :param data: The jetton transfer data.
+        :param jetton_wallet_address: The address of the wallet's jetton wallet.
+        :return: The wallet message.
+        """
+        return self.create_wallet_internal_message(
+            destination=jetton_wallet_address,
+            value=to_nano(data.amount),
+            body=JettonWallet.build_transfer_body(
+                recipient_address=data.destination,
+                response_address=self.address,
+                jetton_amount=int(data.jetton_amount * (10 ** data.jetton_decimals)),
+                forward_payload=data.forward_payload,
+                forward_amount=to_nano(data.forward_amount),
+            ),
+            **data.other,
+        )
+
     async def batch_transfer(self, data_list: List[TransferData], **kwargs) -> str:
         """
         Perform a batch transfer operation.
@@ -464,15 +536,7 @@ class Wallet(Contract):
         :param data_list: The list of transfer data.
         :return: The hash of the batch transfer message.
         """
-        messages = [
-            self.create_wallet_internal_message(
-                destination=data.destination,
-                value=to_nano(data.amount),
-                body=data.body,
-                state_init=data.state_init,
-                **data.other,
-            ) for data in data_list
-        ]
+        messages = [self.create_transfer_message(data) for data in data_list]
 
         message_hash = await self.raw_transfer(messages=messages, **kwargs)
 
@@ -533,19 +597,7 @@ class Wallet(Contract):
         :param data_list: The list of NFT transfer data.
         :return: The hash of the batch NFT transfer message.
         """
-        messages = [
-            self.create_wallet_internal_message(
-                destination=data.nft_address,
-                value=to_nano(data.amount),
-                body=NFTStandard.build_transfer_body(
-                    new_owner_address=data.destination,
-                    forward_payload=data.forward_payload,
-                    forward_amount=to_nano(data.forward_amount),
-
-                ),
-                **data.other,
-            ) for data in data_list
-        ]
+        messages = [self.create_nft_transfer_message(data) for data in data_list]
 
         message_hash = await self.raw_transfer(messages=messages, **kwargs)
 
@@ -611,6 +663,42 @@ class Wallet(Contract):
 
         return message_hash
 
+    async def get_jetton_wallet_addresses(
+            self,
+            jetton_master_addresses: List[Union[Address, str]],
+    ) -> List[Address]:
+        """
+        Get the addresses of the wallet's jetton wallets.
+
+        Each master is looked up once, concurrently with the others, and
+        the results are memoized. Addresses are calculated locally when the
+        jetton wallet code is known, see :class:`JettonWalletAddressResolver`.
+
+        :param jetton_master_addresses: The jetton master addresses, possibly repeated.
+        :return: The jetton wallet addresses, in the order of the masters.
+        """
+        if self.jetton_resolver is None or self.jetton_resolver.client is not self.client:
+            self.jetton_resolver = JettonWalletAddressResolver(self.client)
+            self._jetton_wallet_addresses.clear()
+
+        keys = [
+            (Address(master) if isinstance(master, str) else master).to_str(is_user_friendly=False)
+            for master in jetton_master_addresses
+        ]
+        missing = [key for key in dict.fromkeys(keys) if key not in self._jetton_wallet_addresses]
+
+        if missing:
+            semaphore = asyncio.Semaphore(self.jetton_resolver.concurrency)
+
+            async def resolve(key: str) -> Address:
+                async with semaphore:
+                    return await self.jetton_resolver.get_wallet_address(self.address, key)
+
+            addresses = await asyncio.gather(*[resolve(key) for key in missing])
+            self._jetton_wallet_addresses.update(zip(missing, addresses))
+
+        return [self._jetton_wallet_addresses[key] for key in keys]
+
     async def batch_jetton_transfer(self, data_list: List[TransferJettonData], **kwargs) -> str:
         """
         Perform a batch jetton transfer operation.
@@ -618,31 +706,13 @@ class Wallet(Contract):
         :param data_list: The list of jetton transfer data.
         :return: The hash of the batch jetton transfer message.
         """
-        messages, jetton_master_address, jetton_wallet_address = [], None, None
-
-        for data in data_list:
-            if jetton_master_address is None or jetton_master_address != data.jetton_master_address:
-                jetton_master_address = data.jetton_master_address
-                jetton_wallet_address = await JettonMaster.get_wallet_address(
-                    client=self.client,
-                    owner_address=self.address.to_str(),
-                    jetton_master_address=jetton_master_address,
-                )
-
-            messages.append(
-                self.create_wallet_internal_message(
-                    destination=jetton_wallet_address,
-                    value=to_nano(data.amount),
-                    body=JettonWallet.build_transfer_body(
-                        recipient_address=data.destination,
-                        response_address=self.address,
-                        jetton_amount=int(data.jetton_amount * (10 ** data.jetton_decimals)),
-                        forward_payload=data.forward_payload,
-                        forward_amount=to_nano(data.forward_amount),
-                    ),
-                    **data.other,
-                )
-            )
+        jetton_wallet_addresses = await self.get_jetton_wallet_addresses(
+            [data.jetton_master_address for data in data_list]
+        )
+        messages = [
+            self.create_jetton_transfer_message(data, jetton_wallet_address)
+            for data, jetton_wallet_address in zip(data_list, jetton_wallet_addresses)
+        ]
 
         message_hash = await self.raw_transfer(messages=messages, **kwargs)
 
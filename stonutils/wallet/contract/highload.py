@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import itertools
 import time
-from typing import List, Optional, Tuple, Union
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
 from pytoniq_core import (
     Address,
@@ -24,14 +26,13 @@ from ..data import (
     HighloadWalletV3Data,
 )
 from ..op_codes import *
+from ..query_id import HighloadQueryIdAllocator
 from ...client import (
     Client,
-    LiteserverClient,
-    TonapiClient,
-    ToncenterClient,
+    ResultFormat,
 )
 from ...exceptions import UnknownClientError
-from ...utils import to_nano
+from ...utils import message_to_boc_hex, to_nano
 
 
 class HighloadWalletV2(Wallet):
@@ -40,6 +41,7 @@ class HighloadWalletV2(Wallet):
     """
 
     CODE_HEX = "b5ee9c720101090100e5000114ff00f4a413f4bcf2c80b010201200203020148040501eaf28308d71820d31fd33ff823aa1f5320b9f263ed44d0d31fd33fd3fff404d153608040f40e6fa131f2605173baf2a207f901541087f910f2a302f404d1f8007f8e16218010f4786fa5209802d307d43001fb009132e201b3e65b8325a1c840348040f4438ae63101c8cb1f13cb3fcbfff400c9ed54080004d03002012006070017bd9ce76a26869af98eb85ffc0041be5f976a268698f98e99fe9ff98fa0268a91040207a0737d098c92dbfc95dd1f140034208040f4966fa56c122094305303b9de2093333601926c21e2b3"  # noqa
+    MAX_MESSAGES = 254
 
     @classmethod
     def from_private_key(
@@ -96,7 +98,7 @@ class HighloadWalletV2(Wallet):
             - offset: The offset for generating the query ID. Defaults to 7200.
         :return: A Cell containing the raw transfer message.
         """
-        assert len(messages) <= 254, 'For highload wallet, maximum messages amount is 254'
+        assert len(messages) <= self.MAX_MESSAGES, f'For highload wallet, maximum messages amount is {self.MAX_MESSAGES}'
 
         wallet_id = kwargs.get("wallet_id", 698983191)
         query_id = kwargs.get("query_id", 0)
@@ -136,6 +138,9 @@ class HighloadWalletV3(Wallet):
     """
 
     CODE_HEX = "b5ee9c7241021001000228000114ff00f4a413f4bcf2c80b01020120020d02014803040078d020d74bc00101c060b0915be101d0d3030171b0915be0fa4030f828c705b39130e0d31f018210ae42e5a4ba9d8040d721d74cf82a01ed55fb04e030020120050a02027306070011adce76a2686b85ffc00201200809001aabb6ed44d0810122d721d70b3f0018aa3bed44d08307d721d70b1f0201200b0c001bb9a6eed44d0810162d721d70b15800e5b8bf2eda2edfb21ab09028409b0ed44d0810120d721f404f404d33fd315d1058e1bf82325a15210b99f326df82305aa0015a112b992306dde923033e2923033e25230800df40f6fa19ed021d721d70a00955f037fdb31e09130e259800df40f6fa19cd001d721d70a00937fdb31e0915be270801f6f2d48308d718d121f900ed44d0d3ffd31ff404f404d33fd315d1f82321a15220b98e12336df82324aa00a112b9926d32de58f82301de541675f910f2a106d0d31fd4d307d30cd309d33fd315d15168baf2a2515abaf2a6f8232aa15250bcf2a304f823bbf2a35304800df40f6fa199d024d721d70a00f2649130e20e01fe5309800df40f6fa18e13d05004d718d20001f264c858cf16cf8301cf168e1030c824cf40cf8384095005a1a514cf40e2f800c94039800df41704c8cbff13cb1ff40012f40012cb3f12cb15c9ed54f80f21d0d30001f265d3020171b0925f03e0fa4001d70b01c000f2a5fa4031fa0031f401fa0031fa00318060d721d300010f0020f265d2000193d431d19130e272b1fb00b585bf03"  # noqa
+    MAX_MESSAGES = 254 * 254
+    MAX_EXTERNAL_MESSAGE_SIZE = 65535
+    MAX_EXTERNAL_MESSAGE_DEPTH = 512
 
     def __init__(
             self,
@@ -147,6 +152,7 @@ class HighloadWalletV3(Wallet):
             **kwargs,
     ) -> None:
         self.timeout = timeout
+        self.query_id_allocator: Optional[HighloadQueryIdAllocator] = None
         super().__init__(client, public_key, private_key, wallet_id, **kwargs)
 
     @classmethod
@@ -171,11 +177,11 @@ class HighloadWalletV3(Wallet):
             method_name="get_timeout",
         )
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             timeout = int(method_result["stack"][0]["num"], 16)
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             timeout = int(method_result["stack"][0]["value"], 16)
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             timeout = int(method_result[0])
         else:
             raise UnknownClientError(client.__class__.__name__)
@@ -202,11 +208,11 @@ class HighloadWalletV3(Wallet):
             stack=[query_id, -1 if need_clean else 0],
         )
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             processed = int(method_result["stack"][0]["num"], 16)
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             processed = int(method_result["stack"][0]["value"], 16)
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             processed = int(method_result[0])
         else:
             raise UnknownClientError(client.__class__.__name__)
@@ -226,11 +232,11 @@ class HighloadWalletV3(Wallet):
             method_name="get_last_clean_time",
         )
 
-        if isinstance(client, TonapiClient):
+        if client.result_format is ResultFormat.TONAPI:
             get_last_clean_time = int(method_result["stack"][0]["num"], 16)
-        elif isinstance(client, ToncenterClient):
+        elif client.result_format is ResultFormat.TONCENTER:
             get_last_clean_time = int(method_result["stack"][0]["value"], 16)
-        elif isinstance(client, LiteserverClient):
+        elif client.result_format is ResultFormat.LITESERVER:
             get_last_clean_time = int(method_result[0])
         else:
             raise UnknownClientError(client.__class__.__name__)
@@ -330,17 +336,24 @@ class HighloadWalletV3(Wallet):
         :param messages: A list of WalletMessage instances to be transferred.
         :param kwargs: Additional optional parameters:
             - send_mode: The send mode for the message. Defaults to 3.
-            - query_id: The query ID for the transaction. If not provided, it will be calculated.
+            - query_id: The query ID for the transaction. If not provided, it is taken from
+              query_id_allocator if one is attached, otherwise calculated from created_at.
             - created_at: Timestamp when the message was created. Defaults to current time minus 30 seconds.
             - timeout: Timeout for the message. Defaults to the wallet's timeout.
         :return: A Cell object containing the raw transfer message.
         """
         created_at = kwargs.get("created_at", None) or int(time.time() - 30)
-        query_id = kwargs.get("query_id", None) or created_at % (1 << 23)
+        query_id = kwargs.get("query_id", None)
         timeout = kwargs.get("timeout", None) or self.timeout
         send_mode = kwargs.get("send_mode", None) or 3
 
-        assert len(messages) <= 254 * 254, "For highload wallet v3, maximum messages amount is 254*254."
+        if query_id is None:
+            if self.query_id_allocator is not None:
+                query_id = self.query_id_allocator.allocate()
+            else:
+                query_id = created_at % (1 << 23)
+
+        assert len(messages) <= self.MAX_MESSAGES, f"For highload wallet v3, maximum messages amount is {self.MAX_MESSAGES}."
         assert created_at > 0, "Created at timestamp should be positive."
         assert query_id < (1 << 23), "Query ID is too large."
         assert timeout < (1 << 22), "Timeout is too long."
@@ -374,54 +387,165 @@ class HighloadWalletV3(Wallet):
 
     def pack_actions(
             self,
-            messages: List[WalletMessage],
+            messages: Iterable[WalletMessage],
             query_id: int,
             send_mode: int = 3,
     ) -> WalletMessage:
         """
-        Packs a list of wallet messages into a single message.
+        Packs wallet messages into a single message.
 
-        :param messages: A list of WalletMessage instances to pack.
+        The messages are read 253 at a time and every chunk is packed right away
+        into a level of the chain: up to 253 messages and an internal message
+        to the wallet itself carrying the levels packed before it. Only the
+        last packed level is kept, so the input can be any iterable.
+        The last chunk becomes the outermost level, so chunks are sent
+        in reverse order, and the messages of a chunk in their order.
+
+        :param messages: An iterable of WalletMessage instances to pack.
         :param query_id: The query ID for the transaction.
         :param send_mode: The send mode for the message. Defaults to 3.
         :return: A WalletMessage instance containing the packed messages.
         """
         message_per_pack = 253
 
-        if len(messages) > message_per_pack:
-            rest = self.pack_actions(messages[message_per_pack:], query_id, send_mode)
-            messages = messages[:message_per_pack] + [rest]
+        iterator = iter(messages)
+        chunk = list(itertools.islice(iterator, message_per_pack))
+        packed: Optional[WalletMessage] = None
+
+        while True:
+            list_cell, value = Cell.empty(), 0
+
+            for msg in itertools.chain(chunk, (packed,) if packed is not None else ()):
+                value += msg.message.info.value.grams
+                # out_list node: previous node ref, then action_send_msg written in place
+                list_cell = (
+                    begin_cell()
+                    .store_ref(list_cell)
+                    .store_uint(ACTION_SEND_MSG_OPCODE, 32)
+                    .store_uint(msg.send_mode, 8)
+                    .store_ref(msg.message.serialize())
+                    .end_cell()
+                )
+
+            packed = self.create_wallet_internal_message(
+                destination=self.address,
+                send_mode=send_mode,
+                value=value,
+                body=(
+                    begin_cell()
+                    .store_uint(INTERNAL_TRANSFER_OPCODE, 32)
+                    .store_uint(query_id, 64)
+                    .store_ref(list_cell)
+                    .end_cell()
+                )
+            )
 
-        list_cell, value = Cell.empty(), 0
+            chunk = list(itertools.islice(iterator, message_per_pack))
+            if not chunk:
+                return packed
 
-        for msg in messages:
-            value += msg.message.info.value.grams
-            msg = (
-                begin_cell()
-                .store_uint(ACTION_SEND_MSG_OPCODE, 32)
-                .store_uint(msg.send_mode, 8)
-                .store_ref(msg.message.serialize())
-                .end_cell()
-            )
-            list_cell = (
-                begin_cell()
-                .store_ref(list_cell)
-                .store_cell(msg)
-                .end_cell()
-            )
+    def raw_create_transfer_msgs(
+            self,
+            messages: Iterable[WalletMessage],
+            send_mode: Optional[int] = None,
+            query_id: Optional[int] = None,
+            created_at: Optional[int] = None,
+            timeout: Optional[int] = None,
+    ) -> Iterator[Tuple[MessageAny, int]]:
+        """
+        Create as many signed external messages as needed to send the messages.
 
-        return self.create_wallet_internal_message(
-            destination=self.address,
-            send_mode=send_mode,
-            value=value,
-            body=(
-                begin_cell()
-                .store_uint(INTERNAL_TRANSFER_OPCODE, 32)
-                .store_uint(query_id, 64)
-                .store_ref(list_cell)
-                .end_cell()
-            )
-        )
+        Each external message carries as many messages as fit into the network limits
+        on external message size and depth (see :attr:`MAX_EXTERNAL_MESSAGE_SIZE`
+        and :attr:`MAX_EXTERNAL_MESSAGE_DEPTH`). The messages are consumed lazily.
+        Every external message after the first needs its own query ID, so
+        a query_id_allocator must be attached unless the messages fit into one.
+
+        :param messages: An iterable of WalletMessage instances to be transferred.
+        :param send_mode: The send mode. Defaults to 3.
+        :param query_id: The query ID of the first external message. If not provided, it will be calculated.
+        :param created_at: Timestamp when the messages were created. Defaults to current time minus 30 seconds.
+        :param timeout: Timeout for the messages. Defaults to the wallet's timeout.
+        :return: An iterator of (external message, number of messages it carries) pairs.
+        """
+        iterator = iter(messages)
+        chunk: List[WalletMessage] = []
+        # about as many plain transfers as fit into one external message,
+        # later chunks are sized by the space the messages actually take
+        chunk_size = 1024
+        created_at = created_at or int(time.time() - 30)
+        first = True
+
+        while True:
+            chunk.extend(itertools.islice(iterator, max(0, chunk_size - len(chunk))))
+            if not chunk:
+                return
+
+            if query_id is None and self.query_id_allocator is not None:
+                query_id = self.query_id_allocator.allocate()
+            elif not first and self.query_id_allocator is None:
+                raise ValueError("A query_id_allocator is required to send the messages in several external messages.")
+
+            count = len(chunk)
+
+            while True:
+                body = self.raw_create_transfer_msg(
+                    private_key=self.private_key,
+                    messages=chunk[:count] if count < len(chunk) else chunk,
+                    send_mode=send_mode,
+                    query_id=query_id,
+                    created_at=created_at,
+                    timeout=timeout,
+                )
+                message = self.create_external_msg(dest=self.address, body=body)
+                message_cell = message.serialize()
+                size = len(message_cell.to_boc())
+                depth = message_cell.get_depth()
+
+                # messages take about the same space, aim a little below the size limit
+                estimate = max(1, min(self.MAX_MESSAGES, count * self.MAX_EXTERNAL_MESSAGE_SIZE * 9 // (size * 10)))
+
+                if size <= self.MAX_EXTERNAL_MESSAGE_SIZE and depth <= self.MAX_EXTERNAL_MESSAGE_DEPTH:
+                    break
+                if count == 1:
+                    raise ValueError("A single message exceeds the external message limits.")
+
+                count = min(count - 1, estimate if depth <= self.MAX_EXTERNAL_MESSAGE_DEPTH else count // 2)
+
+            yield message, count
+
+            del chunk[:count]
+            chunk_size = estimate
+            query_id = None
+            first = False
+
+    async def raw_transfer_chunked(
+            self,
+            messages: Iterable[WalletMessage],
+            send_mode: Optional[int] = None,
+            query_id: Optional[int] = None,
+            created_at: Optional[int] = None,
+            timeout: Optional[int] = None,
+    ) -> List[Tuple[str, int]]:
+        """
+        Perform a transfer of any number of messages, split into as many
+        external messages as the network limits require.
+
+        All external messages are built and signed before the first is sent.
+
+        :param messages: An iterable of WalletMessage instances to be transferred.
+        :param send_mode: The send mode. Defaults to 3.
+        :param query_id: The query ID of the first external message. If not provided, it will be calculated.
+        :param created_at: Timestamp when the messages were created. Defaults to current time minus 30 seconds.
+        :param timeout: Timeout for the messages. Defaults to the wallet's timeout.
+        :return: A list of (message hash, number of messages it carries) pairs, in the order of the messages.
+        """
+        externals = list(self.raw_create_transfer_msgs(messages, send_mode, query_id, created_at, timeout))
+        encoded = [(message_to_boc_hex(message), count) for message, count in externals]
+
+        await asyncio.gather(*[self.client.send_message(boc_hex) for (boc_hex, _), _ in encoded])
+
+        return [(message_hash, count) for (_, message_hash), count in encoded]
 
     async def transfer(
             self,
@@ -23,6 +23,7 @@ class PreprocessedWalletV2(Wallet):
     A class representing a preprocessed wallet V2 in the TON blockchain.
     """
     CODE_HEX = "b5ee9c7241010101003d000076ff00ddd40120f90001d0d33fd30fd74ced44d0d3ffd70b0f20a4830fa90822c8cbffcb0fc9ed5444301046baf2a1f823bef2a2f910f2a3f800ed552e766412"  # noqa
+    MAX_MESSAGES = 255
 
     def __init__(
             self,
@@ -124,7 +125,7 @@ class PreprocessedWalletV2(Wallet):
             messages: List[WalletMessage],
             **kwargs,
     ) -> Cell:
-        assert len(messages) <= 255, 'For preprocessed wallet v2, maximum messages amount is 255'
+        assert len(messages) <= self.MAX_MESSAGES, f'For preprocessed wallet v2, maximum messages amount is {self.MAX_MESSAGES}'
 
         seqno = kwargs.get("seqno", 0)
         valid_until = kwargs.get("valid_until", int(time.time()) + 3600)
@@ -151,6 +152,7 @@ class PreprocessedWalletV2R1(Wallet):
     A class representing a preprocessed wallet V2 R1 in the TON blockchain.
     """
     CODE_HEX = "b5ee9c7241010101003c000074ff00ddd40120f90001d0d33fd30fd74ced44d0d3ffd70b0f20a4a9380f22c8cbffcb0fc9ed5444301046baf2a1f823bef2a2f910f2a3f800ed55d91c357f"  # noqa
+    MAX_MESSAGES = 255
 
     def __init__(
             self,
@@ -252,7 +254,7 @@ class PreprocessedWalletV2R1(Wallet):
             messages: List[WalletMessage],
             **kwargs,
     ) -> Cell:
-        assert len(messages) <= 255, 'For preprocessed wallet v2 r1, maximum messages amount is 255'
+        assert len(messages) <= self.MAX_MESSAGES, f'For preprocessed wallet v2 r1, maximum messages amount is {self.MAX_MESSAGES}'
 
         seqno = kwargs.get("seqno", 0)
         valid_until = kwargs.get("valid_until", int(time.time()) + 3600)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from pytoniq_core import Address, Cell, Slice
+
+from .contract import HighloadWalletV3
+from .query_id import BIT_NUMBER_SIZE
+from ..client import Client
+
+KEY_SIZE = 13
+
+
+class ProcessedQueryTracker:
+    """
+    Waits until the messages of a highload wallet V3 are processed.
+
+    Instead of calling the `processed?` get method once per query ID,
+    all outstanding query IDs are checked together: the wallet account
+    is fetched once per poll and the processed query bitmaps stored
+    in its data are read locally. If the data cannot be parsed, the get
+    method is called for the outstanding query IDs concurrently, which
+    the client batches and coalesces where the backend allows.
+    """
+
+    def __init__(
+            self,
+            client: Client,
+            address: Union[Address, str],
+            poll_interval: float = 2.0,
+    ) -> None:
+        """
+        Initialize the ProcessedQueryTracker.
+
+        :param client: The client to use.
+        :param address: The address of the highload wallet V3.
+        :param poll_interval: Seconds between polls while query IDs are outstanding. Defaults to 2.
+        """
+        if isinstance(address, str):
+            address = Address(address)
+
+        self.client = client
+        self.address = address
+        self.poll_interval = poll_interval
+
+        self._waiters: Dict[int, List[asyncio.Future]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_wallet(cls, wallet: HighloadWalletV3, poll_interval: float = 2.0) -> ProcessedQueryTracker:
+        """
+        Create a tracker for the wallet, using its client.
+        """
+        return cls(wallet.client, wallet.address, poll_interval)
+
+    @staticmethod
+    def _is_marked(value: Slice, bit_number: int) -> bool:
+        """
+        Read the bit of a query ID from a dictionary value: a reference
+        to a bitmap cell with one bit per query ID of the shift.
+        """
+        if value.remaining_bits != 0 or value.remaining_refs != 1:
+            raise ValueError(
+                f"Unexpected processed queries value: {value.remaining_bits} bits, {value.remaining_refs} refs."
+            )
+
+        bitmap = value.load_ref().begin_parse()
+        if bitmap.remaining_refs != 0 or bitmap.remaining_bits <= bit_number:
+            raise ValueError(
+                f"Unexpected processed queries bitmap: {bitmap.remaining_bits} bits, {bitmap.remaining_refs} refs."
+            )
+
+        return bool(bitmap.skip_bits(bit_number).preload_uint(1))
+
+    @classmethod
+    def parse_processed(cls, data: Cell, query_ids: Iterable[int]) -> Set[int]:
+        """
+        Find which of the query IDs are marked as processed in the wallet data.
+
+        The data is laid out as public_key(256) wallet_id(32) old_queries(dict)
+        queries(dict) last_clean_time(64) timeout(22).
+
+        :param data: The data cell of the highload wallet V3.
+        :param query_ids: The query IDs to look up.
+        :return: The processed query IDs.
+        :raises ValueError: If the data is not laid out as expected.
+        """
+        cs = data.begin_parse().skip_bits(256 + 32)
+        old_queries = cs.load_dict(KEY_SIZE) or {}
+        queries = cs.load_dict(KEY_SIZE) or {}
+
+        if cs.remaining_bits != 64 + 22 or cs.remaining_refs != 0:
+            raise ValueError("Unexpected highload wallet V3 data layout.")
+
+        processed = set()
+
+        for query_id in query_ids:
+            shift, bit_number = query_id >> BIT_NUMBER_SIZE, query_id & ((1 << BIT_NUMBER_SIZE) - 1)
+
+            for bitmaps in (old_queries, queries):
+                value = bitmaps.get(shift)
+                if value is not None and cls._is_marked(value.copy(), bit_number):
+                    processed.add(query_id)
+                    break
+
+        return processed
+
+    async def _poll_get_method(self, query_ids: List[int]) -> Set[int]:
+        results = await asyncio.gather(*[
+            HighloadWalletV3.get_processed(self.client, self.address, query_id, False)
+            for query_id in query_ids
+        ])
+        return {query_id for query_id, processed in zip(query_ids, results) if processed}
+
+    async def poll(self) -> Set[int]:
+        """
+        Check the outstanding query IDs once and resolve the processed ones.
+
+        :return: The query IDs found processed by this poll.
+        """
+        query_ids = list(self._waiters)
+        if not query_ids:
+            return set()
+
+        account = await self.client.get_raw_account(self.address.to_str())
+
+        try:
+            processed = self.parse_processed(account.data, query_ids) if account.data is not None else set()
+        except Exception:
+            # data laid out differently: ask the wallet itself
+            processed = await self._poll_get_method(query_ids)
+
+        for query_id in processed:
+            for future in self._waiters.pop(query_id, []):
+                if not future.done():
+                    future.set_result(True)
+
+        return processed
+
+    async def _run(self) -> None:
+        while self._waiters:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # transient network errors: try again on the next poll
+                pass
+
+            if self._waiters:
+                await asyncio.sleep(self.poll_interval)
+
+    async def wait_processed(self, query_id: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the message with the query ID is processed by the wallet.
+
+        :param query_id: The query ID of the message.
+        :param timeout: The maximum time to wait in seconds. Defaults to None (no limit).
+        :return: True if the message was processed, False if the timeout passed first.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(query_id, []).append(future)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters = self._waiters.get(query_id)
+            if waiters is not None and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[query_id]
+
+    async def close(self) -> None:
+        """
+        Stop polling. Outstanding waits are cancelled.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        for waiters in self._waiters.values():
+            for future in waiters:
+                future.cancel()
+        self._waiters.clear()
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..exceptions import TonutilsException
+
+BIT_NUMBER_SIZE = 10
+MAX_BIT_NUMBER = (1 << BIT_NUMBER_SIZE) - 2
+MAX_SHIFT = (1 << 13) - 1
+
+
+class QueryIdExhaustedError(TonutilsException):
+    """
+    Exception raised when every query ID of a highload wallet V3 was used
+    within the reuse window and none can be allocated safely.
+    """
+
+    def __init__(self, retry_after: float) -> None:
+        self.retry_after = retry_after
+        super().__init__(
+            f"All query IDs were used recently, the next one can be reused in {retry_after:.0f}s."
+        )
+
+
+class QueryIdStore:
+    """
+    Base class of query ID allocator state storages.
+    """
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the saved state, or None.
+        """
+        raise NotImplementedError
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """
+        Save the state.
+        """
+        raise NotImplementedError
+
+
+class FileQueryIdStore(QueryIdStore):
+    """
+    Stores the allocator state in a JSON file, replaced atomically on every save.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the FileQueryIdStore.
+
+        :param path: The file path. Created if it does not exist.
+        """
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path) as f:
+            return json.load(f)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary_path, self.path)
+
+
+class SqliteQueryIdStore(QueryIdStore):
+    """
+    Stores the allocator state in an SQLite database, so the states
+    of several wallets can share one file.
+    """
+
+    def __init__(self, path: str, key: str) -> None:
+        """
+        Initialize the SqliteQueryIdStore.
+
+        :param path: The database file path. Created if it does not exist.
+        :param key: The key of the state in the database, e.g. the wallet address.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.key = key
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS highload_query_ids ("
+            "key TEXT PRIMARY KEY, "
+            "state TEXT NOT NULL)"
+        )
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT state FROM highload_query_ids WHERE key = ?",
+                (self.key,),
+            ).fetchone()
+
+        return json.loads(row[0]) if row is not None else None
+
+    def save(self, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO highload_query_ids VALUES (?, ?)",
+                (self.key, json.dumps(state)),
+            )
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+class HighloadQueryIdAllocator:
+    """
+    Allocates unique query IDs for a highload wallet V3.
+
+    A query ID is 23 bits: a 13-bit shift and a 10-bit bit number.
+    IDs are handed out in sequence (bit number first, then shift), which gives
+    about 8.4 million IDs before the sequence wraps around.
+
+    The wallet remembers a processed query ID for up to two timeouts, and
+    a message is valid for one timeout after it is created. So a shift is reused
+    only if it was last used more than ``3 * timeout`` seconds ago.
+    Otherwise :class:`QueryIdExhaustedError` is raised.
+
+    Allocation is thread-safe. With a store, the position is saved
+    ``reserve_ahead`` IDs in advance, and a restarted process continues after the
+    saved position. IDs reserved but not used before a restart are skipped.
+
+    Attach it to a wallet with ``wallet.query_id_allocator = HighloadQueryIdAllocator(wallet.timeout)``.
+    """
+
+    def __init__(
+            self,
+            timeout: int = 60 * 5,
+            store: Optional[QueryIdStore] = None,
+            reserve_ahead: int = 100,
+    ) -> None:
+        """
+        Initialize the HighloadQueryIdAllocator.
+
+        :param timeout: The timeout of the wallet in seconds. Defaults to 300.
+        :param store: Optional storage the position is saved to and restored from.
+        :param reserve_ahead: The number of IDs reserved by each save. Defaults to 100.
+        """
+        if not 0 < reserve_ahead <= MAX_BIT_NUMBER:
+            raise ValueError(f"reserve_ahead must be between 1 and {MAX_BIT_NUMBER}.")
+
+        self.timeout = timeout
+        self.store = store
+        self.reserve_ahead = reserve_ahead
+
+        self._lock = threading.Lock()
+        self._shift = 0
+        self._bit_number = 0
+        self._reserved = 0
+        self._shift_used_at: Dict[int, float] = {}
+
+        if store is not None:
+            self._restore(store.load())
+
+    @staticmethod
+    def to_query_id(shift: int, bit_number: int) -> int:
+        """
+        Combine a shift and a bit number into a query ID.
+        """
+        return (shift << BIT_NUMBER_SIZE) | bit_number
+
+    @staticmethod
+    def from_query_id(query_id: int) -> Tuple[int, int]:
+        """
+        Split a query ID into its shift and bit number.
+        """
+        return query_id >> BIT_NUMBER_SIZE, query_id & ((1 << BIT_NUMBER_SIZE) - 1)
+
+    @property
+    def reuse_after(self) -> float:
+        """
+        The time in seconds after which a shift can be reused.
+        """
+        return 3 * self.timeout
+
+    def _restore(self, state: Optional[Dict[str, Any]]) -> None:
+        if state is None:
+            return
+
+        self._shift, self._bit_number = state["shift"], state["bit_number"]
+        self._shift_used_at = {int(shift): used_at for shift, used_at in state["shift_used_at"].items()}
+
+        # reserved IDs may have been used until now
+        self._shift_used_at[self._shift] = time.time()
+
+    def _save(self) -> None:
+        # a reservation never crosses a shift, so a restored allocator checks the next shift before using it
+        bit_number = min(self._bit_number + self.reserve_ahead, MAX_BIT_NUMBER + 1)
+
+        # shifts outside the reuse window need not be remembered
+        oldest = time.time() - self.reuse_after
+        self._shift_used_at = {s: t for s, t in self._shift_used_at.items() if t > oldest}
+
+        self.store.save({
+            "shift": self._shift,
+            "bit_number": bit_number,
+            "shift_used_at": {str(s): t for s, t in self._shift_used_at.items()},
+        })
+        self._reserved = bit_number - self._bit_number
+
+    def allocate(self) -> int:
+        """
+        Allocate the next query ID.
+
+        :return: The query ID.
+        :raises QueryIdExhaustedError: If the next shift was used within the reuse window.
+        """
+        with self._lock:
+            if self._bit_number > MAX_BIT_NUMBER:
+                shift = (self._shift + 1) % (MAX_SHIFT + 1)
+                used_at = self._shift_used_at.get(shift)
+                if used_at is not None and time.time() - used_at < self.reuse_after:
+                    raise QueryIdExhaustedError(used_at + self.reuse_after - time.time())
+
+                self._shift, self._bit_number, self._reserved = shift, 0, 0
+
+            if self.store is not None:
+                if self._reserved == 0:
+                    self._save()
+                self._reserved -= 1
+
+            query_id = self.to_query_id(self._shift, self._bit_number)
+            self._shift_used_at[self._shift] = time.time()
+            self._bit_number += 1
+
+            return query_id
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, NamedTuple, Optional
+
+from ..account import AccountStatus
+
+if TYPE_CHECKING:
+    from .contract import Wallet
+
+
+class SeqnoReservation(NamedTuple):
+    """
+    A seqno reserved for one external message.
+
+    :param seqno: The sequence number to sign the message with.
+    :param valid_until: The expiration time to sign the message with.
+    """
+    seqno: int
+    valid_until: int
+
+
+class SeqnoManager:
+    """
+    Tracks the seqno of a wallet locally, so back-to-back transfers
+    do not read it from the network before each message.
+
+    The seqno is fetched once and then incremented under an asyncio lock
+    for every message sent. The lock is held while the message is built
+    and sent, so messages leave in seqno order. A message that failed
+    to send does not consume its seqno. A wallet that is not deployed yet
+    starts at 0, any other failure to fetch the seqno is raised.
+
+    After the last sent message expires, the seqno is reconciled with
+    the chain in the background: if a message was not processed, the
+    local seqno falls back to the one stored on chain.
+    Call :meth:`reconcile` when a confirmation fails to do it right away.
+
+    Attach it to a wallet with ``wallet.seqno_manager = SeqnoManager(wallet)``.
+    """
+
+    def __init__(
+            self,
+            wallet: Wallet,
+            valid_for: int = 60,
+            reconcile_delay: float = 10,
+    ) -> None:
+        """
+        Initialize the SeqnoManager.
+
+        :param wallet: The wallet sending the messages.
+        :param valid_for: Seconds a message is valid for when no valid_until is given. Defaults to 60.
+        :param reconcile_delay: Seconds after the last message expires before the seqno
+            is reconciled with the chain. Defaults to 10.
+        """
+        self.wallet = wallet
+        self.valid_for = valid_for
+        self.reconcile_delay = reconcile_delay
+
+        self._lock = asyncio.Lock()
+        self._seqno: Optional[int] = None
+        self._generation = 0
+        self._expires_at = 0.0
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+    @property
+    def seqno(self) -> Optional[int]:
+        """
+        The seqno of the next message, or None if it has not been fetched yet.
+        """
+        return self._seqno
+
+    async def _fetch(self) -> int:
+        try:
+            return await self.wallet.get_seqno(self.wallet.client, self.wallet.address)
+        except Exception:
+            # the seqno get method fails on a wallet that is not deployed yet, whose seqno is 0,
+            # any other failure must not be mistaken for it
+            raw_account = await self.wallet.client.get_raw_account(self.wallet.address.to_str())
+            if raw_account.status in (AccountStatus.uninit, AccountStatus.nonexist):
+                return 0
+            raise
+
+    @asynccontextmanager
+    async def reserve(self, valid_until: Optional[int] = None) -> AsyncIterator[SeqnoReservation]:
+        """
+        Reserve the next seqno for the duration of the block building and sending
+        the message. The seqno is consumed only if the block exits without an exception.
+
+        :param valid_until: The expiration time of the message.
+            Defaults to the current time plus ``valid_for``.
+        :return: A SeqnoReservation.
+        """
+        async with self._lock:
+            if self._seqno is None:
+                self._seqno = await self._fetch()
+
+            if valid_until is None:
+                valid_until = int(time.time()) + self.valid_for
+
+            try:
+                yield SeqnoReservation(self._seqno, valid_until)
+            except BaseException:
+                # the message may have reached the network: read the seqno again next time
+                self._seqno = None
+                raise
+
+            self._seqno += 1
+            self._generation += 1
+            self._expires_at = max(self._expires_at, valid_until + self.reconcile_delay)
+            self._schedule_reconcile()
+
+    def invalidate(self) -> None:
+        """
+        Drop the local seqno, so it is fetched from the chain before the next message.
+        """
+        self._seqno = None
+
+    async def reconcile(self) -> int:
+        """
+        Replace the local seqno with the one stored on chain.
+
+        Messages that are sent but not processed yet must be expired,
+        otherwise their seqno is reused.
+
+        :return: The seqno of the next message.
+        """
+        async with self._lock:
+            self._seqno = await self._fetch()
+            return self._seqno
+
+    def _schedule_reconcile(self) -> None:
+        if self._reconcile_task is None or self._reconcile_task.done():
+            self._reconcile_task = asyncio.ensure_future(self._reconcile_after_expiry())
+
+    async def _reconcile_after_expiry(self) -> None:
+        while True:
+            delay = self._expires_at - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            generation = self._generation
+            try:
+                seqno = await self._fetch()
+            except Exception:
+                # keep the local seqno, the next message schedules another attempt
+                return
+
+            async with self._lock:
+                # a message sent meanwhile may not be processed yet
+                if generation == self._generation and self._expires_at <= time.time():
+                    self._seqno = seqno
+                    return
+
+    async def close(self) -> None:
+        """
+        Stop the background reconciliation.
+        """
+        if self._reconcile_task is not None and not self._reconcile_task.done():
+            self._reconcile_task.cancel()
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
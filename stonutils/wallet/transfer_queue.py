@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from typing import Any, List, Optional, Set, Tuple, Union
+
+from pytoniq_core import WalletMessage
+
+from .contract import HighloadWalletV2, HighloadWalletV3, Wallet
+from .data import TransferData, TransferJettonData, TransferNFTData
+from .seqno import SeqnoManager
+
+TransferItem = Union[TransferData, TransferJettonData, TransferNFTData]
+
+
+class TransferQueue:
+    """
+    Collects single transfers and sends them from a wallet in batches.
+
+    A batch is sent when it holds as many messages as the wallet accepts
+    in one external message (:attr:`Wallet.MAX_MESSAGES`: 4 for v3/v4,
+    255 for v5 and preprocessed wallets, 254 * 254 for highload wallet v3)
+    or ``max_delay`` seconds after its first transfer, whichever comes first.
+    Each transfer resolves with the hash of the external message that carried it.
+    Highload wallet V3 batches are split into as many external messages
+    as the network limits require, which needs a query ID allocator attached
+    to the wallet (see :meth:`HighloadWalletV3.raw_transfer_chunked`).
+
+    Jetton wallet addresses are resolved with
+    :meth:`Wallet.get_jetton_wallet_addresses` and memoized by the wallet.
+
+    Batches are sent one at a time, in order. A batch is sent before the
+    previous one lands, so seqno based wallets need a :class:`SeqnoManager`
+    to sign consecutive batches with consecutive seqnos: if none is attached
+    to the wallet, the queue attaches one and detaches it on :meth:`close`.
+    """
+
+    def __init__(
+            self,
+            wallet: Wallet,
+            max_delay: float = 1.0,
+            max_batch_size: Optional[int] = None,
+            **kwargs,
+    ) -> None:
+        """
+        Initialize the TransferQueue.
+
+        :param wallet: The wallet sending the transfers.
+        :param max_delay: The maximum time in seconds a transfer waits for other transfers. Defaults to 1.
+        :param max_batch_size: The maximum number of messages in a batch.
+            Defaults to the wallet capacity.
+        :param kwargs: Additional arguments passed to ``raw_transfer`` (e.g. timeout for highload wallets).
+        """
+        capacity = wallet.MAX_MESSAGES
+        if max_batch_size is not None:
+            if max_batch_size < 1:
+                raise ValueError("max_batch_size must be positive.")
+            capacity = min(capacity, max_batch_size)
+
+        self.wallet = wallet
+        self.max_delay = max_delay
+        self.max_batch_size = capacity
+        self.transfer_kwargs = kwargs
+
+        self._pending: List[Tuple[TransferItem, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+        # reading the seqno from chain before each batch would reuse the seqno of the previous one
+        self._owned_seqno_manager: Optional[SeqnoManager] = None
+        if not isinstance(wallet, (HighloadWalletV2, HighloadWalletV3)) and wallet.seqno_manager is None:
+            self._owned_seqno_manager = wallet.seqno_manager = SeqnoManager(wallet)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def put(self, data: TransferItem) -> str:
+        """
+        Add a transfer to the current batch and wait until the batch is sent.
+
+        :param data: The transfer, jetton transfer or NFT transfer data.
+        :return: The hash of the external message carrying the transfer.
+        """
+        if not isinstance(data, (TransferData, TransferJettonData, TransferNFTData)):
+            raise TypeError(f"Unsupported transfer data: {data.__class__.__name__}.")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((data, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        """
+        Send the collected transfers without waiting for the deadline.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """
+        Send the collected transfers and wait until all batches are sent.
+        """
+        self.flush()
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self._owned_seqno_manager is not None:
+            await self._owned_seqno_manager.close()
+            if self.wallet.seqno_manager is self._owned_seqno_manager:
+                self.wallet.seqno_manager = None
+            self._owned_seqno_manager = None
+
+    async def __aenter__(self) -> TransferQueue:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def _create_message(self, data: TransferItem) -> WalletMessage:
+        if isinstance(data, TransferJettonData):
+            jetton_wallet_address, = await self.wallet.get_jetton_wallet_addresses([data.jetton_master_address])
+            return self.wallet.create_jetton_transfer_message(data, jetton_wallet_address)
+
+        if isinstance(data, TransferNFTData):
+            return self.wallet.create_nft_transfer_message(data)
+
+        return self.wallet.create_transfer_message(data)
+
+    async def _send(self, batch: List[Tuple[TransferItem, asyncio.Future]]) -> None:
+        # batches take the lock in the order they were flushed
+        async with self._lock:
+            await self._send_batch(batch)
+
+    async def _send_batch(self, batch: List[Tuple[TransferItem, asyncio.Future]]) -> None:
+        results = await asyncio.gather(
+            *[self._create_message(data) for data, _ in batch],
+            return_exceptions=True,
+        )
+
+        messages: List[WalletMessage] = []
+        futures: List[asyncio.Future] = []
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                if not future.done():
+                    future.set_exception(result)
+            else:
+                messages.append(result)
+                futures.append(future)
+
+        if not messages:
+            return
+
+        try:
+            if isinstance(self.wallet, HighloadWalletV3):
+                sent = await self.wallet.raw_transfer_chunked(messages, **self.transfer_kwargs)
+            else:
+                sent = [(await self.wallet.raw_transfer(messages=messages, **self.transfer_kwargs), len(messages))]
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        hashes = itertools.chain.from_iterable(itertools.repeat(message_hash, count) for message_hash, count in sent)
+
+        for future, message_hash in zip(futures, hashes):
+            if not future.done():
+                future.set_result(message_hash)
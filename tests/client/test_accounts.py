@@ -0,0 +1,82 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Optional, Tuple
+
+from pytoniq_core import Address
+
+from stonutils.account import AccountStatus, RawAccount
+from stonutils.client import Client, LiteserverClient, TonapiClient, ToncenterClient
+
+ADDRESS = Address((0, b"\x11" * 32))
+
+
+def _tonapi_client(status: str) -> TonapiClient:
+    async def get(method: str, params: Any = None) -> Any:
+        return {"address": ADDRESS.to_str(False), "balance": 5 if status == "uninit" else 0, "status": status}
+
+    client = TonapiClient("key")
+    client._get = get
+    return client
+
+
+def _toncenter_client(status: str) -> ToncenterClient:
+    async def get(method: str, params: Any = None) -> Any:
+        return {
+            "balance": "5" if status == "uninit" else "0",
+            "code": None,
+            "data": None,
+            "status": status,
+            "last_transaction_lt": "7" if status == "uninit" else None,
+            "last_transaction_hash": None,
+        }
+
+    client = ToncenterClient("key")
+    client._get = get
+    return client
+
+
+def _lite_client(status: str) -> LiteserverClient:
+    class Balancer:
+        async def raw_get_account_state(self, address: Address) -> Tuple[Any, Any]:
+            if status == "nonexist":
+                return None, None
+
+            account = SimpleNamespace(
+                addr=address,
+                storage=SimpleNamespace(
+                    balance=SimpleNamespace(grams=5),
+                    state=SimpleNamespace(type_="account_uninit"),
+                ),
+            )
+            return account, SimpleNamespace(last_trans_lt=7, last_trans_hash=bytes(32))
+
+    client = LiteserverClient(config={"liteservers": []})
+    client.client = Balancer()
+    client._started = True
+    client._ready = asyncio.Event()
+    client._ready.set()
+    return client
+
+
+def _fetch(client: Client) -> RawAccount:
+    async def main() -> RawAccount:
+        return await client.get_raw_account(ADDRESS.to_str())
+
+    return asyncio.run(main())
+
+
+def test_undeployed_accounts_have_no_code_and_data() -> None:
+    for create_client in (_tonapi_client, _toncenter_client, _lite_client):
+        for status in ("nonexist", "uninit"):
+            account = _fetch(create_client(status))
+
+            assert account.status is AccountStatus(status), (create_client, status)
+            assert account.code is None and account.data is None
+            assert account.balance == (5 if status == "uninit" else 0)
+
+
+def test_nonexistent_lite_account_has_no_transaction() -> None:
+    account = _fetch(_lite_client("nonexist"))
+
+    assert account.last_transaction_lt == 0
+    assert account.last_transaction_hash == ""
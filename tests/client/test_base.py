@@ -0,0 +1,128 @@
+import asyncio
+from typing import Any, List, Optional
+
+import pytest
+from pytoniq_core import Address, begin_cell
+
+from stonutils.account import AccountStatus, RawAccount
+from stonutils.client import Client
+
+ADDRESS = Address((0, b"\x11" * 32))
+
+
+class FakeClient(Client):
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.calls: List[Any] = []
+        self.release = asyncio.Event()
+        self.error: Optional[Exception] = None
+
+    async def _run_get_method(self, address: str, method_name: str, stack: Optional[List[Any]] = None) -> Any:
+        self.calls.append((address, method_name, stack))
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+
+        return [len(self.calls), begin_cell().store_uint(7, 32).end_cell().begin_parse()]
+
+    async def _get_raw_account(self, address: str) -> RawAccount:
+        self.calls.append(address)
+        await self.release.wait()
+
+        return RawAccount(1, None, None, AccountStatus.nonexist, 0, "")
+
+
+async def _gather_released(client: FakeClient, *calls: Any) -> List[Any]:
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    await asyncio.sleep(0)
+    client.release.set()
+
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_identical_calls_share_one_request() -> None:
+    async def main() -> None:
+        client = FakeClient()
+        results = await _gather_released(client, *[
+            client.run_get_method(address, "seqno")
+            for address in (ADDRESS.to_str(), ADDRESS.to_str(is_user_friendly=False), ADDRESS.to_str())
+        ])
+
+        assert len(client.calls) == 1
+        assert [result[0] for result in results] == [1, 1, 1]
+
+        # every caller reads its own copy of the slices
+        assert [result[1].load_uint(32) for result in results] == [7, 7, 7]
+
+    asyncio.run(main())
+
+
+def test_different_calls_are_not_shared() -> None:
+    async def main() -> None:
+        client = FakeClient()
+        await _gather_released(
+            client,
+            client.run_get_method(ADDRESS.to_str(), "seqno"),
+            client.run_get_method(ADDRESS.to_str(), "get_public_key"),
+            client.run_get_method(ADDRESS.to_str(), "seqno", [1]),
+            client.get_raw_account(ADDRESS.to_str()),
+        )
+
+        assert len(client.calls) == 4
+
+    asyncio.run(main())
+
+
+def test_coalescing_can_be_disabled() -> None:
+    async def main() -> None:
+        client = FakeClient(coalesce_requests=False)
+        await _gather_released(client, *[client.get_raw_account(ADDRESS.to_str()) for _ in range(3)])
+
+        assert len(client.calls) == 3
+
+    asyncio.run(main())
+
+
+def test_a_finished_request_is_not_reused() -> None:
+    async def main() -> None:
+        client = FakeClient()
+        client.release.set()
+        await client.run_get_method(ADDRESS.to_str(), "seqno")
+        await client.run_get_method(ADDRESS.to_str(), "seqno")
+
+        assert len(client.calls) == 2
+        assert client._in_flight == {}
+
+    asyncio.run(main())
+
+
+def test_errors_reach_every_caller() -> None:
+    async def main() -> None:
+        client = FakeClient()
+        client.error = ValueError("failed")
+        results = await _gather_released(client, *[client.run_get_method(ADDRESS.to_str(), "seqno") for _ in range(2)])
+
+        assert len(client.calls) == 1
+        assert all(isinstance(result, ValueError) for result in results)
+
+    asyncio.run(main())
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others() -> None:
+    async def main() -> None:
+        client = FakeClient()
+        first = asyncio.ensure_future(client.run_get_method(ADDRESS.to_str(), "seqno"))
+        second = asyncio.ensure_future(client.run_get_method(ADDRESS.to_str(), "seqno"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        client.release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert (await second)[0] == 1
+        assert len(client.calls) == 1
+
+    asyncio.run(main())
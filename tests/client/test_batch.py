@@ -0,0 +1,156 @@
+import asyncio
+import base64
+from typing import Any, Dict, List
+
+import pytest
+from pytoniq_core import Address
+
+from stonutils.client import ToncenterClient
+from stonutils.client.batch import JsonRpcBatcher
+from stonutils.exceptions import JsonRpcError, TonutilsException
+
+ADDRESS = Address((0, b"\x11" * 32)).to_str()
+
+
+class FakeTransport:
+
+    def __init__(self) -> None:
+        self.batches: List[List[Dict[str, Any]]] = []
+
+    async def _post(self, method: str, body: List[Dict[str, Any]]) -> Any:
+        self.batches.append(body)
+        return [self.respond(call) for call in body]
+
+    @staticmethod
+    def respond(call: Dict[str, Any]) -> Dict[str, Any]:
+        if call["method"] == "fail":
+            return {"id": call["id"], "ok": False, "error": "bad call", "code": 400}
+        if call["method"] == "getAddressInformation":
+            return {"id": call["id"], "ok": True, "result": {
+                "state": "uninitialized",
+                "balance": "5",
+                "code": "",
+                "data": "",
+                "last_transaction_id": {"lt": "0", "hash": base64.b64encode(bytes(32)).decode()},
+            }}
+        if call["method"] == "runGetMethod":
+            return {"id": call["id"], "ok": True, "result": {
+                "gas_used": 100,
+                "exit_code": 0,
+                "stack": [["num", "0x7"]],
+            }}
+
+        return {"id": call["id"], "ok": True, "result": call["params"]["value"]}
+
+
+def test_calls_within_the_window_are_sent_together() -> None:
+    async def main() -> None:
+        transport = FakeTransport()
+        batcher = JsonRpcBatcher(transport, "/jsonRPC", window=0.01)  # noqa
+
+        results = await asyncio.gather(*[batcher.call("echo", {"value": i}) for i in range(5)])
+
+        assert results == [0, 1, 2, 3, 4]
+        assert len(transport.batches) == 1
+        assert [call["id"] for call in transport.batches[0]] == [0, 1, 2, 3, 4]
+
+    asyncio.run(main())
+
+
+def test_full_batches_are_sent_without_waiting() -> None:
+    async def main() -> None:
+        transport = FakeTransport()
+        batcher = JsonRpcBatcher(transport, "/jsonRPC", window=60, max_size=2)  # noqa
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*[batcher.call("echo", {"value": i}) for i in range(4)]),
+            timeout=1,
+        )
+
+        assert results == [0, 1, 2, 3]
+        assert [len(batch) for batch in transport.batches] == [2, 2]
+
+    asyncio.run(main())
+
+
+def test_errors_are_reported_per_call() -> None:
+    class PartialTransport(FakeTransport):
+        async def _post(self, method: str, body: List[Dict[str, Any]]) -> Any:
+            self.batches.append(body)
+            return [self.respond(call) for call in body if call["id"] != 2]
+
+    async def main() -> None:
+        batcher = JsonRpcBatcher(PartialTransport(), "/jsonRPC")  # noqa
+
+        results = await asyncio.gather(
+            batcher.call("echo", {"value": "a"}),
+            batcher.call("fail", {}),
+            batcher.call("echo", {"value": "missing"}),
+            return_exceptions=True,
+        )
+
+        assert results[0] == "a"
+        assert isinstance(results[1], JsonRpcError) and results[1].code == 400
+        assert isinstance(results[2], TonutilsException)
+
+    asyncio.run(main())
+
+
+def test_a_transport_error_fails_the_whole_batch() -> None:
+    class BrokenTransport(FakeTransport):
+        async def _post(self, method: str, body: List[Dict[str, Any]]) -> Any:
+            raise ConnectionError("down")
+
+    async def main() -> None:
+        batcher = JsonRpcBatcher(BrokenTransport(), "/jsonRPC")  # noqa
+
+        results = await asyncio.gather(*[batcher.call("echo", {"value": i}) for i in range(3)], return_exceptions=True)
+
+        assert all(isinstance(result, ConnectionError) for result in results)
+
+    asyncio.run(main())
+
+
+def test_close_sends_the_pending_calls() -> None:
+    async def main() -> None:
+        transport = FakeTransport()
+        batcher = JsonRpcBatcher(transport, "/jsonRPC", window=60)  # noqa
+
+        task = asyncio.ensure_future(batcher.call("echo", {"value": 1}))
+        await asyncio.sleep(0)
+        await batcher.close()
+
+        assert await task == 1
+        assert len(transport.batches) == 1
+
+    asyncio.run(main())
+
+
+def test_max_size_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        JsonRpcBatcher(FakeTransport(), "/jsonRPC", max_size=0)  # noqa
+
+
+def test_toncenter_calls_are_batched() -> None:
+    async def main() -> None:
+        transport = FakeTransport()
+        client = ToncenterClient("key", batch_window=0.01)
+        client._post = transport._post
+
+        account, result = await asyncio.gather(
+            client.get_raw_account(ADDRESS),
+            client.run_get_method(ADDRESS, "seqno", [1]),
+        )
+
+        assert len(transport.batches) == 1
+        assert [call["method"] for call in transport.batches[0]] == ["getAddressInformation", "runGetMethod"]
+        assert transport.batches[0][1]["params"]["stack"] == [["num", "1"]]
+
+        assert account.balance == 5
+        assert account.code is None and account.data is None
+        assert account.status.value == "uninit"
+        assert result["stack"] == [{"type": "num", "value": "0x7"}]
+
+        await client.close()
+
+    asyncio.run(main())
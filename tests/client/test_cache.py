@@ -0,0 +1,160 @@
+import asyncio
+import time
+from typing import Any, List, Optional
+
+from pytoniq_core import Address
+
+from stonutils.account import AccountStatus, RawAccount
+from stonutils.client import Client, GetMethodCache, MemoryCache, SqliteCache
+from stonutils.client.cache import CacheEntry
+
+ADDRESS = Address((0, b"\x11" * 32)).to_str()
+
+
+class FakeClient(Client):
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.last_transaction_lt = 1
+        self.get_method_calls = 0
+        self.account_calls = 0
+
+    async def _run_get_method(self, address: str, method_name: str, stack: Optional[List[Any]] = None) -> Any:
+        self.get_method_calls += 1
+        return {"exit_code": 0, "stack": [{"type": "num", "value": hex(self.get_method_calls)}]}
+
+    async def _get_raw_account(self, address: str) -> RawAccount:
+        self.account_calls += 1
+        return RawAccount(1, None, None, AccountStatus.active, self.last_transaction_lt, "")
+
+
+def test_results_are_served_from_the_cache() -> None:
+    async def main() -> None:
+        cache = GetMethodCache()
+        client = FakeClient(get_method_cache=cache)
+
+        first = await client.run_get_method(ADDRESS, "seqno")
+        second = await client.run_get_method(ADDRESS, "seqno")
+
+        assert first == second
+        assert client.get_method_calls == 1
+        assert client.account_calls == 0
+        assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1}
+
+        # cached results are copies
+        second["stack"].clear()
+        assert (await client.run_get_method(ADDRESS, "seqno"))["stack"] == first["stack"]
+
+    asyncio.run(main())
+
+
+def test_strict_entries_are_invalidated_by_a_new_transaction() -> None:
+    async def main() -> None:
+        client = FakeClient(get_method_cache=GetMethodCache(strict=True, lt_check_interval=0))
+
+        await client.run_get_method(ADDRESS, "seqno")
+        await client.run_get_method(ADDRESS, "seqno")
+        assert client.get_method_calls == 1
+
+        client.last_transaction_lt = 2
+        await client.run_get_method(ADDRESS, "seqno")
+        assert client.get_method_calls == 2
+        assert client.account_calls == 3
+
+    asyncio.run(main())
+
+
+def test_strict_mode_reuses_a_recent_account_lookup() -> None:
+    async def main() -> None:
+        client = FakeClient(get_method_cache=GetMethodCache(strict=True, lt_check_interval=60))
+
+        await client.get_raw_account(ADDRESS)
+        await client.run_get_method(ADDRESS, "seqno")
+        await client.run_get_method(ADDRESS, "get_wallet_data")
+        await client.run_get_method(ADDRESS, "seqno")
+
+        assert client.account_calls == 1
+        assert client.get_method_calls == 2
+
+    asyncio.run(main())
+
+
+def test_immutable_methods_skip_the_account_lookup() -> None:
+    async def main() -> None:
+        client = FakeClient(get_method_cache=GetMethodCache(strict=True, lt_check_interval=0))
+
+        await client.run_get_method(ADDRESS, "get_wallet_address", [1])
+        client.last_transaction_lt = 2
+        await client.run_get_method(ADDRESS, "get_wallet_address", [1])
+
+        assert client.get_method_calls == 1
+        assert client.account_calls == 0
+
+    asyncio.run(main())
+
+
+def test_entries_expire_after_the_ttl() -> None:
+    async def main() -> None:
+        cache = GetMethodCache(ttl=60)
+        client = FakeClient(get_method_cache=cache)
+
+        await client.run_get_method(ADDRESS, "seqno")
+        key, entry = next(iter(cache.backend._entries.items()))
+        cache.backend.set(key, entry._replace(expires_at=time.time() - 1))
+        await client.run_get_method(ADDRESS, "seqno")
+
+        assert client.get_method_calls == 2
+
+    asyncio.run(main())
+
+
+def test_failed_and_excluded_calls_are_not_cached() -> None:
+    class FailingClient(FakeClient):
+        async def _run_get_method(self, address: str, method_name: str, stack: Optional[List[Any]] = None) -> Any:
+            self.get_method_calls += 1
+            return {"exit_code": -13, "stack": []}
+
+    async def main() -> None:
+        client = FailingClient(get_method_cache=GetMethodCache(methods=["seqno", "get_wallet_data"]))
+
+        await client.run_get_method(ADDRESS, "seqno")
+        await client.run_get_method(ADDRESS, "seqno")
+        await client.run_get_method(ADDRESS, "get_public_key")
+        await client.run_get_method(ADDRESS, "get_public_key")
+
+        assert client.get_method_calls == 4
+        assert len(client.get_method_cache.backend) == 0
+
+    asyncio.run(main())
+
+
+def test_memory_cache_evicts_the_least_recently_used() -> None:
+    cache = MemoryCache(max_size=2)
+    cache.set("a", CacheEntry(1, None, None))
+    cache.set("b", CacheEntry(2, None, None))
+    cache.get("a")
+    cache.set("c", CacheEntry(3, None, None))
+
+    assert cache.get("b") is None
+    assert cache.get("a").value == 1
+    assert cache.get("c").value == 3
+
+
+def test_sqlite_cache_persists_and_evicts(tmp_path) -> None:
+    path = str(tmp_path / "cache.sqlite")
+
+    cache = SqliteCache(path, max_size=2)
+    cache.set("a", CacheEntry({"stack": [1]}, 5, None))
+    time.sleep(0.01)
+    cache.set("b", CacheEntry(2, None, None))
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", CacheEntry(3, None, None))
+    cache.close()
+
+    cache = SqliteCache(path, max_size=2)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == CacheEntry({"stack": [1]}, 5, None)
+    cache.close()
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import pytest
+
+from stonutils.client.limiter import RateLimiter, RequestPriority
+
+
+def test_requests_are_spread_to_the_rate() -> None:
+    limiter = RateLimiter(20, burst=1)
+
+    async def main() -> float:
+        started = time.monotonic()
+        await asyncio.gather(*[limiter.acquire() for _ in range(5)])
+        return time.monotonic() - started
+
+    # the first request uses the burst, the next four wait 1/20 s each
+    assert asyncio.run(main()) >= 0.15
+
+
+def test_sends_are_served_before_reads() -> None:
+    limiter = RateLimiter(50, burst=1)
+    order = []
+
+    async def acquire(name: str, priority: int) -> None:
+        await limiter.acquire(priority)
+        order.append(name)
+
+    async def main() -> None:
+        await limiter.acquire()
+        await asyncio.gather(
+            acquire("read", RequestPriority.READ),
+            acquire("send", RequestPriority.SEND),
+        )
+
+    asyncio.run(main())
+    assert order == ["send", "read"]
+
+
+def test_limiter_is_usable_from_a_new_event_loop() -> None:
+    limiter = RateLimiter(50, burst=1)
+
+    async def leave_waiters() -> None:
+        await limiter.acquire()
+        # waiters left behind when the loop stops
+        for _ in range(3):
+            asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+
+    # the previous loop stops with its dispatcher still pending
+    previous = asyncio.new_event_loop()
+    previous.run_until_complete(leave_waiters())
+
+    async def main() -> None:
+        await asyncio.wait_for(asyncio.gather(*[limiter.acquire() for _ in range(3)]), timeout=1)
+
+    try:
+        asyncio.run(main())
+    finally:
+        tasks = asyncio.all_tasks(previous)
+        for task in tasks:
+            task.cancel()
+        previous.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        previous.close()
+
+
+def test_for_key_shares_the_limiter_and_rejects_another_rate() -> None:
+    key = f"test-key-{time.time()}"
+    limiter = RateLimiter.for_key(key, 5)
+
+    assert RateLimiter.for_key(key, 5) is limiter
+    assert key not in RateLimiter._registry
+    with pytest.raises(ValueError):
+        RateLimiter.for_key(key, 10)
@@ -0,0 +1,53 @@
+import asyncio
+
+from stonutils.client import LiteserverClient
+from stonutils.client.cache import GetMethodCache
+from stonutils.client.limiter import RateLimiter, RequestPriority
+
+CONFIG = {"liteservers": []}
+
+
+def test_client_options_are_forwarded() -> None:
+    cache = GetMethodCache()
+    limiter = RateLimiter(5)
+    client = LiteserverClient(
+        config=CONFIG,
+        coalesce_requests=False,
+        get_method_cache=cache,
+        rate_limiter=limiter,
+    )
+
+    assert client.coalesce_requests is False
+    assert client.get_method_cache is cache
+    assert client.rate_limiter is limiter
+
+
+def test_calls_wait_for_the_rate_limiter() -> None:
+    acquired = []
+
+    class Limiter(RateLimiter):
+        async def acquire(self, priority: int = RequestPriority.READ) -> None:
+            acquired.append(priority)
+
+    class Balancer:
+        inited = True
+
+        async def run_get_method(self, address, method_name, stack):
+            return [1]
+
+        async def raw_send_message(self, boc):
+            return None
+
+    client = LiteserverClient(config=CONFIG, rate_limiter=Limiter(5))
+    client.client = Balancer()
+    client._started = True
+    client._ready = asyncio.Event()
+    client._ready.set()
+
+    async def main() -> None:
+        await client.run_get_method("EQCD39VS5jcptHL8vMjEXrzGaRcCVYto7HUn4bpAOg8xqB2N", "seqno")
+        await client.send_message("00")
+
+    asyncio.run(main())
+
+    assert acquired == [RequestPriority.READ, RequestPriority.SEND]
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, List, Optional
+
+from pytoniq_core import Address, Cell, begin_cell
+
+from stonutils.client import Client, MultiClient, ResultFormat, ToncenterClient
+from stonutils.jetton import JettonMaster
+from stonutils.wallet import WalletV4R2
+
+ADDRESS = Address((0, b"\x11" * 32))
+WALLET_ADDRESS = Address((0, b"\x22" * 32))
+
+
+class TonapiBackend(Client):
+    result_format = ResultFormat.TONAPI
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stacks: List[Any] = []
+
+    async def _run_get_method(self, address: str, method_name: str, stack: Optional[List[Any]] = None) -> Any:
+        self.stacks.append(stack)
+        if method_name == "seqno":
+            return {"exit_code": 0, "stack": [{"type": "num", "num": "0x7"}], "decoded": {"state": 7}}
+
+        cell = begin_cell().store_address(WALLET_ADDRESS).end_cell()
+        return {"exit_code": 0, "stack": [{"type": "slice", "slice": cell.to_boc().hex()}]}
+
+
+class LiteBackend(Client):
+    result_format = ResultFormat.LITESERVER
+
+    async def _run_get_method(self, address: str, method_name: str, stack: Optional[List[Any]] = None) -> Any:
+        if method_name == "seqno":
+            return [7]
+
+        return [begin_cell().store_address(WALLET_ADDRESS).end_cell().begin_parse()]
+
+
+def test_is_a_plain_client() -> None:
+    client = MultiClient([TonapiBackend()])
+
+    assert not isinstance(client, ToncenterClient)
+    assert client.result_format is ResultFormat.TONCENTER
+
+
+def test_contract_helpers_accept_any_backend() -> None:
+    async def main(backend: Client) -> None:
+        client = MultiClient([backend])
+
+        assert await WalletV4R2.get_seqno(client, ADDRESS) == 7
+        wallet_address = await JettonMaster.get_wallet_address(client, WALLET_ADDRESS, ADDRESS)
+        assert wallet_address == WALLET_ADDRESS
+
+    for backend in (TonapiBackend(), LiteBackend()):
+        asyncio.run(main(backend))
+
+
+def test_stack_arguments_are_translated() -> None:
+    cell = begin_cell().store_address(ADDRESS).end_cell()
+    backend = TonapiBackend()
+
+    async def main() -> None:
+        client = MultiClient([backend])
+        await JettonMaster.get_wallet_address(client, ADDRESS, WALLET_ADDRESS)
+
+    asyncio.run(main())
+
+    assert backend.stacks[-1] == [cell.to_boc().hex()]
+    assert Cell.one_from_boc(bytes.fromhex(backend.stacks[-1][0])).hash == cell.hash
@@ -0,0 +1,36 @@
+import asyncio
+
+from stonutils.client._base import Client
+
+
+def test_session_is_reused_within_a_loop() -> None:
+    client = Client()
+
+    async def main() -> None:
+        session = client._get_session()
+        assert client._get_session() is session
+        await client.close()
+        assert session.closed
+        assert client._get_session() is not session
+        await client.close()
+
+    asyncio.run(main())
+
+
+def test_session_of_a_previous_loop_is_closed() -> None:
+    client = Client()
+
+    async def first() -> object:
+        return client._get_session()
+
+    previous = asyncio.run(first())
+
+    async def second() -> None:
+        session = client._get_session()
+        assert session is not previous
+        # the previous session is closed in the background
+        await asyncio.sleep(0)
+        assert previous.closed
+        await client.close()
+
+    asyncio.run(second())
@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+from pytoniq_core import Address
+
+from stonutils.client import LiteserverClient
+from stonutils.jetton.dex.dedust import Asset, DedustAddressCache, Factory, PoolType, Router
+
+NATIVE = Asset.native()
+DEPLOYED = Asset.jetton(Address((0, b"\x01" * 32)))
+UNDEPLOYED = Asset.jetton(Address((0, b"\x02" * 32)))
+FROZEN = Asset.jetton(Address((0, b"\x03" * 32)))
+
+POOLS = {
+    DEPLOYED: Address((0, b"\x11" * 32)),
+    UNDEPLOYED: Address((0, b"\x12" * 32)),
+    FROZEN: Address((0, b"\x13" * 32)),
+}
+
+
+class Balancer:
+
+    def __init__(self) -> None:
+        self.deployed = POOLS[DEPLOYED].to_str(is_user_friendly=False)
+        self.frozen = POOLS[FROZEN].to_str(is_user_friendly=False)
+
+    async def run_get_method(self, address: str, method_name: str, stack: List[Any]) -> Any:
+        if Address(address).to_str(is_user_friendly=False) != self.deployed:
+            raise RuntimeError("exit code -13")
+
+        return {
+            "get_assets": [NATIVE.to_slice(), DEPLOYED.to_slice()],
+            "get_reserves": [10 ** 12, 2 * 10 ** 12],
+            "get_trade_fee": [25, 10000],
+            "is_stable": [0],
+        }[method_name]
+
+    async def raw_get_account_state(self, address: Address) -> Any:
+        if address.to_str(is_user_friendly=False) != self.frozen:
+            return None, None
+
+        account = SimpleNamespace(
+            addr=address,
+            storage=SimpleNamespace(
+                balance=SimpleNamespace(grams=1),
+                state=SimpleNamespace(type_="account_frozen", state_hash=bytes(32)),
+            ),
+        )
+        return account, SimpleNamespace(last_trans_lt=1, last_trans_hash=bytes(32))
+
+
+@pytest.fixture
+def address_cache():
+    previous = Factory.address_cache
+    Factory.address_cache = DedustAddressCache()
+
+    for asset, address in POOLS.items():
+        Factory.address_cache.set_pool(PoolType.VOLATILE, [NATIVE, asset], address)
+
+    yield Factory.address_cache
+    Factory.address_cache = previous
+
+
+def _client() -> LiteserverClient:
+    client = LiteserverClient(config={"liteservers": []})
+    client.client = Balancer()
+    client._started = True
+    client._ready = asyncio.Event()
+    client._ready.set()
+    return client
+
+
+def test_undeployed_pools_are_skipped(address_cache) -> None:
+    async def main() -> Router:
+        return await Router.from_assets(_client(), [DEPLOYED, UNDEPLOYED])
+
+    router = asyncio.run(main())
+
+    assert [pool.address for pool in router.pools] == [POOLS[DEPLOYED]]
+    assert router.pools[0].state.assets == (NATIVE, DEPLOYED)
+
+
+def test_other_pool_failures_are_raised(address_cache) -> None:
+    async def main() -> Router:
+        return await Router.from_assets(_client(), [DEPLOYED, FROZEN])
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
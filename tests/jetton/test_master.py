@@ -0,0 +1,45 @@
+from pytoniq_core import Address, Cell, StateInit, begin_cell
+
+from stonutils.jetton import JettonMaster, JettonMasterStablecoin, JettonWallet, JettonWalletStablecoin
+from stonutils.jetton.data import JettonWalletData, JettonWalletStablecoinData
+
+MASTER_ADDRESS = Address((0, b"\x11" * 32))
+OWNER_ADDRESSES = [
+    Address((0, b"\x22" * 32)),
+    Address((-1, b"\x33" * 32)),
+    Address((0, bytes(range(32)))),
+]
+
+
+def _address(code: Cell, data: Cell) -> Address:
+    return Address((0, StateInit(code=code, data=data).serialize().hash))
+
+
+def test_standard_wallet_address() -> None:
+    code = JettonWallet.get_code_cell()
+
+    for owner_address in OWNER_ADDRESSES:
+        data = JettonWalletData(owner_address, MASTER_ADDRESS, code).serialize()
+
+        assert JettonMaster.calculate_wallet_address(owner_address, MASTER_ADDRESS) == _address(code, data)
+        assert JettonMaster.calculate_wallet_address(
+            owner_address.to_str(), MASTER_ADDRESS.to_str(), JettonWallet.CODE_HEX,
+        ) == _address(code, data)
+
+
+def test_stablecoin_wallet_address() -> None:
+    code = JettonWalletStablecoin.get_code_cell()
+
+    for owner_address in OWNER_ADDRESSES:
+        data = JettonWalletStablecoinData(owner_address, MASTER_ADDRESS).serialize()
+
+        assert JettonMasterStablecoin.calculate_wallet_address(owner_address, MASTER_ADDRESS) == _address(code, data)
+
+
+def test_library_code_cell() -> None:
+    library = begin_cell().store_uint(2, 8).store_bytes(JettonWalletStablecoin.get_code_cell().hash).end_cell()
+    code = Cell(library.bits, [], 2)
+    owner_address = OWNER_ADDRESSES[0]
+    data = JettonWalletStablecoinData(owner_address, MASTER_ADDRESS).serialize()
+
+    assert JettonMasterStablecoin.calculate_wallet_address(owner_address, MASTER_ADDRESS, code) == _address(code, data)
@@ -0,0 +1,86 @@
+import asyncio
+import base64
+from typing import Any, List, Optional
+
+from pytoniq_core import Address, Cell, Slice, begin_cell
+
+from stonutils.client import Client, ResultFormat
+from stonutils.jetton import JettonMaster, JettonWallet, JettonWalletAddressResolver
+
+MASTER_ADDRESS = Address((0, b"\x11" * 32))
+OWNER_ADDRESSES = [Address((0, bytes([i]) * 32)) for i in range(1, 6)]
+
+
+def _b64(cell: Cell) -> str:
+    return base64.b64encode(cell.to_boc()).decode()
+
+
+class FakeClient(Client):
+    result_format = ResultFormat.TONCENTER
+
+    def __init__(self, code: Cell, wrong_address: bool = False) -> None:
+        super().__init__()
+        self.code = code
+        self.wrong_address = wrong_address
+        self.calls: List[str] = []
+
+    async def _run_get_method(self, address: str, method_name: str, stack: Optional[List[Any]] = None) -> Any:
+        self.calls.append(method_name)
+
+        if method_name == "get_jetton_data":
+            return {"exit_code": 0, "stack": [
+                {"type": "num", "value": "0x0"},
+                {"type": "num", "value": "-0x1"},
+                {"type": "slice", "value": _b64(begin_cell().store_address(None).end_cell())},
+                {"type": "cell", "value": _b64(begin_cell().end_cell())},
+                {"type": "cell", "value": _b64(self.code)},
+            ]}
+
+        owner_address = Slice.one_from_boc(stack[0]).load_address()
+        wallet_address = JettonMaster.calculate_wallet_address(owner_address, address)
+        if self.wrong_address:
+            wallet_address = Address((0, bytes(32)))
+
+        return {"exit_code": 0, "stack": [
+            {"type": "slice", "value": _b64(begin_cell().store_address(wallet_address).end_cell())},
+        ]}
+
+
+def _expected() -> List[Address]:
+    return [JettonMaster.calculate_wallet_address(owner, MASTER_ADDRESS) for owner in OWNER_ADDRESSES]
+
+
+def test_known_code_is_resolved_locally() -> None:
+    async def main() -> None:
+        client = FakeClient(JettonWallet.get_code_cell())
+        resolver = JettonWalletAddressResolver(client)
+
+        assert await resolver.get_wallet_address(OWNER_ADDRESSES[0], MASTER_ADDRESS) == _expected()[0]
+        assert await resolver.get_wallet_addresses(OWNER_ADDRESSES, MASTER_ADDRESS.to_str()) == _expected()
+
+        # one get_jetton_data and one verifying get_wallet_address
+        assert sorted(client.calls) == ["get_jetton_data", "get_wallet_address"]
+
+    asyncio.run(main())
+
+
+def test_unknown_code_falls_back_to_the_get_method() -> None:
+    async def main() -> None:
+        client = FakeClient(begin_cell().store_uint(1, 8).end_cell())
+        resolver = JettonWalletAddressResolver(client, verify=False)
+
+        assert await resolver.get_wallet_addresses(OWNER_ADDRESSES, MASTER_ADDRESS) == _expected()
+        assert client.calls.count("get_wallet_address") == len(OWNER_ADDRESSES)
+
+    asyncio.run(main())
+
+
+def test_a_failed_verification_falls_back_to_the_get_method() -> None:
+    async def main() -> None:
+        client = FakeClient(JettonWallet.get_code_cell(), wrong_address=True)
+        resolver = JettonWalletAddressResolver(client)
+
+        assert await resolver.get_wallet_code(MASTER_ADDRESS) is None
+        assert await resolver.get_wallet_address(OWNER_ADDRESSES[0], MASTER_ADDRESS) == Address((0, bytes(32)))
+
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import time
+from typing import Any, List, Set, Tuple
+
+import pytest
+from pytoniq_core import Address
+
+from stonutils.nft import BatchMintPipeline, BatchMintStalledError, MintBatch
+from stonutils.nft import batch_mint
+from stonutils.nft.content import NFTOffchainContent
+from stonutils.wallet import WalletV4R2
+
+OWNER = Address((0, b"\x11" * 32))
+COLLECTION = Address((0, b"\x22" * 32))
+ITEMS = [(NFTOffchainContent(suffix_uri=f"{i}.json"), OWNER) for i in range(500)]
+
+
+class Chain:
+    """
+    A wallet and a collection processing the batch mint messages as soon as they are sent.
+    """
+
+    def __init__(self, next_index: int = 0, lost: Set[int] = frozenset()) -> None:
+        self.next_index = next_index
+        self.seqno = 0
+        # the numbers of the sent messages that never reach the chain
+        self.lost = lost
+        self.sent: List[Tuple[int, int]] = []
+        self.sent_at: List[float] = []
+        self.minted: List[int] = []
+
+    def send(self, seqno: int, valid_until: int, keys: List[int]) -> None:
+        self.sent.append((keys[0], len(keys)))
+        self.sent_at.append(time.time())
+        if len(self.sent) in self.lost or seqno != self.seqno or time.time() > valid_until:
+            return
+
+        self.seqno += 1
+        if keys[0] <= self.next_index:
+            self.minted.extend(keys)
+            self.next_index = max(self.next_index, keys[-1] + 1)
+
+
+class Wallet(WalletV4R2):
+    chain: Chain
+
+    async def raw_transfer(self, messages: Any = None, **kwargs: Any) -> str:
+        cs = messages[0].message.body.begin_parse()
+        cs.skip_bits(32 + 64)
+        keys = sorted(cs.load_dict(64))
+        self.chain.send(kwargs["seqno"], kwargs["valid_until"], keys)
+        return f"hash {len(self.chain.sent)}"
+
+    @classmethod
+    async def get_seqno(cls, client: Any, address: Any) -> int:
+        return cls.chain.seqno
+
+
+@pytest.fixture(autouse=True)
+def expiry_margin(monkeypatch):
+    monkeypatch.setattr(batch_mint, "EXPIRY_MARGIN", 0.5)
+
+
+def _pipeline(chain: Chain, **kwargs: Any) -> BatchMintPipeline:
+    Wallet.chain = chain
+    wallet, _, _, _ = Wallet.create(None)
+
+    pipeline = BatchMintPipeline(wallet, COLLECTION, valid_for=2, poll_interval=0.01, **kwargs)
+
+    async def get_chain_index() -> int:
+        return chain.next_index
+
+    pipeline._get_chain_index = get_chain_index
+    return pipeline
+
+
+def test_items_are_minted_in_batches() -> None:
+    chain = Chain()
+    pipeline = _pipeline(chain, max_items_per_batch=100, max_in_flight=2)
+
+    assert asyncio.run(pipeline.run(ITEMS)) == len(ITEMS)
+    assert chain.sent == [(0, 100), (100, 100), (200, 100), (300, 100), (400, 100)]
+    assert chain.minted == list(range(len(ITEMS)))
+
+
+def test_a_lost_batch_is_sent_again() -> None:
+    chain = Chain(lost={2})
+    pipeline = _pipeline(chain, max_items_per_batch=100, max_in_flight=3)
+
+    assert asyncio.run(pipeline.run(ITEMS)) == len(ITEMS)
+    # the second message is lost, it and the batches sent after it are sent again
+    assert chain.sent.count((100, 100)) == 2
+    assert chain.sent.count((200, 100)) == 2
+    assert chain.minted == list(range(len(ITEMS)))
+
+
+def test_batches_lost_in_a_row_stop_the_pipeline() -> None:
+    chain = Chain(lost=set(range(1, 100)))
+    pipeline = _pipeline(chain, max_items_per_batch=100, max_in_flight=1, max_resets=2)
+
+    with pytest.raises(BatchMintStalledError) as error:
+        asyncio.run(pipeline.run(ITEMS))
+
+    assert error.value.next_index == 0
+    assert chain.sent == [(0, 100), (0, 100)]
+
+
+def test_a_resumed_run_waits_for_the_pending_batches_and_skips_the_minted_items(tmp_path) -> None:
+    path = str(tmp_path / "checkpoint.json")
+    chain = Chain(next_index=100)
+
+    # a previous run crashed with the batch of items 100 to 199 in flight
+    previous = _pipeline(chain, checkpoint_path=path)
+    previous.next_index = 100
+    valid_until = int(time.time()) + 2
+    previous.pending = [MintBatch(100, 100, valid_until, "hash")]
+    previous.save_checkpoint()
+
+    async def main() -> int:
+        async def land() -> None:
+            await asyncio.sleep(0.5)
+            chain.next_index = 200
+
+        task = asyncio.ensure_future(land())
+        next_index = await _pipeline(chain, max_items_per_batch=100, checkpoint_path=path).run(ITEMS)
+        await task
+        return next_index
+
+    assert asyncio.run(main()) == len(ITEMS)
+    # the index is read once the pending batch expired, nothing below 200 is sent again
+    assert chain.sent == [(200, 100), (300, 100), (400, 100)]
+    assert chain.sent_at[0] > valid_until + batch_mint.EXPIRY_MARGIN
+    assert chain.minted == list(range(200, len(ITEMS)))
+
+    with open(path) as f:
+        checkpoint = json.load(f)
+    assert checkpoint["next_index"] == len(ITEMS)
+    assert checkpoint["pending"] == []
+
+
+def test_a_checkpoint_of_other_items_is_ignored(tmp_path) -> None:
+    path = str(tmp_path / "checkpoint.json")
+
+    previous = _pipeline(Chain(), checkpoint_path=path)
+    previous.next_index = 100
+    previous.save_checkpoint()
+
+    assert _pipeline(Chain(), checkpoint_path=path, from_index=50).load_checkpoint() is False
+
+    pipeline = _pipeline(Chain(), checkpoint_path=path)
+    assert pipeline.load_checkpoint() is True
+    assert pipeline.next_index == 100
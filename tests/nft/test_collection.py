@@ -0,0 +1,117 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+import pytest
+from pytoniq_core import Address, Cell, StateInit, begin_cell
+
+from stonutils.account import AccountStatus, RawAccount
+from stonutils.client import Client, ResultFormat
+from stonutils.nft import CollectionStandard
+from stonutils.nft.contract.base import Collection
+
+OWNER = Address((0, b"\x11" * 32))
+COLLECTION = Address((0, b"\x22" * 32))
+ITEM_CODE = Cell.one_from_boc(CollectionStandard.NFT_ITEM_CODE_HEX)
+
+
+def _item_address(index: int, collection_address: Address, code: Cell = ITEM_CODE) -> Address:
+    data = begin_cell().store_uint(index, 64).store_address(collection_address).end_cell()
+    return Address((0, StateInit(code=code, data=data).serialize().hash))
+
+
+def _collection_data(item_code: Cell) -> Cell:
+    return (
+        begin_cell()
+        .store_address(OWNER)
+        .store_uint(10, 64)
+        .store_ref(Cell.empty())
+        .store_ref(item_code)
+        .store_ref(Cell.empty())
+        .end_cell()
+    )
+
+
+class FakeClient(Client):
+    result_format = ResultFormat.LITESERVER
+
+    def __init__(self, data: Optional[Cell], item_code: Cell = ITEM_CODE) -> None:
+        super().__init__()
+        self.data = data
+        self.item_code = item_code
+        self.account_fetches = 0
+        self.get_method_calls = 0
+
+    async def _get_raw_account(self, address: str) -> RawAccount:
+        self.account_fetches += 1
+        return RawAccount(1, Cell.empty(), self.data, AccountStatus.active, 1, "")
+
+    async def _run_get_method(self, address: str, method_name: str, stack: Optional[List[Any]] = None) -> Any:
+        self.get_method_calls += 1
+        item_address = _item_address(stack[0], Address(address), self.item_code)
+        return [begin_cell().store_address(item_address).end_cell().begin_parse()]
+
+
+@pytest.fixture(autouse=True)
+def item_codes(monkeypatch):
+    monkeypatch.setattr(Collection, "_item_codes", OrderedDict())
+
+
+def test_item_addresses_are_the_state_init_hashes() -> None:
+    indexes = [0, 1, 255, 2 ** 64 - 1]
+
+    assert CollectionStandard.calculate_item_addresses(indexes, COLLECTION) == [
+        _item_address(index, COLLECTION) for index in indexes
+    ]
+    assert CollectionStandard.calculate_item_address(7, COLLECTION.to_str()) == _item_address(7, COLLECTION)
+
+
+def test_item_addresses_use_the_code_of_the_collection() -> None:
+    client = FakeClient(_collection_data(ITEM_CODE))
+
+    addresses = asyncio.run(CollectionStandard.get_item_addresses(client, COLLECTION, range(100)))
+    assert addresses == [_item_address(index, COLLECTION) for index in range(100)]
+
+    # the code is cached: neither the account nor the get method is requested again
+    asyncio.run(CollectionStandard.get_item_addresses(client, COLLECTION, range(100, 200)))
+    assert (client.account_fetches, client.get_method_calls) == (1, 1)
+
+
+def test_a_missing_or_unverified_code_falls_back_to_the_get_method() -> None:
+    client = FakeClient(None)
+    assert asyncio.run(CollectionStandard.get_item_addresses(client, COLLECTION, range(3))) == [
+        _item_address(index, COLLECTION) for index in range(3)
+    ]
+    assert client.get_method_calls == 3
+
+    # the collection is deployed now: the missing code was not cached
+    client.data = _collection_data(ITEM_CODE)
+    assert asyncio.run(CollectionStandard.get_item_code(client, COLLECTION)) is not None
+    assert client.account_fetches == 2
+
+    # the collection derives the addresses from another code than the one stored
+    other = FakeClient(_collection_data(ITEM_CODE), item_code=Cell.empty())
+    address = Address((0, b"\x33" * 32))
+    assert asyncio.run(CollectionStandard.get_item_code(other, address)) is None
+    assert asyncio.run(CollectionStandard.get_item_code(other, address, verify=False)) is not None
+
+
+def test_the_item_code_cache_is_bounded(monkeypatch) -> None:
+    monkeypatch.setattr(Collection, "ITEM_CODES_MAX_SIZE", 2)
+    client = FakeClient(_collection_data(ITEM_CODE))
+    addresses = [Address((0, bytes([i]) * 32)) for i in range(3)]
+
+    async def main() -> None:
+        for address in addresses[:2]:
+            await CollectionStandard.get_item_code(client, address)
+        # the first collection is used again, the second one is evicted
+        await CollectionStandard.get_item_code(client, addresses[0])
+        await CollectionStandard.get_item_code(client, addresses[2])
+
+    asyncio.run(main())
+
+    assert [key for key, _ in Collection._item_codes] == [
+        addresses[0].to_str(is_user_friendly=False),
+        addresses[2].to_str(is_user_friendly=False),
+    ]
+    assert client.account_fetches == 3
@@ -0,0 +1,147 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+from pytoniq_core import Address, Cell, StateInit, begin_cell
+
+from stonutils.client import LiteserverClient
+from stonutils.nft import CollectionSnapshot
+from stonutils.nft.contract.base import Collection
+
+OWNER = Address((0, b"\x11" * 32))
+COLLECTION = Address((0, b"\x22" * 32))
+COUNT = 10
+UNDEPLOYED = 3
+ADDRESSES = [Address((0, (i + 1).to_bytes(32, "big"))) for i in range(COUNT)]
+
+
+class TestCollection(Collection):
+    __test__ = False
+
+    @classmethod
+    async def get_next_item_index(cls, client: Any, collection_address: Any) -> int:
+        return COUNT
+
+    @classmethod
+    async def get_item_addresses(cls, client: Any, collection_address: Any, indexes: Any, **kwargs: Any) -> List[Address]:
+        return [ADDRESSES[index] for index in indexes]
+
+
+class Balancer:
+
+    def __init__(self) -> None:
+        self.indexes = {address.to_str(is_user_friendly=False): i for i, address in enumerate(ADDRESSES)}
+        self.last_transaction_lts = {i: 100 + i for i in range(COUNT)}
+
+    async def raw_get_account_state(self, address: Address) -> Any:
+        index = self.indexes[address.to_str(is_user_friendly=False)]
+        if index == UNDEPLOYED:
+            return None, None
+
+        # non-ASCII content makes the characters and the bytes of the output differ
+        content = begin_cell().store_snake_string(f"ü/{index}.json").end_cell()
+        data = (
+            begin_cell()
+            .store_uint(index, 64)
+            .store_address(COLLECTION)
+            .store_address(OWNER)
+            .store_ref(content)
+            .end_cell()
+        )
+        account = SimpleNamespace(
+            addr=address,
+            storage=SimpleNamespace(
+                balance=SimpleNamespace(grams=1),
+                state=SimpleNamespace(type_="account_active", state_init=StateInit(code=Cell.empty(), data=data)),
+            ),
+        )
+        shard_account = SimpleNamespace(last_trans_lt=self.last_transaction_lts[index], last_trans_hash=bytes(32))
+        return account, shard_account
+
+
+def _client() -> LiteserverClient:
+    client = LiteserverClient(config={"liteservers": []})
+    client.client = Balancer()
+    client._started = True
+    client._ready = asyncio.Event()
+    client._ready.set()
+    return client
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_items_are_exported_in_order(tmp_path, extension: str) -> None:
+    path = str(tmp_path / f"snapshot.{extension}")
+    snapshot = CollectionSnapshot(_client(), COLLECTION, TestCollection, chunk_size=4)
+
+    assert asyncio.run(snapshot.export(path)) == COUNT
+
+    rows = snapshot.read(path)
+    assert list(rows) == list(range(COUNT))
+    assert rows[0].owner == OWNER.to_str()
+    assert rows[5].content == "ü/5.json"
+    assert rows[5].last_transaction_lt == 105
+    # the undeployed item is exported without owner and content
+    assert rows[UNDEPLOYED] == (UNDEPLOYED, ADDRESSES[UNDEPLOYED].to_str(), None, None, 0)
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_an_interrupted_export_resumes_after_the_last_chunk(tmp_path, extension: str) -> None:
+    path = str(tmp_path / f"snapshot.{extension}")
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    snapshot = CollectionSnapshot(_client(), COLLECTION, TestCollection, chunk_size=3, checkpoint_path=checkpoint_path)
+
+    fetch_rows = snapshot.fetch_rows
+    fetched: List[int] = []
+    interrupted = [True]
+
+    async def interrupted_fetch_rows(indexes: Any, previous: Any = None) -> Any:
+        if interrupted[0] and indexes[0] == 6:
+            raise ConnectionError
+        fetched.extend(indexes)
+        return await fetch_rows(indexes, previous)
+
+    snapshot.fetch_rows = interrupted_fetch_rows
+    with pytest.raises(ConnectionError):
+        asyncio.run(snapshot.export(path))
+
+    with open(checkpoint_path) as f:
+        checkpoint = json.load(f)
+    assert checkpoint["next_index"] == 6
+
+    # a chunk written after the last checkpoint is dropped
+    with open(path, "ab") as f:
+        f.write("9,ü,,,1\n".encode("utf-8"))
+
+    fetched.clear()
+    interrupted[0] = False
+    assert asyncio.run(snapshot.export(path)) == COUNT - 6
+    assert fetched == list(range(6, COUNT))
+
+    expected_path = str(tmp_path / f"expected.{extension}")
+    asyncio.run(CollectionSnapshot(_client(), COLLECTION, TestCollection).export(expected_path))
+
+    with open(path, "rb") as f, open(expected_path, "rb") as expected:
+        assert f.read() == expected.read()
+
+
+def test_unchanged_items_are_copied_from_the_previous_snapshot(tmp_path) -> None:
+    path = str(tmp_path / "previous.csv")
+    client = _client()
+
+    snapshot = CollectionSnapshot(client, COLLECTION, TestCollection, chunk_size=4)
+    asyncio.run(snapshot.export(path))
+    previous = snapshot.read(path)
+
+    # the row of an item whose last transaction did not change is not parsed again
+    stale = previous[1]._replace(content="stale")
+    previous_rows = {**previous, 1: stale}
+    client.client.last_transaction_lts[2] += 1
+
+    async def main() -> Any:
+        return await snapshot.fetch_rows(range(COUNT), previous_rows)
+
+    rows = asyncio.run(main())
+    assert rows[1] == stale
+    assert rows[2] == previous[2]._replace(last_transaction_lt=103)
@@ -0,0 +1,80 @@
+import csv
+
+import pytest
+
+from stonutils.wallet import WalletAddressDeriver, WalletV4R2, WalletV5R1
+from stonutils.wallet.bulk import DATA_LAYOUTS
+
+PUBLIC_KEYS = [bytes([i]) * 32 for i in range(1, 4)]
+
+
+def _expected(wallet_class, public_key, **kwargs) -> str:
+    return wallet_class(None, public_key, b"", **kwargs).address.to_str()
+
+
+def test_addresses_match_the_wallet_classes() -> None:
+    for wallet_class in DATA_LAYOUTS:
+        wallet_ids = [None] if wallet_class.__name__.startswith("Preprocessed") else [None, 0, 7]
+        deriver = WalletAddressDeriver(wallet_class, workers=1)
+
+        for public_key in PUBLIC_KEYS:
+            for wallet_id in wallet_ids:
+                kwargs = {} if wallet_id is None else {"wallet_id": wallet_id}
+                [derived] = deriver.derive(public_key, wallet_id)
+
+                assert derived.address == _expected(wallet_class, public_key, **kwargs), wallet_class
+                assert derived.public_key == public_key.hex()
+                assert derived.wallet_id == wallet_id
+
+
+def test_class_options_and_address_formats() -> None:
+    public_key = PUBLIC_KEYS[0]
+    wallet = WalletV5R1(None, public_key, b"", wallet_id=3, network_global_id=-3)
+
+    [derived] = WalletAddressDeriver(WalletV5R1, workers=1, network_global_id=-3).derive(public_key.hex(), 3)
+    assert derived.address == wallet.address.to_str()
+
+    [derived] = WalletAddressDeriver(
+        WalletV5R1, workers=1, is_bounceable=False, is_test_only=True, network_global_id=-3,
+    ).derive(public_key, 3)
+    assert derived.address == wallet.address.to_str(is_bounceable=False, is_test_only=True)
+
+    [derived] = WalletAddressDeriver(
+        WalletV5R1, workers=1, is_user_friendly=False, network_global_id=-3,
+    ).derive(public_key, 3)
+    assert derived.address == wallet.address.to_str(is_user_friendly=False)
+
+
+def test_worker_processes_keep_the_input_order() -> None:
+    deriver = WalletAddressDeriver(WalletV4R2, workers=2, chunk_size=3)
+    derived = list(deriver.derive(PUBLIC_KEYS[0], range(20)))
+
+    assert [d.wallet_id for d in derived] == list(range(20))
+    assert [d.address for d in derived] == [
+        _expected(WalletV4R2, PUBLIC_KEYS[0], wallet_id=wallet_id) for wallet_id in range(20)
+    ]
+
+
+def test_inputs_are_paired() -> None:
+    deriver = WalletAddressDeriver(WalletV4R2, workers=1)
+
+    assert [d.public_key for d in deriver.derive(PUBLIC_KEYS, 1)] == [k.hex() for k in PUBLIC_KEYS]
+    assert [d.wallet_id for d in deriver.derive(PUBLIC_KEYS, [4, 5, 6])] == [4, 5, 6]
+
+    with pytest.raises(ValueError):
+        list(deriver.derive(PUBLIC_KEYS, [1, 2]))
+    with pytest.raises(ValueError):
+        list(deriver.derive(b"\x00" * 31))
+
+
+def test_write_csv(tmp_path) -> None:
+    path = str(tmp_path / "addresses.csv")
+    deriver = WalletAddressDeriver(WalletV4R2, workers=1, chunk_size=2)
+
+    assert deriver.write_csv(path, PUBLIC_KEYS) == 3
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [row["address"] for row in rows] == [_expected(WalletV4R2, k) for k in PUBLIC_KEYS]
+    assert [row["wallet_id"] for row in rows] == ["", "", ""]
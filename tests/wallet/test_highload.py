@@ -0,0 +1,94 @@
+from typing import List
+
+import pytest
+from pytoniq_core import Address, Cell, MessageAny
+
+from stonutils.wallet import HighloadQueryIdAllocator, HighloadWalletV3
+from stonutils.wallet.contract._base import WalletMessage
+from stonutils.wallet.op_codes import ACTION_SEND_MSG_OPCODE, INTERNAL_TRANSFER_OPCODE
+
+
+def _wallet() -> HighloadWalletV3:
+    wallet, _, _, _ = HighloadWalletV3.create(None)
+    return wallet
+
+
+def _messages(wallet: HighloadWalletV3, count: int) -> List[WalletMessage]:
+    messages = []
+
+    for i in range(count):
+        message = wallet.create_wallet_internal_message(destination=Address((0, i.to_bytes(32, "big"))), value=i + 1)
+        # serialize once, the messages are packed many times over
+        cell = message.message.serialize()
+        message.message.serialize = lambda cell=cell: cell
+        messages.append(message)
+
+    return messages
+
+
+def _levels(wallet: HighloadWalletV3, body: Cell) -> List[List[Cell]]:
+    """
+    Return the messages of every level of a packed chain in the order they are sent,
+    the internal message carrying the next level excluded.
+    """
+    cs = body.begin_parse()
+    assert cs.load_uint(32) == INTERNAL_TRANSFER_OPCODE
+    cs.skip_bits(64)
+
+    actions = []
+    node = cs.load_ref()
+    while node.refs:
+        ns = node.begin_parse()
+        node = ns.load_ref()
+        assert ns.load_uint(32) == ACTION_SEND_MSG_OPCODE
+        ns.skip_bits(8)
+        actions.append(ns.load_ref())
+    actions.reverse()
+
+    message = MessageAny.deserialize(actions[-1].begin_parse())
+    if message.info.dest == wallet.address:
+        return [actions[:-1]] + _levels(wallet, message.body)
+
+    return [actions]
+
+
+def test_pack_actions_consumes_an_iterator() -> None:
+    wallet = _wallet()
+    messages = _messages(wallet, 600)
+
+    packed = wallet.pack_actions(iter(messages), query_id=1)
+    levels = _levels(wallet, packed.message.body)
+
+    # chunks of 253 are packed as they are read, the last one is sent first
+    assert [len(level) for level in levels] == [94, 253, 253]
+    sent = [cell.hash for level in levels for cell in level]
+    expected = [m.message.serialize().hash for m in messages]
+    assert sent == expected[506:] + expected[253:506] + expected[:253]
+
+    assert packed.message.info.value.grams == sum(range(1, 601))
+    assert packed.message.serialize().get_depth() < 300
+
+
+def test_a_batch_above_the_limit_is_split_into_externals() -> None:
+    wallet = _wallet()
+    wallet.query_id_allocator = HighloadQueryIdAllocator()
+    messages = _messages(wallet, 1500)
+    count = HighloadWalletV3.MAX_MESSAGES + 1
+
+    externals = list(wallet.raw_create_transfer_msgs(messages[i % len(messages)] for i in range(count)))
+
+    assert len(externals) > 1
+    assert sum(carried for _, carried in externals) == count
+    assert wallet.query_id_allocator.allocate() == len(externals)
+
+    for message, _ in externals:
+        cell = message.serialize()
+        assert len(cell.to_boc()) <= HighloadWalletV3.MAX_EXTERNAL_MESSAGE_SIZE
+        assert cell.get_depth() <= HighloadWalletV3.MAX_EXTERNAL_MESSAGE_DEPTH
+
+
+def test_several_externals_need_a_query_id_allocator() -> None:
+    wallet = _wallet()
+
+    with pytest.raises(ValueError):
+        list(wallet.raw_create_transfer_msgs(_messages(wallet, 3000)))
@@ -0,0 +1,108 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import pytest
+from pytoniq_core import Address, Cell, HashMap, begin_cell
+
+from stonutils.account import AccountStatus, RawAccount
+from stonutils.client import Client, ResultFormat
+from stonutils.wallet import HighloadQueryIdAllocator, ProcessedQueryTracker
+from stonutils.wallet.processed import KEY_SIZE
+
+ADDRESS = Address((0, b"\x11" * 32))
+
+
+def _bitmap(*bit_numbers: int) -> Cell:
+    bits = sum(1 << (1022 - bit_number) for bit_number in bit_numbers)
+    return begin_cell().store_uint(bits, 1023).end_cell()
+
+
+def _dict(values: Dict[int, Any], store_value=lambda value, builder: builder.store_ref(value)) -> Optional[Cell]:
+    if not values:
+        return None
+
+    hashmap = HashMap(KEY_SIZE, value_serializer=store_value)
+    for shift, value in values.items():
+        hashmap.set_int_key(shift, value)
+
+    return hashmap.serialize()
+
+
+def _inline_dict(values: Dict[int, int]) -> Optional[Cell]:
+    # bitmaps stored in the value itself instead of a reference
+    return _dict(values, lambda value, builder: builder.store_uint(value, 900))
+
+
+def _data(old_queries: Optional[Cell], queries: Optional[Cell], tail_bits: int = 64 + 22) -> Cell:
+    return (
+        begin_cell()
+        .store_bytes(b"\x01" * 32)
+        .store_uint(698983191, 32)
+        .store_maybe_ref(old_queries)
+        .store_maybe_ref(queries)
+        .store_uint(0, tail_bits)
+        .end_cell()
+    )
+
+
+def _query_id(shift: int, bit_number: int) -> int:
+    return HighloadQueryIdAllocator.to_query_id(shift, bit_number)
+
+
+def test_processed_query_ids_are_read_from_both_dictionaries() -> None:
+    data = _data(
+        old_queries=_dict({0: _bitmap(0, 1022)}),
+        queries=_dict({0: _bitmap(5), 3: _bitmap(7)}),
+    )
+    query_ids = [_query_id(0, 0), _query_id(0, 1), _query_id(0, 5), _query_id(0, 1022), _query_id(3, 7), _query_id(4, 7)]
+
+    assert ProcessedQueryTracker.parse_processed(data, query_ids) == {
+        _query_id(0, 0), _query_id(0, 5), _query_id(0, 1022), _query_id(3, 7),
+    }
+    assert ProcessedQueryTracker.parse_processed(_data(None, None), query_ids) == set()
+
+
+def test_unexpected_layouts_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        ProcessedQueryTracker.parse_processed(_data(None, _inline_dict({0: 1 << 898})), [_query_id(0, 0)])
+
+    short = _dict({0: begin_cell().store_uint(0, 10).end_cell()})
+    with pytest.raises(ValueError):
+        ProcessedQueryTracker.parse_processed(_data(short, None), [_query_id(0, 20)])
+
+    with pytest.raises(ValueError):
+        ProcessedQueryTracker.parse_processed(_data(None, None, tail_bits=64), [])
+
+
+class FakeClient(Client):
+    result_format = ResultFormat.LITESERVER
+
+    def __init__(self, data: Cell) -> None:
+        super().__init__()
+        self.data = data
+        self.get_method_calls: List[Any] = []
+
+    async def _get_raw_account(self, address: str) -> RawAccount:
+        return RawAccount(1, Cell.empty(), self.data, AccountStatus.active, 1, "")
+
+    async def _run_get_method(self, address: str, method_name: str, stack: Optional[List[Any]] = None) -> Any:
+        self.get_method_calls.append(stack[0])
+        return [-1 if stack[0] == _query_id(0, 1) else 0]
+
+
+def test_tracker_reads_the_data_and_falls_back_to_the_get_method() -> None:
+    async def main(data: Cell) -> FakeClient:
+        client = FakeClient(data)
+        tracker = ProcessedQueryTracker(client, ADDRESS, poll_interval=0)
+
+        assert await tracker.wait_processed(_query_id(0, 1), timeout=1)
+        assert not await tracker.wait_processed(_query_id(0, 2), timeout=0.05)
+
+        await tracker.close()
+        return client
+
+    client = asyncio.run(main(_data(None, _dict({0: _bitmap(1)}))))
+    assert client.get_method_calls == []
+
+    client = asyncio.run(main(_data(None, _inline_dict({0: 1 << 898}))))
+    assert client.get_method_calls[0] == _query_id(0, 1)
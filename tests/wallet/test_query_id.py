@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from stonutils.wallet import (
+    FileQueryIdStore,
+    HighloadQueryIdAllocator,
+    QueryIdExhaustedError,
+    SqliteQueryIdStore,
+)
+from stonutils.wallet.query_id import MAX_BIT_NUMBER, MAX_SHIFT
+
+
+def test_query_ids_are_sequential_and_wrap_to_the_next_shift() -> None:
+    allocator = HighloadQueryIdAllocator()
+    query_ids = [allocator.allocate() for _ in range(MAX_BIT_NUMBER + 3)]
+
+    assert query_ids[:3] == [0, 1, 2]
+    assert allocator.from_query_id(query_ids[MAX_BIT_NUMBER]) == (0, MAX_BIT_NUMBER)
+    assert [allocator.from_query_id(q) for q in query_ids[-2:]] == [(1, 0), (1, 1)]
+    assert allocator.to_query_id(*allocator.from_query_id(query_ids[-1])) == query_ids[-1]
+
+
+def test_a_recently_used_shift_is_not_reused() -> None:
+    allocator = HighloadQueryIdAllocator(timeout=60)
+    allocator.allocate()
+    allocator._shift, allocator._bit_number = MAX_SHIFT, MAX_BIT_NUMBER + 1
+
+    with pytest.raises(QueryIdExhaustedError) as error:
+        allocator.allocate()
+    assert 0 < error.value.retry_after <= 180
+
+    allocator._shift_used_at[0] = time.time() - 181
+    assert allocator.allocate() == 0
+
+
+def test_concurrent_allocations_are_unique() -> None:
+    allocator = HighloadQueryIdAllocator()
+    query_ids = []
+
+    def allocate() -> None:
+        for _ in range(500):
+            query_ids.append(allocator.allocate())
+
+    threads = [threading.Thread(target=allocate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(query_ids)) == 2000
+
+
+def test_a_restarted_allocator_skips_the_reserved_ids(tmp_path) -> None:
+    path = str(tmp_path / "query_ids.json")
+
+    allocator = HighloadQueryIdAllocator(store=FileQueryIdStore(path), reserve_ahead=10)
+    used = [allocator.allocate() for _ in range(15)]
+
+    restarted = HighloadQueryIdAllocator(store=FileQueryIdStore(path), reserve_ahead=10)
+    next_id = restarted.allocate()
+
+    assert next_id == 20
+    assert next_id not in used
+
+
+def test_a_reservation_does_not_cross_a_shift(tmp_path) -> None:
+    store = SqliteQueryIdStore(str(tmp_path / "query_ids.sqlite"), "wallet")
+
+    allocator = HighloadQueryIdAllocator(store=store, reserve_ahead=100)
+    allocator._bit_number = MAX_BIT_NUMBER - 5
+    allocator.allocate()
+
+    # a restart moves to the next shift, after checking it may be reused
+    restarted = HighloadQueryIdAllocator(store=store, reserve_ahead=100)
+    assert restarted.from_query_id(restarted.allocate()) == (1, 0)
+
+    other = SqliteQueryIdStore(str(tmp_path / "query_ids.sqlite"), "other wallet")
+    assert other.load() is None
+
+    store.close()
+    other.close()
+
+
+def test_reserve_ahead_is_validated() -> None:
+    with pytest.raises(ValueError):
+        HighloadQueryIdAllocator(reserve_ahead=0)
+    with pytest.raises(ValueError):
+        HighloadQueryIdAllocator(reserve_ahead=MAX_BIT_NUMBER + 1)
@@ -0,0 +1,154 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, List, Optional
+
+import pytest
+
+from stonutils.account import AccountStatus, RawAccount
+from stonutils.client import Client, LiteserverClient, ResultFormat, TonapiClient, ToncenterClient
+from stonutils.wallet import SeqnoManager, WalletV4R2
+
+PUBLIC_KEY = b"\x01" * 32
+
+
+def _tonapi_client() -> TonapiClient:
+    async def get(method: str, params: Any = None) -> Any:
+        if "/methods/" in method:
+            return {"success": False, "exit_code": -13, "stack": [], "decoded": None}
+        return {"address": "", "balance": 0, "status": "nonexist"}
+
+    client = TonapiClient("key")
+    client._get = get
+    return client
+
+
+def _toncenter_client() -> ToncenterClient:
+    async def post(method: str, body: Any = None, **kwargs: Any) -> Any:
+        return {"gas_used": 0, "exit_code": -13, "stack": []}
+
+    async def get(method: str, params: Any = None) -> Any:
+        return {"balance": "5", "code": None, "data": None, "status": "uninit", "last_transaction_lt": "1"}
+
+    client = ToncenterClient("key")
+    client._post = post
+    client._get = get
+    return client
+
+
+def _lite_client() -> LiteserverClient:
+    class Balancer:
+        async def run_get_method(self, address: str, method_name: str, stack: List[Any]) -> Any:
+            raise RuntimeError("cannot run get method on an account that is not initialized")
+
+        async def raw_get_account_state(self, address: Any) -> Any:
+            return None, None
+
+    client = LiteserverClient(config={"liteservers": []})
+    client.client = Balancer()
+    client._started = True
+    client._ready = asyncio.Event()
+    client._ready.set()
+    return client
+
+
+class FakeClient(Client):
+    result_format = ResultFormat.LITESERVER
+
+    def __init__(self, seqno: int = 5, status: AccountStatus = AccountStatus.active) -> None:
+        super().__init__()
+        self.chain_seqno = seqno
+        self.status = status
+        self.fetches = 0
+
+    async def _run_get_method(self, address: str, method_name: str, stack: Optional[List[Any]] = None) -> Any:
+        self.fetches += 1
+        if self.status is not AccountStatus.active:
+            raise RuntimeError("exit code -13")
+        return [self.chain_seqno]
+
+    async def _get_raw_account(self, address: str) -> RawAccount:
+        return RawAccount(1, None, None, self.status, 1, "")
+
+
+def test_undeployed_wallet_starts_at_zero_on_every_backend() -> None:
+    async def main(client: Client) -> None:
+        manager = SeqnoManager(WalletV4R2(client, PUBLIC_KEY, b""))
+
+        async with manager.reserve() as reservation:
+            assert reservation.seqno == 0
+        assert manager.seqno == 1
+
+        await manager.close()
+
+    for create_client in (_tonapi_client, _toncenter_client, _lite_client):
+        asyncio.run(main(create_client()))
+
+
+def test_other_failures_are_raised() -> None:
+    async def main() -> None:
+        client = FakeClient(status=AccountStatus.frozen)
+        manager = SeqnoManager(WalletV4R2(client, PUBLIC_KEY, b""))
+
+        with pytest.raises(RuntimeError):
+            async with manager.reserve():
+                pass
+
+    asyncio.run(main())
+
+
+def test_reservations_are_sequential() -> None:
+    async def main() -> None:
+        client = FakeClient(seqno=5)
+        manager = SeqnoManager(WalletV4R2(client, PUBLIC_KEY, b""), valid_for=30)
+
+        async def send() -> int:
+            async with manager.reserve() as reservation:
+                await asyncio.sleep(0)
+                return reservation.seqno
+
+        assert sorted(await asyncio.gather(*[send() for _ in range(4)])) == [5, 6, 7, 8]
+        assert manager.seqno == 9
+        assert client.fetches == 1
+
+        await manager.close()
+
+    asyncio.run(main())
+
+
+def test_a_failed_send_does_not_consume_the_seqno() -> None:
+    async def main() -> None:
+        client = FakeClient(seqno=5)
+        manager = SeqnoManager(WalletV4R2(client, PUBLIC_KEY, b""))
+
+        with pytest.raises(ConnectionError):
+            async with manager.reserve():
+                raise ConnectionError
+
+        # the seqno is read again, the message may have been sent
+        assert manager.seqno is None
+        async with manager.reserve() as reservation:
+            assert reservation.seqno == 5
+        assert client.fetches == 2
+
+        await manager.close()
+
+    asyncio.run(main())
+
+
+def test_expired_messages_are_reconciled() -> None:
+    async def main() -> None:
+        client = FakeClient(seqno=5)
+        manager = SeqnoManager(WalletV4R2(client, PUBLIC_KEY, b""), reconcile_delay=0)
+
+        async with manager.reserve(valid_until=0):
+            pass
+        assert manager.seqno == 6
+
+        # the message was not processed: the chain still reports 5
+        await manager._reconcile_task
+        assert manager.seqno == 5
+
+        client.chain_seqno = 7
+        assert await manager.reconcile() == 7
+
+    asyncio.run(main())